@@ -8,17 +8,16 @@ from fastapi_babel.core import make_gettext as _
 from fastapi_babel.middleware import InternationalizationMiddleware
 
 from src.core import settings
-from src.core.database import Basemodel
-from src.core.database import engine
-from src.helpers.logger import logger
-from src.helpers.logger.models import LogLevel
 from src.core.ratelimiter import limiter
 from src.core.babel import babel
+from src.helpers.dbstats.middleware import DBStatsMiddleware
 
 # API routers
 from src.apis.users import router as user_router
 from src.apis.recipes import router as recipe_router
 from src.apis.relations import router as relation_router
+from src.apis.metrics import router as metrics_router
+from src.apis.exports import router as export_router
 
 # Application exceptions
 from src.core.exceptions import CredentialException
@@ -30,27 +29,28 @@ from src.core.exceptions import handle_rate_limit_exception
 
 # Application events
 from src.core.startup import startup_event
+from src.core.startup import shutdown_event
 
 
-Basemodel.metadata.create_all(engine)
-
+# The database schema is created and upgraded by `python -m src.core.migrations upgrade`, not at import time.
 app = FastAPI(
     docs_url=settings.DOCS["swagger"],
     redoc_url=settings.DOCS["redoc"],
 )
 
-logger.log(level=LogLevel.INFO, message=dict(data="Application initialized"))  # noqa C408
-
 # Application routers
 app.include_router(user_router)
 app.include_router(recipe_router)
 app.include_router(relation_router)
+app.include_router(metrics_router)
+app.include_router(export_router)
 
 # Application states
 app.state.limiter = limiter
 
 # Application events
 app.add_event_handler("startup", startup_event)
+app.add_event_handler("shutdown", shutdown_event)
 
 # Add exceptions
 app.add_exception_handler(ValueError, handle_value_error_exception)
@@ -61,6 +61,7 @@ app.add_exception_handler(RateLimitExceeded, handle_rate_limit_exception)
 # Application middlewares
 app.add_middleware(SlowAPIMiddleware)
 app.add_middleware(InternationalizationMiddleware, babel=babel)
+app.add_middleware(DBStatsMiddleware)
 
 
 # Add static mount point
@@ -0,0 +1,63 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+
+from src.helpers.export import ExportFormatEnum
+from src.helpers.jwt.oauth2 import get_admin_user
+from src.apis.exports.functions import (
+    export_recipes as export_recipes_function,
+    export_users as export_users_function,
+)
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"],
+    responses={404: {"detail": "Not found"}},
+)
+
+
+@router.get("/recipes", description="Stream all the recipes (with their author and tags) as NDJSON or CSV. Administrators only.")
+async def export_recipes(
+    request: Request,
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format", description="The output format."),
+    gzip: bool = Query(False, description="Whether to gzip the output."),
+    after: Optional[int] = Query(None, ge=0, description="Resume after this recipe ID (the last exported id)."),
+    current_user: str = Depends(get_admin_user),
+):
+    """
+    Stream all the recipes.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        export_format (ExportFormatEnum): The output format.
+        gzip (bool): Whether to gzip the output.
+        after (Optional[int]): Resume after this recipe ID.
+        current_user (str): The current (administrator) user.
+
+    Returns:
+        StreamingResponse: The recipes, in ID order.
+    """
+    return await export_recipes_function(current_user, export_format, gzip, after, request)
+
+
+@router.get("/users", description="Stream all the users as NDJSON or CSV. Administrators only.")
+async def export_users(
+    request: Request,
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format", description="The output format."),
+    gzip: bool = Query(False, description="Whether to gzip the output."),
+    after: Optional[int] = Query(None, ge=0, description="Resume after this user ID (the last exported id)."),
+    current_user: str = Depends(get_admin_user),
+):
+    """
+    Stream all the users.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        export_format (ExportFormatEnum): The output format.
+        gzip (bool): Whether to gzip the output.
+        after (Optional[int]): Resume after this user ID.
+        current_user (str): The current (administrator) user.
+
+    Returns:
+        StreamingResponse: The users, in ID order.
+    """
+    return await export_users_function(current_user, export_format, gzip, after, request)
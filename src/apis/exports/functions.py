@@ -0,0 +1,83 @@
+from fastapi.responses import StreamingResponse
+
+from src.core.database import local_session
+from src.helpers.export import MEDIA_TYPES
+from src.helpers.export import export_chunks
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+from src.resources.recipes import Recipe
+from src.resources.recipes import EXPORT_COLUMNS as RECIPE_EXPORT_COLUMNS
+from src.resources.users import User
+from src.resources.users import EXPORT_COLUMNS as USER_EXPORT_COLUMNS
+
+
+def stream_export(user, name, export, columns, export_format, compress, after):
+    """
+    Stream the records of an export as a file download.
+
+    The records are read in a session of their own (one read transaction for the whole export), opened when the
+    response starts streaming and closed when it ends or the client disconnects.
+
+    Args:
+        user (UserModel): The administrator requesting the export.
+        name (str): The name of the exported records, e.g. "recipes".
+        export (callable): The export generator of the records (`after`, `session`).
+        columns (list[str]): The exported columns.
+        export_format (ExportFormatEnum): The output format.
+        compress (bool): Whether to gzip the output.
+        after (int | None): Only the records with a higher ID (to resume an export).
+
+    Returns:
+        StreamingResponse: The streaming response.
+    """
+
+    def records():
+        with local_session() as session:
+            yield from export(after=after, session=session)
+
+    logger.log(level=LogLevel.INFO, message=f"{name} export ({export_format.value}, after {after}) requested by {user.phone_number}")
+
+    filename = f"{name}.{export_format.value}" + (".gz" if compress else "")
+    return StreamingResponse(
+        export_chunks(records(), columns, export_format, compress=compress, header=after is None),
+        media_type="application/gzip" if compress else MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def export_recipes(user, export_format, compress, after, request, *args, **kwargs):
+    """
+    Export all the recipes (with their author and tags).
+
+    Args:
+        user (UserModel): The administrator requesting the export.
+        export_format (ExportFormatEnum): The output format.
+        compress (bool): Whether to gzip the output.
+        after (int | None): Only the recipes with a higher ID (to resume an export).
+        request (Request): The incoming request object.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        StreamingResponse: The streaming response of the recipes.
+    """
+    return stream_export(user, "recipes", Recipe.export, RECIPE_EXPORT_COLUMNS, export_format, compress, after)
+
+
+async def export_users(user, export_format, compress, after, request, *args, **kwargs):
+    """
+    Export all the users.
+
+    Args:
+        user (UserModel): The administrator requesting the export.
+        export_format (ExportFormatEnum): The output format.
+        compress (bool): Whether to gzip the output.
+        after (int | None): Only the users with a higher ID (to resume an export).
+        request (Request): The incoming request object.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        StreamingResponse: The streaming response of the users.
+    """
+    return stream_export(user, "users", User.export, USER_EXPORT_COLUMNS, export_format, compress, after)
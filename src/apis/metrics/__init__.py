@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, Request
+
+from src.helpers.jwt.oauth2 import get_admin_user
+from src.helpers.response.schemas import ResponseQuery
+from src.apis.metrics.functions import show_metrics as show_metrics_function
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    responses={404: {"detail": "Not found"}},
+)
+
+
+@router.get(
+    "",
+    response_model=ResponseQuery,
+    description="Get the application metrics. Administrators only.",
+)
+async def show_metrics(
+    request: Request,
+    current_user: str = Depends(get_admin_user),
+) -> ResponseQuery:
+    """
+    Get the application metrics.
+
+    Args:
+        request (Request): The incoming HTTP request.
+        current_user (str): The current (administrator) user.
+
+    Returns:
+        ResponseQuery: The response containing the per-route request statistics and the counters.
+    """
+    response = await show_metrics_function(request)
+    return response.get()
@@ -0,0 +1,17 @@
+from src.helpers.response import Response
+from src.helpers.metrics import metrics
+
+
+async def show_metrics(request, *args, **kwargs):
+    """
+    Show the application metrics.
+
+    Args:
+        request (Request): The incoming request object.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        Response: A Response object containing the metrics snapshot.
+    """
+    return Response(message={"data": metrics.snapshot()}, request=request, query_message=True, print_console=False)
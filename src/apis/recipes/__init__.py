@@ -1,18 +1,22 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
 from src.core.ratelimiter import recipes_rate_limit_depends
-from src.helpers.response.schemas import Page, ResponseQuery, ResponseSchema, ResponseListQuery
+from src.helpers.response.schemas import Page, ResponseQuery, ResponseSchema, ResponseListQuery, ResponseCursorQuery
 from src.core.database import get_db_session
 from src.helpers.jwt.oauth2 import get_current_user
-from src.resources.recipes.schemas import RecipeSchema, RecipeEditSchema, RecipeFilterSchema
+from src.resources.recipes.schemas import RecipeSchema, RecipeEditSchema, RecipeFilterSchema, RecipeFieldsSchema
 from src.apis.recipes.functions import (
     create as create_function,
+    bulk_create as bulk_create_function,
     update as update_function,
     delete as delete_function,
     show_all as show_all_function,
     show_detail as show_detail_function,
+    show_details as show_details_function,
+    show_feed as show_feed_function,
+    show_trending as show_trending_function,
     show_tags as show_tags_function,
 )
 
@@ -45,6 +49,31 @@ async def create_recipe(
     return response.get()
 
 
+@router.post(
+    "/import",
+    response_model=ResponseSchema,
+    description="Import recipes in bulk: a JSON array of recipes, or one recipe per line with the application/x-ndjson content type.",
+)
+async def import_recipes(
+    request: Request,
+    current_user: str = Depends(get_current_user),
+    db_session: Session = Depends(get_db_session),
+) -> ResponseSchema:
+    """
+    Import recipes in bulk.
+
+    Args:
+        request (Request): The request, whose body carries the recipes.
+        current_user (str): The current user.
+        db_session (Session): The SQLAlchemy database session.
+
+    Returns:
+        ResponseSchema: The response containing the number of created recipes and the per-row errors.
+    """
+    response = await bulk_create_function(current_user, request, db_session)
+    return response.get()
+
+
 @router.post("/update", response_model=ResponseSchema, description="Update an existing recipe.")
 async def update_recipe(
     recipe_edit: RecipeEditSchema = Depends(),
@@ -92,6 +121,7 @@ async def list_recipes(
     search: Optional[str] = None,
     filter: RecipeFilterSchema = Depends(),
     page: Page = Depends(),
+    fields: RecipeFieldsSchema = Depends(),
     db_session: Session = Depends(get_db_session),
 ) -> ResponseListQuery:
     """
@@ -101,18 +131,60 @@ async def list_recipes(
         search (Optional[str]): Optional search query.
         filter (RecipeFilterSchema): Filtering criteria.
         page (Page): Pagination information.
+        fields (RecipeFieldsSchema): The fields of the recipes to return (default is uuid, title and user).
         db_session (Session): The SQLAlchemy database session.
 
     Returns:
         ResponseListQuery: The response containing a list of recipes.
     """
-    response = await show_all_function(search, filter, page, None, db_session)
+    response = await show_all_function(search, filter, page, fields.fields, None, db_session)
+    return response.get()
+
+
+@router.get("/feed", response_model=ResponseCursorQuery, description="Get the newest recipes of the users followed by the current user.")
+async def get_feed(
+    page: Page = Depends(),
+    current_user: str = Depends(get_current_user),
+    db_session: Session = Depends(get_db_session),
+) -> ResponseCursorQuery:
+    """
+    Get the newest recipes of the users followed by the current user.
+
+    Args:
+        page (Page): Pagination information (the cursor is the next_cursor of the previous response, page_number is ignored).
+        current_user (str): The current user.
+        db_session (Session): The SQLAlchemy database session.
+
+    Returns:
+        ResponseCursorQuery: The response containing the recipes and the cursor of the next page.
+    """
+    response = await show_feed_function(current_user, page, None, db_session)
+    return response.get()
+
+
+@router.get("/trending", response_model=ResponseQuery, description="Get the trending recipes.")
+async def get_trending(
+    count: int = Query(10, description="The number of trending recipes."),
+    db_session: Session = Depends(get_db_session),
+) -> ResponseQuery:
+    """
+    Get the trending recipes.
+
+    Args:
+        count (int): The number of trending recipes.
+        db_session (Session): The SQLAlchemy database session.
+
+    Returns:
+        ResponseQuery: The response containing the trending recipes, highest score first.
+    """
+    response = await show_trending_function(count, None, db_session)
     return response.get()
 
 
 @router.get("/detail", response_model=ResponseQuery, description="Get details of a specific recipe.")
 async def get_recipe_detail(
     recipe_uuid: str = Query(..., description="The UUID of the recipe to fetch details for."),
+    fields: RecipeFieldsSchema = Depends(),
     db_session: Session = Depends(get_db_session),
 ) -> ResponseQuery:
     """
@@ -120,12 +192,32 @@ async def get_recipe_detail(
 
     Args:
         recipe_uuid (str): The UUID of the recipe to fetch details for.
+        fields (RecipeFieldsSchema): The fields of the recipe to return (default is all).
         db_session (Session): The SQLAlchemy database session.
 
     Returns:
         ResponseQuery: The response containing the recipe details.
     """
-    response = await show_detail_function(recipe_uuid, None, db_session)
+    response = await show_detail_function(recipe_uuid, fields.fields, None, db_session)
+    return response.get()
+
+
+@router.get("/details", response_model=ResponseQuery, description="Get details of several recipes at once.")
+async def get_recipe_details(
+    recipe_uuids: List[str] = Query([], alias="uuid", description="The UUIDs of the recipes to fetch details for (repeat the parameter)."),
+    db_session: Session = Depends(get_db_session),
+) -> ResponseQuery:
+    """
+    Get details of several recipes at once.
+
+    Args:
+        recipe_uuids (List[str]): The UUIDs of the recipes to fetch details for.
+        db_session (Session): The SQLAlchemy database session.
+
+    Returns:
+        ResponseQuery: The response containing the details of the existing recipes, in the requested order.
+    """
+    response = await show_details_function(recipe_uuids, None, db_session)
     return response.get()
 
 
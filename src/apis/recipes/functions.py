@@ -1,3 +1,4 @@
+from src.helpers.bulk import read_records
 from src.helpers.response import Response
 from src.resources.recipes import Recipe
 from src.resources.recipes import Tag
@@ -28,6 +29,26 @@ async def create(user, recipe_data, request, db_session, *args, **kwargs):
     return Response(message=msg, request=request, json_kwargs={"Recipe UUID": recipe.uuid})
 
 
+async def bulk_create(user, request, db_session, *args, **kwargs):
+    """
+    Import recipes in bulk from the request body (a JSON array or newline-delimited JSON).
+
+    Args:
+        user (User): The user creating the recipes.
+        request (Request): The incoming request object, carrying the recipes.
+        db_session: The database session.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        Response: A Response object containing the number of created recipes and the per-row errors.
+    """
+    result = await Recipe().bulk_create(user, read_records(request), db_session)
+    msg = get_message("import_recipes", **{"user": user.phone_number, "created": result["created"], "failed": len(result["errors"])})
+
+    return Response(message=msg, request=request, json_kwargs=result)
+
+
 async def update(user, recipe_edit, request, db_session, *args, **kwargs):
     """
     Update an existing recipe.
@@ -74,7 +95,7 @@ async def delete(user, recipe_uuid, request, db_session, *args, **kwargs):
     return Response(message=msg, request=request)
 
 
-async def show_all(search, filter, page, request, db_session, *args, **kwargs):
+async def show_all(search, filter, page, fields, request, db_session, *args, **kwargs):
     """
     Show a list of recipes.
 
@@ -82,6 +103,7 @@ async def show_all(search, filter, page, request, db_session, *args, **kwargs):
         search (str): The search criteria.
         filter (str): The filter criteria.
         page (int): The page number.
+        fields (str): The comma-separated fields of the recipes (None for the default ones).
         request (Request): The incoming request object.
         db_session: The database session.
         *args: Additional positional arguments.
@@ -90,17 +112,18 @@ async def show_all(search, filter, page, request, db_session, *args, **kwargs):
     Returns:
         Response: A Response object containing the list of recipes.
     """
-    recipes = await Recipe().show_all(search, filter, page, db_session)
+    recipes = await Recipe().show_all(search, filter, page, fields, db_session)
 
     return Response(message=recipes, request=request, query_message=True)
 
 
-async def show_detail(recipe_uuid, request, db_session, *args, **kwargs):
+async def show_detail(recipe_uuid, fields, request, db_session, *args, **kwargs):
     """
     Show detailed information about a recipe.
 
     Args:
         recipe_uuid (str): The UUID of the recipe to be displayed.
+        fields (str): The comma-separated fields of the recipe (None for all of them).
         request (Request): The incoming request object.
         db_session: The database session.
         *args: Additional positional arguments.
@@ -109,11 +132,69 @@ async def show_detail(recipe_uuid, request, db_session, *args, **kwargs):
     Returns:
         Response: A Response object containing the detailed information of the recipe.
     """
-    recipe = await Recipe().show_detail(recipe_uuid, db_session)
+    recipe = await Recipe().show_detail(recipe_uuid, fields, db_session)
 
     return Response(message=recipe, request=request, query_message=True)
 
 
+async def show_details(recipe_uuids, request, db_session, *args, **kwargs):
+    """
+    Show detailed information about several recipes.
+
+    Args:
+        recipe_uuids (list[str]): The UUIDs of the recipes to be displayed.
+        request (Request): The incoming request object.
+        db_session: The database session.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        Response: A Response object containing the detailed information of the recipes.
+    """
+    recipes = await Recipe().show_details(recipe_uuids, db_session)
+
+    return Response(message=recipes, request=request, query_message=True)
+
+
+async def show_feed(user, page, request, db_session, *args, **kwargs):
+    """
+    Show the newest recipes of the users followed by a user.
+
+    Args:
+        user (User): The authenticated user.
+        page (int): The pagination information (cursor and page size).
+        request (Request): The incoming request object.
+        db_session: The database session.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        Response: A Response object containing the recipes and the cursor of the next page.
+    """
+    recipes = await Recipe().feed(user, page, db_session)
+
+    return Response(message=recipes, request=request, query_message=True)
+
+
+async def show_trending(count, request, db_session, *args, **kwargs):
+    """
+    Show the trending recipes.
+
+    Args:
+        count (int): The number of recipes.
+        request (Request): The incoming request object.
+        db_session: The database session.
+        *args: Additional positional arguments.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        Response: A Response object containing the trending recipes.
+    """
+    recipes = await Recipe().show_trending(count, db_session)
+
+    return Response(message=recipes, request=request, query_message=True)
+
+
 async def show_tags(page, request, db_session, *args, **kwargs):
     """
     Show a list of tags.
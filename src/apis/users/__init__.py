@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from src.helpers.response.schemas import Page, ResponseQuery, ResponseSchema, ResponseListQuery, ResponseWithTokenSchema
 from src.core.database import get_db_session
 from src.helpers.jwt.oauth2 import get_current_user
-from src.resources.users.schemas import UserEditSchema, UserLoginForm, UserFilterSchema
+from src.resources.users.schemas import UserEditSchema, UserLoginForm, UserFilterSchema, UserFieldsSchema
 from src.apis.users.functions import (
     login_create as login_create_function,
     logout as logout_function,
@@ -113,6 +113,7 @@ async def show_all(
 )
 async def show_detail(
     request: Request,
+    fields: UserFieldsSchema = Depends(),
     current_user: str = Depends(get_current_user),
     db_session: Session = Depends(get_db_session),
 ) -> ResponseQuery:
@@ -121,13 +122,14 @@ async def show_detail(
 
     Args:
         request (Request): The incoming HTTP request.
+        fields (UserFieldsSchema): The fields of the user to return (default is all).
         current_user (str): The current user's phone number.
         db_session (Session): The SQLAlchemy database session.
 
     Returns:
         ResponseQuery: The response containing the user details.
     """
-    response = await show_detail_function(current_user, request, db_session)
+    response = await show_detail_function(current_user, fields.fields, request, db_session)
     return response.get()
 
 
@@ -71,12 +71,13 @@ async def show_all(search, filter, page, request, db_session, *args, **kwargs):
     return Response(message=users, request=request, query_message=True)
 
 
-async def show_detail(user, request, db_session, *args, **kwargs):
+async def show_detail(user, fields, request, db_session, *args, **kwargs):
     """
     Show detailed information about a user.
 
     Args:
         user (User): The user whose details are being retrieved.
+        fields (str): The comma-separated fields of the user (None for all of them).
         request (Request): The incoming request object.
         db_session: The database session.
         *args: Additional positional arguments.
@@ -85,7 +86,7 @@ async def show_detail(user, request, db_session, *args, **kwargs):
     Returns:
         Response: A Response object containing the detailed user information.
     """
-    user_detail = await User().show_detail(user, db_session)
+    user_detail = await User().show_detail(user, fields, db_session)
 
     return Response(message=user_detail, request=request, query_message=True)
 
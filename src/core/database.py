@@ -1,19 +1,208 @@
 # flake8: NOQA
 
+import time
+import itertools
+import threading
+
 from sqlalchemy import Column
 from sqlalchemy import Integer
+from sqlalchemy import event
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import as_declarative
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.sql import Delete
+from sqlalchemy.sql import Insert
+from sqlalchemy.sql import Select
+from sqlalchemy.sql import Update
 
 from src.core.settings import DATABASE
+from src.core.settings import SQLITE
+from src.core.sqlite import apply_pragmas
+from src.core.sqlite import register_functions
+from src.core.sqlite import WriteSerializer
+from src.helpers.search import trigram_similarity
 
 # Create a SQLAlchemy database engine based on the specified URL and parameters.
 engine = create_engine(DATABASE["URL"], **DATABASE["PARAMS"])
 
-# Create a session factory that binds to the database engine.
-local_session = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# Create the read replica engines (if any) with the same parameters as the primary engine.
+replica_engines = [create_engine(url, **DATABASE["PARAMS"]) for url in DATABASE["REPLICAS"]]
+
+# SQL functions missing from SQLite, registered on its connections.
+SQLITE_FUNCTIONS = {"similarity": (2, trigram_similarity)}
+
+# Apply the SQLite production profile (WAL, pragmas, functions and single-writer queue) to SQLite databases.
+for sqlite_engine in [engine, *replica_engines]:
+    if sqlite_engine.dialect.name == "sqlite":
+        apply_pragmas(sqlite_engine, SQLITE["PRAGMAS"])
+        register_functions(sqlite_engine, SQLITE_FUNCTIONS)
+
+if engine.dialect.name == "sqlite" and SQLITE["SERIALIZE_WRITES"]:
+    write_serializer = WriteSerializer(timeout=SQLITE["PRAGMAS"].get("busy_timeout", 5000) / 1000)
+else:
+    write_serializer = None
+
+
+class ReplicaSelector:
+    """
+    Selects the replica engine that serves the next read-only statement.
+
+    Supported policies are "round_robin", which cycles through the replicas in order, and "least_connections",
+    which picks the replica with the fewest connections currently checked out of its pool.
+
+    Args:
+        engines (list): The replica engines.
+        policy (str): The selection policy (default "round_robin").
+
+    Example usage:
+
+    ```python
+    selector = ReplicaSelector(replica_engines, policy="least_connections")
+    bind = selector.choose()
+    ```
+    """
+
+    def __init__(self, engines, policy="round_robin"):
+        self.engines = engines
+        self.policy = policy
+        self._cycle = itertools.cycle(engines)
+        self._lock = threading.Lock()
+        self._connections = {replica: 0 for replica in engines}
+
+        for replica in engines:
+            event.listen(replica, "checkout", self._track(replica, 1))
+            event.listen(replica, "checkin", self._track(replica, -1))
+
+    def _track(self, replica, delta):
+        """Build a pool event listener that updates the checked-out connection count of a replica."""
+
+        def listener(*args):
+            with self._lock:
+                self._connections[replica] += delta
+
+        return listener
+
+    def choose(self):
+        """
+        Choose a replica engine according to the configured policy.
+
+        Returns:
+            Engine: The selected replica engine.
+        """
+        with self._lock:
+            if self.policy == "least_connections":
+                return min(self.engines, key=lambda replica: self._connections[replica])
+            return next(self._cycle)
+
+
+class StickyWrites:
+    """
+    Tracks users who wrote recently so that their reads stay on the primary (read-your-writes).
+
+    Args:
+        seconds (int): How long reads stick to the primary after a write.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._lock = threading.Lock()
+        self._until = {}
+
+    def mark(self, key):
+        """Start (or extend) the sticky window of a key."""
+        with self._lock:
+            self._until[key] = time.monotonic() + self.seconds
+
+    def is_sticky(self, key):
+        """Return True if the key wrote within the sticky window."""
+        if key is None:
+            return False
+
+        with self._lock:
+            until = self._until.get(key)
+            if until is not None and until < time.monotonic():
+                self._until.pop(key, None)
+                until = None
+
+        return until is not None
+
+
+replica_selector = ReplicaSelector(replica_engines, policy=DATABASE["REPLICA_POLICY"]) if replica_engines else None
+sticky_writes = StickyWrites(seconds=DATABASE["STICKY_SECONDS"])
+
+
+def is_write(clause, flushing=False):
+    """Return True if the statement writes to the database (other statements, e.g. PRAGMA or DDL, do not queue)."""
+    if flushing or isinstance(clause, (Insert, Update, Delete)):
+        return True
+    return clause is not None and clause.get_execution_options().get("write", False)
+
+
+class RoutingSession(Session):
+    """
+    Session that routes read-only statements to the replicas and everything else to the primary engine.
+
+    A statement is routed to a replica only when replicas are configured, it is a SELECT issued outside of a flush,
+    the session has not written yet and the session's sticky key (see `sticky_writes`) did not write recently.
+    Once a session writes, all its following statements go to the primary, so it always reads its own writes.
+
+    The replica is chosen at the first read of a transaction and kept until the transaction ends (commit or
+    rollback), so related reads (e.g. a count and its page, or recipes and their tags) see the same replica state.
+
+    Set `session.info["sticky_key"]` (e.g. to the authenticated user's id) to enable read-your-writes stickiness
+    across requests.
+
+    On a SQLite primary, writes (flushes, INSERT, UPDATE and DELETE statements, and textual statements executed with
+    the `write=True` execution option) also go through the `write_serializer` single-writer queue: the session takes
+    the writer slot at its first write. Request handlers run their write transactions in the threadpool (e.g.
+    `await run_in_threadpool(session.commit)`), so waiting for the slot never blocks the event loop.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or not isinstance(clause, Select):
+            self.info["use_primary"] = True
+            if write_serializer is not None and is_write(clause, self._flushing):
+                write_serializer.acquire(self)
+            return engine
+
+        if self.info.get("use_primary") or replica_selector is None:
+            return engine
+
+        if sticky_writes.is_sticky(self.info.get("sticky_key")):
+            return engine
+
+        # All the reads of a transaction go to the same replica, so they see the same (possibly lagging) state.
+        if self.info.get("replica") is None:
+            self.info["replica"] = replica_selector.choose()
+        return self.info["replica"]
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def mark_sticky_writes(session):
+    """Start the read-your-writes window of the session's sticky key after it commits a write."""
+    if session.info.get("use_primary") and session.info.get("sticky_key") is not None:
+        sticky_writes.mark(session.info["sticky_key"])
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def release_replica(session, transaction):
+    """Let the next transaction of the session choose its replica again."""
+    if transaction.parent is None:
+        session.info.pop("replica", None)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def release_write_slot(session, transaction):
+    """Hand the single-writer slot to the next writer once the session's transaction ends."""
+    if write_serializer is not None and transaction.parent is None:
+        write_serializer.release(session)
+
+
+# Create a session factory that routes statements between the primary and the replica engines.
+local_session = sessionmaker(bind=engine, class_=RoutingSession, autocommit=False, autoflush=False)
 
 
 @as_declarative()
@@ -49,12 +238,16 @@ def get_db_session():
     This function creates a database session using the session factory and yields it to the caller.
     The caller should use this session and ensure it is closed properly.
 
+    The session is a `RoutingSession`: read-only handlers are served by the configured read replicas while
+    writes (and the reads that follow them) go to the primary engine.
+
     Example usage:
 
     ```python
-    with get_db_session() as db_session:
+    @router.post("/items")
+    async def create_item(db_session: Session = Depends(get_db_session)):
         # Use the database session to perform database operations.
-    # The database session is automatically closed when exiting the context.
+    # The database session is automatically closed when the request ends.
     ```
     """
     db_session = local_session()
@@ -64,9 +257,28 @@ def get_db_session():
         db_session.close()
 
 
-# Import order of models (if any) goes here.
-from src.resources.images.models import ImageModel
-from src.resources.relations.models import RelationModel
-from src.resources.recipes.models import RecipeModel
-from src.resources.recipes.models import TagModel
-from src.resources.users.models import UserModel
+def load_models():
+    """
+    Import every model and configure the mappers once.
+
+    Importing this module does not import the models, so that importing the database layer stays cheap. This
+    function is called once in the application startup phase and by the command line tools (e.g. migrations), so
+    that relationships are resolved before the first request instead of during it.
+
+    Returns:
+        Basemodel: The declarative base with all models registered.
+    """
+    # Import order of models (if any) goes here.
+    from src.resources.images.models import ImageModel
+    from src.resources.relations.models import RelationModel
+    from src.resources.recipes.models import RecipeModel
+    from src.resources.recipes.models import TagModel
+    from src.resources.recipes.models import RecipeStatsModel
+    from src.resources.recipes.models import RecipeContentModel
+    from src.resources.users.models import UserModel
+    from src.helpers.jwt.models import AccessTokenModel
+    from src.helpers.logger.models import LogEntry
+
+    configure_mappers()
+
+    return Basemodel
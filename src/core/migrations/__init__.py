@@ -0,0 +1,100 @@
+"""
+This module implements the versioned schema migrations of the application.
+
+`Basemodel.metadata.create_all` only creates missing tables; it never changes the tables of an existing database.
+Schema changes (indexes, constraints, data moves, ...) are shipped as versioned scripts in the `versions` package and
+applied in order by `upgrade`. Applied versions are recorded in the `schema_migrations` table, so each script runs
+once per database.
+
+A version script is a module named `v<NNNN>_<description>.py` that defines:
+
+    - `version` (str): The version number, e.g. "0001".
+    - a module docstring describing the migration.
+    - `upgrade(connection)`: Apply the migration using the given connection (it runs inside a transaction).
+
+Scripts must be idempotent (e.g. `CREATE INDEX IF NOT EXISTS`), because a fresh database created by `create_all`
+already has the latest schema when its first `upgrade` runs.
+
+Example usage:
+
+    python -m src.core.migrations upgrade
+    python -m src.core.migrations history
+"""
+
+import datetime
+import importlib
+import pkgutil
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import MetaData
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy import select
+
+from src.core.migrations import versions
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", String(32), primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime, default=datetime.datetime.utcnow),
+)
+
+
+def load_migrations():
+    """
+    Load the version scripts from the `versions` package.
+
+    Returns:
+        list: The version modules sorted by version.
+    """
+    modules = [importlib.import_module(f"{versions.__name__}.{name}") for _, name, _ in pkgutil.iter_modules(versions.__path__)]
+    return sorted(modules, key=lambda module: module.version)
+
+
+def applied_versions(engine):
+    """
+    Get the versions already applied to a database.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        dict: Applied versions mapped to their application timestamps.
+    """
+    metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        rows = connection.execute(select(schema_migrations.c.version, schema_migrations.c.applied_at)).all()
+
+    return {row.version: row.applied_at for row in rows}
+
+
+def upgrade(engine):
+    """
+    Apply the pending version scripts to a database, each one in its own transaction.
+
+    Args:
+        engine (Engine): The database engine.
+
+    Returns:
+        list: The versions applied by this call.
+    """
+    applied = applied_versions(engine)
+    newly_applied = []
+
+    for migration in load_migrations():
+        if migration.version in applied:
+            continue
+
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(version=migration.version, description=migration.__doc__.strip()))
+
+        newly_applied.append(migration.version)
+
+    return newly_applied
@@ -0,0 +1,42 @@
+"""
+Command line interface of the schema migrations.
+
+Commands:
+    upgrade: Create the missing tables, apply the pending version scripts and log the initialization.
+    history: List the version scripts and when they were applied.
+
+Example usage:
+
+    python -m src.core.migrations upgrade
+"""
+
+import argparse
+
+from src.core.database import engine
+from src.core.database import load_models
+from src.core.migrations import upgrade
+from src.core.migrations import applied_versions
+from src.core.migrations import load_migrations
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.core.migrations", description="FoodRecipeHub schema migrations.")
+    parser.add_argument("command", choices=["upgrade", "history"])
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        load_models().metadata.create_all(engine)
+        versions = upgrade(engine)
+        logger.log(level=LogLevel.INFO, message=dict(data="Application initialized", migrations=versions))  # noqa C408
+        print(f"applied: {', '.join(versions)}" if versions else "database is up to date")
+
+    elif args.command == "history":
+        applied = applied_versions(engine)
+        for migration in load_migrations():
+            print(f"{migration.version}\t{applied.get(migration.version, 'pending')}\t{migration.__doc__.strip()}")
+
+
+if __name__ == "__main__":
+    main()
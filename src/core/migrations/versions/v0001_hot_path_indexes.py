@@ -0,0 +1,26 @@
+"""Add the hot-path lookup indexes and unique constraints."""
+
+version = "0001"
+
+statements = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_phone_number ON users (phone_number)",
+    "CREATE INDEX IF NOT EXISTS ix_recipes_user_id ON recipes (user_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_relations_follower_id_following_id ON relations (follower_id, following_id)",
+    "CREATE INDEX IF NOT EXISTS ix_relations_following_id ON relations (following_id)",
+    "CREATE INDEX IF NOT EXISTS ix_access_tokens_user_id ON access_tokens (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_access_tokens_refresh_token ON access_tokens (refresh_token)",
+    "CREATE INDEX IF NOT EXISTS ix_images_object_type_object_id ON images (object_type, object_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_recipe_tag_association_recipe_id_tag_id ON recipe_tag_association (recipe_id, tag_id)",
+    "CREATE INDEX IF NOT EXISTS ix_recipe_tag_association_tag_id_recipe_id ON recipe_tag_association (tag_id, recipe_id)",
+]
+
+
+def upgrade(connection):
+    """
+    Create the indexes on an existing database.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    for statement in statements:
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,22 @@
+"""Add the (created_at, id) indexes backing the keyset pagination of the list endpoints."""
+
+version = "0002"
+
+# The creation timestamps are private (name mangled) columns, their names are quoted to keep their case on PostgreSQL.
+statements = [
+    'CREATE INDEX IF NOT EXISTS ix_recipes_created_at_id ON recipes ("_RecipeModel__created_at", id)',
+    'CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users ("_UserModel__created_at", id)',
+    'CREATE INDEX IF NOT EXISTS ix_relations_follower_id_followed_on_id ON relations (follower_id, "_RelationModel__followed_on", id)',
+    'CREATE INDEX IF NOT EXISTS ix_relations_following_id_followed_on_id ON relations (following_id, "_RelationModel__followed_on", id)',
+]
+
+
+def upgrade(connection):
+    """
+    Create the indexes on an existing database.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    for statement in statements:
+        connection.exec_driver_sql(statement)
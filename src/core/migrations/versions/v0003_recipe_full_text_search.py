@@ -0,0 +1,55 @@
+"""Add the recipe full-text search index (FTS5 on SQLite, tsvector + GIN on PostgreSQL)."""
+
+from sqlalchemy import inspect
+
+version = "0003"
+
+# External content FTS5 table: the text stays in `recipes`, the index is kept in sync by triggers.
+sqlite_statements = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(title, content, content='recipes', content_rowid='id', prefix='2 3')",
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_insert AFTER INSERT ON recipes BEGIN
+        INSERT INTO recipes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_delete AFTER DELETE ON recipes BEGIN
+        INSERT INTO recipes_fts(recipes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_update AFTER UPDATE OF title, content ON recipes BEGIN
+        INSERT INTO recipes_fts(recipes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO recipes_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO recipes_fts(recipes_fts) VALUES ('rebuild')",
+]
+
+# Titles weigh more than contents in the ranking. The `simple` configuration does not stem, so it suits every
+# supported language.
+postgresql_statements = [
+    """
+    ALTER TABLE recipes ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') || setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_recipes_search_vector ON recipes USING GIN (search_vector)",
+]
+
+
+def upgrade(connection):
+    """
+    Create the full-text search index of the database dialect and index the existing recipes.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    # New databases store the contents in `recipe_contents`, whose index is created by the `0006` migration.
+    if "content" not in {column["name"] for column in inspect(connection).get_columns("recipes")}:
+        return
+
+    statements = {"sqlite": sqlite_statements, "postgresql": postgresql_statements}.get(connection.dialect.name, [])
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
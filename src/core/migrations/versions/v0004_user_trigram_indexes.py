@@ -0,0 +1,22 @@
+"""Add the trigram indexes of the user substring search (pg_trgm on PostgreSQL)."""
+
+version = "0004"
+
+# SQLite has no trigram index type: the user search uses an in-process trigram index there (src.resources.users.search).
+postgresql_statements = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_phone_number_trgm ON users USING GIN (phone_number gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING GIN (email gin_trgm_ops)",
+]
+
+
+def upgrade(connection):
+    """
+    Create the trigram indexes on PostgreSQL.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    if connection.dialect.name == "postgresql":
+        for statement in postgresql_statements:
+            connection.exec_driver_sql(statement)
@@ -0,0 +1,32 @@
+"""Compact the duplicated tag rows into one canonical row per tag title."""
+
+version = "0005"
+
+# Recipes used to create their own tag rows. Their links are moved to the lowest ID of each title (dropping the links
+# of deleted recipes and the duplicates), then the other rows are deleted and the titles made unique.
+statements = [
+    """
+    CREATE TABLE recipe_tag_association_compact AS
+    SELECT DISTINCT association.recipe_id AS recipe_id, canonical.id AS tag_id
+    FROM recipe_tag_association association
+    JOIN tags tag ON tag.id = association.tag_id
+    JOIN (SELECT title, MIN(id) AS id FROM tags GROUP BY title) canonical ON canonical.title = tag.title
+    WHERE association.recipe_id IN (SELECT id FROM recipes)
+    """,
+    "DELETE FROM recipe_tag_association",
+    "INSERT INTO recipe_tag_association (recipe_id, tag_id) SELECT recipe_id, tag_id FROM recipe_tag_association_compact",
+    "DROP TABLE recipe_tag_association_compact",
+    "DELETE FROM tags WHERE id NOT IN (SELECT MIN(id) FROM tags GROUP BY title)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_tags_title ON tags (title)",
+]
+
+
+def upgrade(connection):
+    """
+    Compact the tag rows and their recipe links.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    for statement in statements:
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,115 @@
+"""Move the recipe contents to the recipe_contents table and re-point the full-text search index to it."""
+
+from sqlalchemy import inspect
+
+version = "0006"
+
+# Existing databases: the contents are copied to `recipe_contents`, then dropped from `recipes`.
+move_statements = [
+    "INSERT INTO recipe_contents (recipe_id, content) SELECT id, content FROM recipes WHERE id NOT IN (SELECT recipe_id FROM recipe_contents)",
+    "ALTER TABLE recipes DROP COLUMN content",
+]
+
+# The old index reads `recipes.content`, so it is dropped before the move.
+sqlite_drop_statements = [
+    "DROP TRIGGER IF EXISTS recipes_fts_insert",
+    "DROP TRIGGER IF EXISTS recipes_fts_delete",
+    "DROP TRIGGER IF EXISTS recipes_fts_update",
+    "DROP TABLE IF EXISTS recipes_fts",
+]
+
+# External content FTS5 table over a view joining the titles and the contents; the index is kept in sync by triggers.
+# A content row is inserted after its recipe and deleted before it, so the title is read from `recipes`.
+sqlite_statements = [
+    """
+    CREATE VIEW IF NOT EXISTS recipe_documents AS
+    SELECT recipes.id AS id, recipes.title AS title, recipe_contents.content AS content
+    FROM recipes JOIN recipe_contents ON recipe_contents.recipe_id = recipes.id
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(title, content, content='recipe_documents', content_rowid='id', prefix='2 3')",
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_contents_fts_insert AFTER INSERT ON recipe_contents BEGIN
+        INSERT INTO recipes_fts(rowid, title, content) SELECT id, title, new.content FROM recipes WHERE id = new.recipe_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_contents_fts_delete AFTER DELETE ON recipe_contents BEGIN
+        INSERT INTO recipes_fts(recipes_fts, rowid, title, content) SELECT 'delete', id, title, old.content FROM recipes WHERE id = old.recipe_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_contents_fts_update AFTER UPDATE OF content ON recipe_contents BEGIN
+        INSERT INTO recipes_fts(recipes_fts, rowid, title, content) SELECT 'delete', id, title, old.content FROM recipes WHERE id = old.recipe_id;
+        INSERT INTO recipes_fts(rowid, title, content) SELECT id, title, new.content FROM recipes WHERE id = new.recipe_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipes_fts_update AFTER UPDATE OF title ON recipes BEGIN
+        INSERT INTO recipes_fts(recipes_fts, rowid, title, content) SELECT 'delete', old.id, old.title, content FROM recipe_contents WHERE recipe_id = old.id;
+        INSERT INTO recipes_fts(rowid, title, content) SELECT new.id, new.title, content FROM recipe_contents WHERE recipe_id = new.id;
+    END
+    """,
+    "INSERT INTO recipes_fts(recipes_fts) VALUES ('rebuild')",
+]
+
+# The generated `search_vector` column (and its index) depends on `recipes.content`.
+postgresql_drop_statements = [
+    "ALTER TABLE recipes DROP COLUMN IF EXISTS search_vector",
+]
+
+# A generated column cannot read another table, so `recipes.search_vector` becomes a plain column kept up to date by
+# triggers on both tables (same weights as the `0003` migration).
+postgresql_statements = [
+    "ALTER TABLE recipes ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION recipes_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce((SELECT content FROM recipe_contents WHERE recipe_id = NEW.id), '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION recipe_contents_search_vector() RETURNS trigger AS $$
+    BEGIN
+        UPDATE recipes SET search_vector = setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(NEW.content, '')), 'B')
+        WHERE id = NEW.recipe_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS recipes_search_vector ON recipes",
+    "CREATE TRIGGER recipes_search_vector BEFORE INSERT OR UPDATE OF title ON recipes FOR EACH ROW EXECUTE FUNCTION recipes_search_vector()",
+    "DROP TRIGGER IF EXISTS recipe_contents_search_vector ON recipe_contents",
+    """
+    CREATE TRIGGER recipe_contents_search_vector AFTER INSERT OR UPDATE OF content ON recipe_contents
+    FOR EACH ROW EXECUTE FUNCTION recipe_contents_search_vector()
+    """,
+    """
+    UPDATE recipes SET search_vector = setweight(to_tsvector('simple', coalesce(recipes.title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(recipe_contents.content, '')), 'B')
+    FROM recipe_contents WHERE recipe_contents.recipe_id = recipes.id
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_recipes_search_vector ON recipes USING GIN (search_vector)",
+]
+
+
+def upgrade(connection):
+    """
+    Move the contents of the existing recipes (if any) and create the full-text search index of the database dialect.
+
+    The `recipe_contents` table itself is created by `create_all`.
+
+    Args:
+        connection (Connection): The database connection.
+    """
+    statements = {"sqlite": sqlite_statements, "postgresql": postgresql_statements}.get(connection.dialect.name, [])
+
+    if "content" in {column["name"] for column in inspect(connection).get_columns("recipes")}:
+        drop_statements = {"sqlite": sqlite_drop_statements, "postgresql": postgresql_drop_statements}.get(connection.dialect.name, [])
+        statements = drop_statements + move_statements + statements
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
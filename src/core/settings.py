@@ -34,6 +34,24 @@ _DB_NAME = ""
 DATABASE = {
     "URL": f"sqlite:///.//db.sqlite3" if DEBUG else f"postgresql+psycopg2://{_DB_USER}:{_DB_PASSWORD}@{_DB_HOST}:{_DB_PORT}/{_DB_NAME}",
     "PARAMS": {"connect_args": {"check_same_thread": False}} if DEBUG else {"isolation_level": "REPEATABLE READ"},
+    # Read replicas used by read-only statements, e.g. ["sqlite:///.//replica1.sqlite3", "sqlite:///.//replica2.sqlite3"].
+    "REPLICAS": [],
+    # Replica selection policy: "round_robin" or "least_connections".
+    "REPLICA_POLICY": "round_robin",
+    # Seconds a user's reads stick to the primary after the user's own write (read-your-writes).
+    "STICKY_SECONDS": 5,
+}
+
+########## SQLite Settings ##########
+SQLITE = {
+    "PRAGMAS": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "busy_timeout": 5000,
+    },
+    "SERIALIZE_WRITES": True,
 }
 
 ########## JWT Settings ##########
@@ -41,6 +59,22 @@ JWT = {
     "ALGORITHM": "HS256",
     "ACCESS_TOKEN_EXPIRE_MINUTES": 60,
     "REFRESH_TOKEN_EXPIRE_MINUTES": 1440,
+    "CLAIMS_CACHE_SIZE": 10000,  # Verified access tokens whose claims are kept in the worker (until the tokens expire).
+    "REVOCATION_LOCAL_TTL_SECONDS": 5,  # Seconds a worker keeps the revocation time of a user (revocations reach the other workers after it).
+}
+
+########## Password Hashing Settings ##########
+PASSWORD_HASHING = {
+    "SCHEMES": ["pbkdf2_sha512"],  # Hash schemes; new hashes use the first one, the others are rehashed at login.
+    "ROUNDS": 25000,  # Rounds of the first scheme; hashes with fewer rounds are rehashed at login.
+    "WORKERS": 2,  # Processes hashing and verifying the passwords off the event loop (0 hashes in-line).
+}
+
+########## Identity Cache Settings ##########
+IDENTITY_CACHE = {
+    "TTL_SECONDS": 300,  # Seconds an authenticated user's identity is kept in Redis (shared by the workers).
+    "LOCAL_TTL_SECONDS": 5,  # Seconds it is kept in the worker's own cache (the staleness bound seen by the other workers).
+    "SIZE": 10000,  # Identities kept in the worker's own cache (least recently used ones are evicted).
 }
 
 ########## Ratelimit Settings ##########
@@ -49,6 +83,70 @@ RATE_LIMIT = {
     "router_limits": {"recipes": "10 per hour"},
 }
 
+########## Pagination Settings ##########
+PAGINATION = {
+    "COUNT_CACHE_TIMEOUT": 300,  # Seconds the total count of a list stays cached (counts are invalidated with their lists).
+    "ESTIMATED_COUNT": False,  # Use the PostgreSQL planner estimate instead of an exact COUNT(*) for large lists.
+    "ESTIMATED_COUNT_MIN": 10000,  # Estimates below this value are replaced by an exact count.
+}
+
+########## Recipe Import Settings ##########
+RECIPE_IMPORT = {
+    "BATCH_SIZE": 500,  # Rows validated and saved per transaction by the bulk import (one cache invalidation per batch).
+}
+
+########## Recipe Details Settings ##########
+RECIPE_DETAILS = {
+    "MAX_UUIDS": 100,  # Maximum number of recipes requested at once from /recipe/details.
+}
+
+########## Feed Settings ##########
+FEED = {
+    "TIMELINE_SIZE": 800,  # Recipes kept in every user's timeline (older recipes drop out of the feed).
+    "FAN_OUT_MAX_FOLLOWERS": 10000,  # Authors with more followers are not fanned out; their recipes are merged in at read time.
+}
+
+########## Trending Settings ##########
+TRENDING = {
+    "HALF_LIFE_HOURS": 24,  # Hours after which an engagement event counts half.
+    "WEIGHTS": {"view": 1.0, "follow": 3.0, "create": 5.0},  # Score of every engagement event.
+    "SIZE": 1000,  # Recipes kept in the trending set by the refresh.
+    "REFRESH_SECONDS": 600,  # Seconds between refreshes of the trending set (None disables the background job).
+    "REFRESH_LOCK_SECONDS": 540,  # A refresh claims the set for this long, so that the workers do not refresh it twice in a period.
+    "MAX_COUNT": 100,  # Maximum number of recipes requested from /recipe/trending.
+}
+
+########## Recipe Stats Settings ##########
+RECIPE_STATS = {
+    "FLUSH_SECONDS": 5,  # Seconds between the bulk writes of the view counters to the recipe_stats table (None disables them).
+}
+
+########## Export Settings ##########
+EXPORT = {
+    "ADMIN_PHONE_NUMBERS": [],  # Phone numbers of the users allowed to use the /export endpoints.
+    "YIELD_PER": 1000,  # Rows fetched at a time from the server-side cursor of an export.
+    "CHECKPOINT_ROWS": 10000,  # Rows between two checkpoints of the export command.
+}
+
+########## User Search Settings ##########
+USER_SEARCH = {
+    "REFRESH_SECONDS": 300,  # Seconds between rebuilds of the in-process trigram index (SQLite only).
+    "MAX_CANDIDATES": 1000,  # Above this many candidates (SQLite only) the search is a plain scan without similarity order.
+}
+
+########## Database Statistics Settings ##########
+DB_STATS = {
+    "HEADER": "X-DB-Stats",  # Response header carrying the per-request statement statistics (debug mode only).
+    "N_PLUS_ONE_THRESHOLD": 3,  # Executions of the same statement in one request flagged as an N+1 pattern.
+}
+
+########## Slow Query Log Settings ##########
+SLOW_QUERY = {
+    "THRESHOLD_MS": 200,  # Statements slower than this are logged (None disables the log).
+    "EXPLAIN": False,  # Capture the query plan of slow SELECT statements.
+    "FILE": os.path.join(BASE_DIR, "logs", "slow_queries.log"),
+}
+
 ########## Language Settings ##########
 LANGUAGE = {"default": "en", "supported": ["en", "fa"], "dir": os.path.join(BASE_DIR, "locale")}
 
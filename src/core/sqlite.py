@@ -0,0 +1,143 @@
+"""
+This module holds the SQLite production profile used when the application runs on a SQLite database.
+
+SQLite allows a single writer at a time. With the default rollback journal, readers and writers block each other and
+concurrent commits (handlers, the logger, ...) end up in `database is locked` stalls. The profile:
+
+    - applies the pragmas from `settings.SQLITE["PRAGMAS"]` (WAL journal, `synchronous=NORMAL`, mmap, cache size and
+      busy timeout) on every new connection, so readers proceed concurrently with the writer.
+    - serializes write transactions (INSERT, UPDATE, DELETE and flushes) in the process through `WriteSerializer`, so
+      writers queue up in order instead of racing for the database lock; a write that goes ahead without the writer
+      slot is logged to the `sqlite_writes` logger.
+    - registers the SQL functions SQLite lacks (e.g. `similarity()`) through `register_functions`.
+
+Example usage:
+
+    from src.core.sqlite import apply_pragmas, WriteSerializer
+
+    apply_pragmas(engine, {"journal_mode": "WAL", "busy_timeout": 5000})
+    write_serializer = WriteSerializer(timeout=5)
+"""
+
+import asyncio
+import logging
+import threading
+
+from sqlalchemy import event
+
+
+def apply_pragmas(engine, pragmas):
+    """
+    Apply the given pragmas on every new connection of a SQLite engine.
+
+    Args:
+        engine (Engine): The SQLite engine.
+        pragmas (dict): Pragma names mapped to their values, e.g. {"journal_mode": "WAL"}.
+
+    Returns:
+        Engine: The same engine.
+    """
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def register_functions(engine, functions):
+    """
+    Register Python functions as SQL functions on every new connection of a SQLite engine.
+
+    Args:
+        engine (Engine): The SQLite engine.
+        functions (dict): SQL function names mapped to their (number of arguments, function), e.g.
+            {"similarity": (2, trigram_similarity)}.
+
+    Returns:
+        Engine: The same engine.
+    """
+
+    @event.listens_for(engine, "connect")
+    def create_functions(dbapi_connection, connection_record):
+        for name, (num_params, function) in functions.items():
+            dbapi_connection.create_function(name, num_params, function, deterministic=True)
+
+    return engine
+
+
+# Writes that go ahead without the writer slot (the application logger itself writes to the database).
+write_logger = logging.getLogger("sqlite_writes")
+
+
+class WriteSerializer:
+    """
+    Single-writer queue that serializes the write transactions of the process.
+
+    A session holds the writer slot from its first write of a transaction until the transaction ends (commit, rollback
+    or close). Other sessions wait for the slot in order, so write latency stays predictable and SQLite never sees two
+    writers of the same process at once.
+
+    The slot is never waited for on the event loop thread: request handlers run their write transactions in the
+    threadpool, where `acquire` waits for the slot, while on the event loop `acquire` only takes a free slot.
+
+    If the slot cannot be acquired (within `timeout` seconds off the event loop, at once on it) the session proceeds
+    anyway and SQLite's own `busy_timeout` arbitrates, so a stuck transaction can never deadlock the application; the
+    unserialized write is logged as a warning.
+
+    Args:
+        timeout (float): Seconds to wait for the writer slot.
+
+    Example usage:
+
+    ```python
+    write_serializer.acquire(session)  # Before the first write of the transaction.
+    write_serializer.release(session)  # When the transaction ends.
+    ```
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def acquire(self, session):
+        """
+        Acquire the writer slot for a session (no-op if the session already holds it).
+
+        On the event loop thread the slot is only taken if it is free, so the loop never blocks on it.
+
+        Args:
+            session (Session): The SQLAlchemy session about to write.
+
+        Returns:
+            bool: True if the session holds the writer slot.
+        """
+        if session.info.get("write_slot"):
+            return True
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if not self._lock.acquire(timeout=self.timeout):
+                write_logger.warning("Writer slot not acquired within %s seconds, the write goes ahead unserialized", self.timeout)
+                return False
+        else:
+            if not self._lock.acquire(blocking=False):
+                write_logger.warning("Writer slot busy on the event loop, the write goes ahead unserialized (run it in the threadpool)")
+                return False
+
+        session.info["write_slot"] = True
+        return True
+
+    def release(self, session):
+        """
+        Release the writer slot held by a session (no-op if the session does not hold it).
+
+        Args:
+            session (Session): The SQLAlchemy session whose transaction ended.
+        """
+        if session.info.pop("write_slot", False):
+            self._lock.release()
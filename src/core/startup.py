@@ -1,4 +1,16 @@
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
+
+from src.core import settings
+from src.core.database import engine
+from src.core.database import load_models
 from src.core.database import local_session
+from src.helpers.passwords import shutdown_pool
+from src.resources.recipes.stats import flush_views
+from src.resources.recipes.stats import run_flush_job
+from src.resources.recipes.trending import run_refresh_job
+from src.resources.users.search import run_rebuild_job
 
 
 class StartupManager:
@@ -24,7 +36,7 @@ class StartupManager:
     startup_manager = StartupManager()
 
     @startup_manager.register
-    async def my_startup_method(session):
+    def my_startup_method(session):
         # Initialization logic here
 
     async def startup_event():
@@ -37,7 +49,7 @@ class StartupManager:
     def __init__(self):
         self.startup_methods = []
 
-    async def register(self, method):
+    def register(self, method):
         """
         Register a method as a startup method.
 
@@ -51,7 +63,7 @@ class StartupManager:
 
         ```python
         @startup_manager.register
-        async def my_startup_method(session):
+        def my_startup_method(session):
             # Initialization logic here
         ```
 
@@ -73,6 +85,59 @@ class StartupManager:
 startup_manager = StartupManager()
 
 
+@startup_manager.register
+def configure_models(session):
+    """
+    Import the models and configure the mappers before the first request is served.
+
+    Args:
+        session: The database session.
+    """
+    load_models()
+
+
+# Background tasks started with the application, cancelled on shutdown.
+background_tasks = set()
+
+
+@startup_manager.register
+def start_trending_refresh(session):
+    """
+    Start the periodic refresh of the trending recipes (disabled if `settings.TRENDING["REFRESH_SECONDS"]` is None).
+
+    With several workers sharing Redis, every period is refreshed by the worker that claims it first (see `trending.refresh`).
+
+    Args:
+        session: The database session.
+    """
+    if settings.TRENDING["REFRESH_SECONDS"]:
+        background_tasks.add(asyncio.get_running_loop().create_task(run_refresh_job()))
+
+
+@startup_manager.register
+def start_view_counters_flush(session):
+    """
+    Start the periodic flush of the recipe view counters (disabled if `settings.RECIPE_STATS["FLUSH_SECONDS"]` is None).
+
+    Args:
+        session: The database session.
+    """
+    if settings.RECIPE_STATS["FLUSH_SECONDS"]:
+        background_tasks.add(asyncio.get_running_loop().create_task(run_flush_job()))
+
+
+@startup_manager.register
+def start_user_index_rebuild(session):
+    """
+    Start the periodic rebuild of the in-process user search index (SQLite only).
+
+    Args:
+        session: The database session.
+    """
+    if engine.dialect.name == "sqlite":
+        background_tasks.add(asyncio.get_running_loop().create_task(run_rebuild_job()))
+
+
 async def startup_event():
     """
     Event handler for running startup methods.
@@ -82,3 +147,19 @@ async def startup_event():
 
     with local_session() as session:
         await startup_manager.run(session)
+
+
+async def shutdown_event():
+    """
+    Event handler for stopping the background tasks, flushing the pending view counters and stopping the password hashing pool.
+
+    This function is called during the application shutdown.
+    """
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+
+    # The views counted since the last periodic flush (a blocking write, like the periodic flush: off the event loop).
+    await run_in_threadpool(flush_views)
+
+    shutdown_pool()
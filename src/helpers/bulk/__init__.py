@@ -0,0 +1,86 @@
+import json
+
+from src.core.exceptions import BadRequestException
+from fastapi_babel.core import make_gettext as _
+
+# Content types of the newline-delimited JSON bodies (one record per line), read as a stream.
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+
+
+async def read_records(request):
+    """
+    Read the records of a bulk request body.
+
+    A newline-delimited JSON body (see `NDJSON_CONTENT_TYPES`) is read as a stream, one record per line (blank lines
+    are skipped), so its size is not bound by memory. Any other body must be a JSON array of records.
+
+    Args:
+        request (Request): The incoming request object.
+
+    Yields:
+        tuple: The row number (1-based line or array position), the decoded record and the error message of the row
+            (None if the row is valid JSON).
+
+    Raises:
+        BadRequestException: If a JSON array body is malformed.
+
+    Example usage:
+
+    ```python
+    async for row, record, error in read_records(request):
+        ...
+    ```
+
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        row, buffer = 0, b""
+        async for chunk in request.stream():
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for line in lines:
+                row += 1
+                if line.strip():
+                    yield (row, *_decode(line))
+        if buffer.strip():
+            yield (row + 1, *_decode(buffer))
+        return
+
+    try:
+        records = json.loads(await request.body())
+    except ValueError:
+        records = None
+
+    if not isinstance(records, list):
+        raise BadRequestException(message=_("The request body must be a JSON array or newline-delimited JSON"))
+
+    for row, record in enumerate(records, start=1):
+        yield row, record, None
+
+
+async def batched(records, size):
+    """
+    Group the items of an async iterable into lists.
+
+    Args:
+        records (AsyncIterable): The items.
+        size (int): The maximum number of items of a list.
+
+    Yields:
+        list: The next (at most `size`) items.
+    """
+    batch = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _decode(line):
+    try:
+        return json.loads(line), None
+    except ValueError:
+        return None, _("Invalid JSON")
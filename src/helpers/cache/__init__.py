@@ -1,5 +1,9 @@
+import json
 import aioredis
 from src.core import settings
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+from src.helpers.metrics import metrics
 
 
 async def get_redis_pool():
@@ -28,3 +32,78 @@ async def get_redis_pool():
         decode_responses=True,
     )
     return redis_pool
+
+
+def make_cache_key(cache_key, *args, **kwargs):
+    """
+    Build the Redis key of a cached function call (the `session` argument is not part of the key).
+
+    Args:
+        cache_key (str): The cache key of the function.
+        *args: The positional arguments of the call.
+        **kwargs: The keyword arguments of the call.
+
+    Returns:
+        str: The Redis key.
+
+    Example usage:
+
+    ```python
+    key = make_cache_key("recipe_detail", recipe_uuid=recipe_uuid)
+    ```
+
+    """
+    cache_key_kwargs = {k: v for k, v in kwargs.items() if k != "session"}
+    return f"{settings.CACHE['PREFIX']}{cache_key}:{args}{cache_key_kwargs}"
+
+
+async def get_many(cache_key, calls, fetch, timeout=settings.CACHE["DEFAULT_EXPIRE_TIME"]):
+    """
+    Get the results of several calls of a function cached with `@cache(cache_key)` at once.
+
+    The cached results are read with one `MGET`, the missing ones are computed together by `fetch` and written back
+    in one pipeline, sharing the entries of the single calls.
+
+    Args:
+        cache_key (str): The cache key of the function.
+        calls (list[dict]): The keyword arguments of the calls.
+        fetch (callable): Coroutine function computing the results of the missing calls (it receives their keyword
+            arguments and returns their results in the same order).
+        timeout (int): The expiration time of the new entries in seconds (default is from settings).
+
+    Returns:
+        list: The results of the calls, in order.
+
+    Example usage:
+
+    ```python
+    details = await get_many("recipe_detail", [{"recipe_uuid": uuid} for uuid in uuids], fetch_details)
+    ```
+
+    """
+    if settings.DEBUG or not calls:
+        return await fetch(calls)
+
+    redis = await get_redis_pool()
+    keys = [make_cache_key(cache_key, **kwargs) for kwargs in calls]
+    cached = await redis.mget(keys)
+
+    results = [None if result is None else json.loads(result) for result in cached]
+    missing = [index for index, result in enumerate(cached) if result is None]
+    metrics.increment("cache_hits", len(keys) - len(missing))
+    metrics.increment("cache_misses", len(missing))
+
+    if missing:
+        fetched = await fetch([calls[index] for index in missing])
+        async with redis.pipeline(transaction=False) as pipe:
+            for index, result in zip(missing, fetched):
+                results[index] = result
+                pipe.setex(keys[index], timeout, json.dumps(result))
+            await pipe.execute()
+
+    logger.log(
+        level=LogLevel.INFO,
+        message=f"USE CACHE-> {len(keys) - len(missing)} of {len(keys)} {cache_key} entries ({timeout})",
+    )
+
+    return results
@@ -3,7 +3,9 @@ from functools import wraps
 from src.core import settings
 from src.helpers.logger import logger
 from src.helpers.logger.models import LogLevel
+from src.helpers.metrics import metrics
 from src.helpers.cache import get_redis_pool
+from src.helpers.cache import make_cache_key
 
 
 def cache(cache_key, timeout=settings.CACHE["DEFAULT_EXPIRE_TIME"]):
@@ -39,12 +41,12 @@ def cache(cache_key, timeout=settings.CACHE["DEFAULT_EXPIRE_TIME"]):
 
                 redis = await get_redis_pool()
 
-                cache_key_kwargs = {k: v for k, v in kwargs.items() if k != "session"}
-                cache_key_full = f"{settings.CACHE['PREFIX']}{cache_key}:{args}{cache_key_kwargs}"
+                cache_key_full = make_cache_key(cache_key, *args, **kwargs)
 
                 result = await redis.get(cache_key_full)
 
                 if result is None:
+                    metrics.increment("cache_misses")
                     result = await func(*args, **kwargs)
                     result = json.dumps(result)
                     await redis.setex(cache_key_full, timeout, result)
@@ -55,6 +57,7 @@ def cache(cache_key, timeout=settings.CACHE["DEFAULT_EXPIRE_TIME"]):
                     )
 
                 else:
+                    metrics.increment("cache_hits")
                     logger.log(
                         level=LogLevel.INFO,
                         message=f"USE CACHE-> {cache_key_full}:{result}",
@@ -0,0 +1,81 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    In-process cache of at most `maxsize` entries, each expiring `ttl` seconds after it was set.
+
+    When the cache is full, the least recently used entry is evicted. Reads and writes cost O(1) and are thread safe.
+
+    Example usage:
+
+    ```python
+    identities = TTLCache(maxsize=10000, ttl=5)
+    identities.set(42, {"id": 42, "phone_number": "+989121234567"})
+    identities.get(42)  # {"id": 42, ...} for the next 5 seconds, then None
+    ```
+
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Get the value of a key (and mark it as recently used).
+
+        Args:
+            key (Hashable): The key.
+            default: The value returned if the key is missing or expired.
+
+        Returns:
+            The value, or `default`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """
+        Set the value of a key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (Hashable): The key.
+            value: The value.
+            ttl (float, optional): The time to live of this entry in seconds (at most the `ttl` of the cache).
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove a key.
+
+        Args:
+            key (Hashable): The key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every key."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,395 @@
+import time
+import bisect
+import threading
+
+from src.core import settings
+from src.helpers.cache import get_redis_pool
+
+
+# Forward-decayed increment: KEYS = the sorted set and its epoch set, ARGV = now, half-life, then member / amount pairs.
+INCREMENT_DECAYED = """
+local now, half_life = tonumber(ARGV[1]), tonumber(ARGV[2])
+local epoch = tonumber(redis.call("ZSCORE", KEYS[2], "epoch"))
+if not epoch then
+    epoch = now
+    redis.call("ZADD", KEYS[2], ARGV[1], "epoch")
+end
+local decay = 2 ^ ((now - epoch) / half_life)
+for i = 3, #ARGV, 2 do
+    redis.call("ZINCRBY", KEYS[1], tonumber(ARGV[i + 1]) * decay, ARGV[i])
+end
+"""
+
+# Rescale of forward-decayed scores to a new epoch: KEYS = the sorted set and its epoch set, ARGV = now, half-life,
+# cap (0 for none) and minimum score ("" for none).
+RESCALE_DECAYED = """
+local now, half_life = tonumber(ARGV[1]), tonumber(ARGV[2])
+local epoch = tonumber(redis.call("ZSCORE", KEYS[2], "epoch")) or now
+redis.call("ZUNIONSTORE", KEYS[1], 1, KEYS[1], "WEIGHTS", 2 ^ (-(now - epoch) / half_life))
+if ARGV[4] ~= "" then
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", "(" .. ARGV[4])
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call("ZREMRANGEBYRANK", KEYS[1], 0, -tonumber(ARGV[3]) - 1)
+end
+redis.call("ZADD", KEYS[2], ARGV[1], "epoch")
+"""
+
+
+class RedisSortedSets:
+    """
+    Sorted sets stored in Redis (members are strings, ordered by their numeric score).
+
+    Example usage:
+
+    ```python
+    store = RedisSortedSets()
+    await store.add_many(["timeline:1", "timeline:2"], {"42": 42}, cap=800)
+    await store.range_before("timeline:1", before=None, count=10)  # ["42"]
+    ```
+
+    """
+
+    async def add_many(self, keys, members, cap=None, keep_lowest=0):
+        """
+        Add the same members to several sorted sets in one round trip.
+
+        Args:
+            keys (list[str]): The keys of the sorted sets.
+            members (dict): The members mapped to their scores.
+            cap (int, optional): Keep only the `cap` members with the highest scores of every set.
+            keep_lowest (int): Number of lowest-scored members (e.g. a sentinel) kept besides the `cap` members.
+        """
+        if not keys or not members:
+            return
+
+        redis = await get_redis_pool()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.zadd(key, members)
+                if cap:
+                    pipe.zremrangebyrank(key, keep_lowest, -cap - 1)
+            await pipe.execute()
+
+    async def range_before(self, key, before, count):
+        """
+        Get the members with the highest scores below a bound, highest first.
+
+        Args:
+            key (str): The key of the sorted set.
+            before (float | None): The exclusive upper bound of the scores (None for no bound).
+            count (int): The maximum number of members.
+
+        Returns:
+            list[str]: The members.
+        """
+        redis = await get_redis_pool()
+        return await redis.zrevrangebyscore(key, "+inf" if before is None else f"({before}", "-inf", start=0, num=count)
+
+    async def top(self, key, count):
+        """
+        Get the members with the highest scores, highest first.
+
+        Args:
+            key (str): The key of the sorted set.
+            count (int): The maximum number of members.
+
+        Returns:
+            list[tuple]: The (member, score) pairs.
+        """
+        redis = await get_redis_pool()
+        return await redis.zrevrange(key, 0, count - 1, withscores=True)
+
+    async def score(self, key, member):
+        """
+        Get the score of a member.
+
+        Args:
+            key (str): The key of the sorted set.
+            member (str): The member.
+
+        Returns:
+            float | None: The score, or None if the member is not in the set.
+        """
+        redis = await get_redis_pool()
+        return await redis.zscore(key, member)
+
+    async def increment(self, key, members):
+        """
+        Add amounts to the scores of members (missing members start at 0), in one round trip.
+
+        Args:
+            key (str): The key of the sorted set.
+            members (dict): The members mapped to the amounts added to their scores.
+        """
+        if not members:
+            return
+
+        redis = await get_redis_pool()
+        async with redis.pipeline(transaction=False) as pipe:
+            for member, amount in members.items():
+                pipe.zincrby(key, amount, member)
+            await pipe.execute()
+
+    async def increment_decayed(self, key, epoch_key, members, now, half_life):
+        """
+        Add decaying amounts to the scores of members (forward decay), in one round trip.
+
+        The amounts are weighted by `2 ** ((now - epoch) / half_life)`, where the epoch is the score of the "epoch"
+        member of `epoch_key` (started at `now` if missing), so the scores of the set stay in decayed order. The epoch is
+        read and the scores incremented by one script, so they never see a concurrent `rescale_decayed` half-done.
+
+        Args:
+            key (str): The key of the sorted set.
+            epoch_key (str): The key of the sorted set holding the epoch of the scores.
+            members (dict): The members mapped to the amounts added to their scores (as of now).
+            now (float): The current time (seconds).
+            half_life (float): The half-life of the scores (seconds).
+        """
+        if not members:
+            return
+
+        redis = await get_redis_pool()
+        args = [now, half_life, *(item for member, amount in members.items() for item in (member, amount))]
+        await redis.register_script(INCREMENT_DECAYED)(keys=[key, epoch_key], args=args)
+
+    async def rescale_decayed(self, key, epoch_key, now, half_life, cap=None, min_score=None):
+        """
+        Move the epoch of forward-decayed scores to now, then drop the low-scored members, atomically (one script).
+
+        Args:
+            key (str): The key of the sorted set.
+            epoch_key (str): The key of the sorted set holding the epoch of the scores.
+            now (float): The current time (seconds), the new epoch.
+            half_life (float): The half-life of the scores (seconds).
+            cap (int, optional): Keep only the `cap` members with the highest scores.
+            min_score (float, optional): Drop the members scored below this value (after the rescale).
+        """
+        redis = await get_redis_pool()
+        await redis.register_script(RESCALE_DECAYED)(keys=[key, epoch_key], args=[now, half_life, cap or 0, "" if min_score is None else min_score])
+
+    async def claim(self, key, ttl_ms):
+        """
+        Claim a key for some time (`SET NX PX`), e.g. to run a periodic job on one worker only.
+
+        Args:
+            key (str): The key of the claim.
+            ttl_ms (int): How long the claim lasts (milliseconds).
+
+        Returns:
+            bool: True if the caller got the claim, False if it is held by someone else.
+        """
+        redis = await get_redis_pool()
+        return bool(await redis.set(key, "1", nx=True, px=ttl_ms))
+
+    async def members(self, key):
+        """
+        Get all the members of a sorted set, lowest score first.
+
+        Args:
+            key (str): The key of the sorted set.
+
+        Returns:
+            list[str]: The members.
+        """
+        redis = await get_redis_pool()
+        return await redis.zrange(key, 0, -1)
+
+    async def remove(self, key, *members):
+        """
+        Remove members from a sorted set.
+
+        Args:
+            key (str): The key of the sorted set.
+            *members (str): The members to remove.
+        """
+        redis = await get_redis_pool()
+        await redis.zrem(key, *members)
+
+    async def existing(self, keys):
+        """
+        Get the keys of the sorted sets that exist, in one round trip.
+
+        Args:
+            keys (list[str]): The keys.
+
+        Returns:
+            list[str]: The existing keys.
+        """
+        if not keys:
+            return []
+
+        redis = await get_redis_pool()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.exists(key)
+            found = await pipe.execute()
+        return [key for key, exists in zip(keys, found) if exists]
+
+    async def delete(self, *keys):
+        """
+        Delete sorted sets.
+
+        Args:
+            *keys (str): The keys of the sorted sets.
+        """
+        redis = await get_redis_pool()
+        await redis.delete(*keys)
+
+
+class MemorySortedSets:
+    """
+    In-process sorted sets with the interface of `RedisSortedSets` (used in debug mode, where Redis is optional).
+
+    Every set is a list of (score, member) pairs kept sorted with `bisect`, plus a member-to-score map, so adding a
+    member costs O(log n + shift) and a range costs O(log n + count).
+    """
+
+    def __init__(self):
+        self._sets = {}
+        self._claims = {}
+        self._lock = threading.Lock()
+
+    async def add_many(self, keys, members, cap=None, keep_lowest=0):
+        """See `RedisSortedSets.add_many`."""
+        if not keys or not members:
+            return
+
+        with self._lock:
+            for key in keys:
+                entries, scores = self._sets.setdefault(key, ([], {}))
+                for member, score in members.items():
+                    member = str(member)
+                    if member in scores:
+                        entries.pop(bisect.bisect_left(entries, (scores[member], member)))
+                    bisect.insort(entries, (score, member))
+                    scores[member] = score
+                if cap and len(entries) > cap + keep_lowest:
+                    for _, member in entries[keep_lowest : len(entries) - cap]:
+                        del scores[member]
+                    del entries[keep_lowest : len(entries) - cap]
+
+    async def range_before(self, key, before, count):
+        """See `RedisSortedSets.range_before`."""
+        with self._lock:
+            entries, _ = self._sets.get(key, ([], {}))
+            end = len(entries) if before is None else bisect.bisect_left(entries, (before,))
+            return [member for _, member in reversed(entries[max(end - count, 0) : end])]
+
+    async def top(self, key, count):
+        """See `RedisSortedSets.top`."""
+        with self._lock:
+            entries, _ = self._sets.get(key, ([], {}))
+            return [(member, score) for score, member in reversed(entries[max(len(entries) - count, 0) :])]
+
+    async def score(self, key, member):
+        """See `RedisSortedSets.score`."""
+        with self._lock:
+            _, scores = self._sets.get(key, ([], {}))
+            return scores.get(str(member))
+
+    async def increment(self, key, members):
+        """See `RedisSortedSets.increment`."""
+        if not members:
+            return
+
+        with self._lock:
+            self._increment(key, members)
+
+    async def increment_decayed(self, key, epoch_key, members, now, half_life):
+        """See `RedisSortedSets.increment_decayed`."""
+        if not members:
+            return
+
+        with self._lock:
+            decay = 2 ** ((now - self._epoch(epoch_key, now)) / half_life)
+            self._increment(key, {member: amount * decay for member, amount in members.items()})
+
+    async def rescale_decayed(self, key, epoch_key, now, half_life, cap=None, min_score=None):
+        """See `RedisSortedSets.rescale_decayed`."""
+        with self._lock:
+            factor = 2 ** (-(now - self._epoch(epoch_key, now)) / half_life)
+            entries, _ = self._sets.get(key, ([], {}))
+            entries = [(score * factor, member) for score, member in entries]
+            if min_score is not None:
+                entries = entries[bisect.bisect_left(entries, (min_score,)) :]
+            if cap:
+                entries = entries[-cap:]
+            if entries:
+                self._sets[key] = (entries, {member: score for score, member in entries})
+            else:
+                self._sets.pop(key, None)
+            self._sets[epoch_key] = ([(now, "epoch")], {"epoch": now})
+
+    async def claim(self, key, ttl_ms):
+        """See `RedisSortedSets.claim`."""
+        with self._lock:
+            if self._claims.get(key, 0) > time.monotonic():
+                return False
+            self._claims[key] = time.monotonic() + ttl_ms / 1000
+            return True
+
+    def _increment(self, key, members):
+        """Add amounts to the scores of members (the caller holds the lock)."""
+        entries, scores = self._sets.setdefault(key, ([], {}))
+        for member, amount in members.items():
+            member = str(member)
+            score = amount
+            if member in scores:
+                entries.pop(bisect.bisect_left(entries, (scores[member], member)))
+                score += scores[member]
+            bisect.insort(entries, (score, member))
+            scores[member] = score
+
+    def _epoch(self, epoch_key, now):
+        """Get the epoch of forward-decayed scores, starting it at `now` if missing (the caller holds the lock)."""
+        _, scores = self._sets.setdefault(epoch_key, ([(now, "epoch")], {"epoch": now}))
+        return scores["epoch"]
+
+    async def members(self, key):
+        """See `RedisSortedSets.members`."""
+        with self._lock:
+            entries, _ = self._sets.get(key, ([], {}))
+            return [member for _, member in entries]
+
+    async def remove(self, key, *members):
+        """See `RedisSortedSets.remove`."""
+        with self._lock:
+            entries, scores = self._sets.get(key, ([], {}))
+            for member in map(str, members):
+                if member in scores:
+                    entries.pop(bisect.bisect_left(entries, (scores.pop(member), member)))
+            if not entries:
+                self._sets.pop(key, None)
+
+    async def existing(self, keys):
+        """See `RedisSortedSets.existing`."""
+        with self._lock:
+            return [key for key in keys if key in self._sets]
+
+    async def delete(self, *keys):
+        """See `RedisSortedSets.delete`."""
+        with self._lock:
+            for key in keys:
+                self._sets.pop(key, None)
+
+
+redis_sorted_sets = RedisSortedSets()
+memory_sorted_sets = MemorySortedSets()
+
+
+def get_sorted_sets():
+    """
+    Get the sorted set store: Redis, or the in-process store in debug mode.
+
+    Returns:
+        RedisSortedSets | MemorySortedSets: The sorted set store.
+
+    Example usage:
+
+    ```python
+    await get_sorted_sets().add_many([f"timeline:{follower_id}"], {str(recipe_id): recipe_id}, cap=800)
+    ```
+
+    """
+    return memory_sorted_sets if settings.DEBUG else redis_sorted_sets
@@ -0,0 +1,96 @@
+import time
+import contextvars
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core import settings
+from src.helpers.dbstats.slowlog import slow_query_log
+
+
+class StatementStats:
+    """
+    StatementStats collects the SQL statements issued while serving a single request.
+
+    It counts the statements and the total time spent in the database, and groups identical statements (same SQL,
+    different parameters) so that N+1 patterns (the same statement repeated once per row) can be flagged.
+
+    Args:
+        route (str, optional): The route of the request.
+
+    Attributes:
+        route (str): The route of the request.
+        count (int): The number of statements issued.
+        duration (float): The total database time in seconds.
+        statements (Counter): The number of executions of each distinct SQL statement.
+
+    Example usage:
+
+    ```python
+    stats = StatementStats(route="/recipe/list")
+    token = current_stats.set(stats)
+    ...  # Run the request.
+    current_stats.reset(token)
+    print(stats.count, stats.repeated)
+    ```
+
+    """
+
+    def __init__(self, route=None):
+        self.route = route
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, duration):
+        """
+        Record one executed statement.
+
+        Args:
+            statement (str): The SQL statement.
+            duration (float): The execution time in seconds.
+        """
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    @property
+    def repeated(self):
+        """
+        Get the statements repeated at least `DB_STATS["N_PLUS_ONE_THRESHOLD"]` times (N+1 candidates).
+
+        Returns:
+            dict: The repeated statements mapped to their execution counts.
+        """
+        return {statement: count for statement, count in self.statements.items() if count >= settings.DB_STATS["N_PLUS_ONE_THRESHOLD"]}
+
+    def header(self):
+        """
+        Format the statistics as a response header value.
+
+        Returns:
+            str: e.g. "statements=12; time_ms=3.41; repeated=1".
+        """
+        return f"statements={self.count}; time_ms={self.duration * 1000:.2f}; repeated={len(self.repeated)}"
+
+
+# The statistics of the request being served (None outside of a request).
+current_stats = contextvars.ContextVar("statement_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    """Remember when the statement started."""
+    conn.info.setdefault("statement_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    """Record the statement in the statistics of the current request and in the slow query log."""
+    duration = time.perf_counter() - conn.info["statement_start_time"].pop()
+
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+
+    slow_query_log.observe(cursor, statement, parameters, duration, route=stats.route if stats is not None else None, executemany=executemany)
@@ -0,0 +1,70 @@
+from starlette.datastructures import MutableHeaders
+
+from src.core import settings
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+from src.helpers.metrics import metrics
+from src.helpers.dbstats import current_stats
+from src.helpers.dbstats import StatementStats
+
+
+# Metrics key of the requests that match no route (404s), so that arbitrary paths cannot grow the registry.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope):
+    """
+    Get the path template of the route that served a request.
+
+    Args:
+        scope (dict): The ASGI scope of the request (after routing).
+
+    Returns:
+        str: The path template, e.g. "/recipe/detail/{uuid}", or `UNMATCHED_ROUTE` if no route matched.
+    """
+    route = scope.get("route")
+    return route.path if route is not None else UNMATCHED_ROUTE
+
+
+class DBStatsMiddleware:
+    """
+    ASGI middleware that counts the SQL statements and database time of every request.
+
+    In debug mode the statistics are added to the response in the `DB_STATS["HEADER"]` header and repeated statements
+    (N+1 patterns) are logged as warnings. In every mode they are aggregated per route template in the metrics registry
+    (e.g. "/recipe/detail/{uuid}", not one entry per recipe), requests that match no route under `UNMATCHED_ROUTE`.
+
+    Example usage:
+
+    ```python
+    app.add_middleware(DBStatsMiddleware)
+    ```
+
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = StatementStats(route=scope["path"])
+        token = current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                MutableHeaders(scope=message).append(settings.DB_STATS["HEADER"], stats.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_stats.reset(token)
+            route = route_template(scope)
+            metrics.observe_request(route=route, stats=stats)
+
+            if settings.DEBUG and stats.repeated:
+                for statement, count in stats.repeated.items():
+                    logger.log(level=LogLevel.WARNING, message=f"N+1: {route} repeated {count} times: {' '.join(statement.split())}")
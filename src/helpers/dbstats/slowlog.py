@@ -0,0 +1,134 @@
+import json
+import logging
+import datetime
+from pathlib import Path
+
+from src.core import settings
+from src.helpers.metrics import metrics
+
+
+class SlowQueryLog:
+    """
+    SlowQueryLog records the statements that run longer than `SLOW_QUERY["THRESHOLD_MS"]`.
+
+    Each record holds the SQL statement, its bound parameters (redacted), the duration, the originating route and,
+    if `SLOW_QUERY["EXPLAIN"]` is enabled, the query plan of the statement. Records are written as JSON lines to the
+    dedicated `SLOW_QUERY["FILE"]` sink, not to the `log_entries` table.
+
+    Example usage:
+
+    ```python
+    slow_query_log.observe(cursor, statement, parameters, duration, route="/recipe/list", executemany=False)
+    ```
+
+    """
+
+    def __init__(self, threshold_ms, explain, file):
+        self.threshold = threshold_ms / 1000 if threshold_ms is not None else None
+        self.explain = explain
+        self.file = file
+        self._logger = None
+
+    @property
+    def logger(self):
+        """Property: Get the logger of the sink, creating the log file on first use."""
+        if self._logger is None:
+            Path(self.file).parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(self.file)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            self._logger = logging.getLogger("slow_queries")
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._logger.addHandler(handler)
+        return self._logger
+
+    @staticmethod
+    def redact(parameters):
+        """
+        Redact bound parameters, keeping only their types and sizes.
+
+        Args:
+            parameters: The bound parameters (dict, sequence or sequence of sequences for executemany).
+
+        Returns:
+            The redacted parameters, e.g. ["<str:12>", "<int>"].
+        """
+        if isinstance(parameters, dict):
+            return {key: SlowQueryLog.redact(value) for key, value in parameters.items()}
+        if isinstance(parameters, (list, tuple)):
+            return [SlowQueryLog.redact(value) for value in parameters]
+        if parameters is None:
+            return None
+        if isinstance(parameters, (str, bytes)):
+            return f"<{type(parameters).__name__}:{len(parameters)}>"
+        return f"<{type(parameters).__name__}>"
+
+    @staticmethod
+    def query_plan(cursor, statement, parameters):
+        """
+        Get the query plan of a SELECT statement on the connection that executed it.
+
+        The plan runs on a raw DBAPI cursor, so it is not itself counted or logged. Outside of SQLite it runs in a
+        savepoint rolled back afterwards: a failed statement aborts a PostgreSQL transaction, and the transaction is
+        the request's own.
+
+        Args:
+            cursor: The DBAPI cursor that executed the statement.
+            statement (str): The SQL statement.
+            parameters: The bound parameters.
+
+        Returns:
+            list | str | None: The plan rows, an error message, or None for statements that are not SELECTs.
+        """
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return None
+
+        sqlite = type(cursor).__module__.startswith("sqlite3")
+        plan_cursor = cursor.connection.cursor()
+        try:
+            if sqlite:
+                plan_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+                return [" ".join(str(column) for column in row) for row in plan_cursor.fetchall()]
+
+            plan_cursor.execute("SAVEPOINT query_plan")
+            try:
+                plan_cursor.execute("EXPLAIN " + statement, parameters)
+                return [" ".join(str(column) for column in row) for row in plan_cursor.fetchall()]
+            finally:
+                plan_cursor.execute("ROLLBACK TO SAVEPOINT query_plan")
+                plan_cursor.execute("RELEASE SAVEPOINT query_plan")
+        except Exception as error:  # noqa B902
+            return f"EXPLAIN failed: {error}"
+        finally:
+            plan_cursor.close()
+
+    def observe(self, cursor, statement, parameters, duration, route, executemany):
+        """
+        Record a statement if it is slower than the threshold.
+
+        Args:
+            cursor: The DBAPI cursor that executed the statement.
+            statement (str): The SQL statement.
+            parameters: The bound parameters.
+            duration (float): The execution time in seconds.
+            route (str | None): The route of the request that issued the statement.
+            executemany (bool): Whether the statement ran as executemany.
+        """
+        if self.threshold is None or duration < self.threshold:
+            return
+
+        metrics.increment("slow_queries")
+
+        record = {
+            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "route": route,
+            "duration_ms": round(duration * 1000, 3),
+            "statement": " ".join(statement.split()),
+            "parameters": self.redact(parameters),
+            "plan": self.query_plan(cursor, statement, parameters) if self.explain and not executemany else None,
+        }
+        self.logger.info(json.dumps(record))
+
+
+slow_query_log = SlowQueryLog(threshold_ms=settings.SLOW_QUERY["THRESHOLD_MS"], explain=settings.SLOW_QUERY["EXPLAIN"], file=settings.SLOW_QUERY["FILE"])
@@ -0,0 +1,126 @@
+"""
+Streaming exports of database records as NDJSON or CSV, optionally gzip-compressed.
+
+The records are encoded one by one and the encoded chunks are grouped into buffers, so an export holds at most one
+buffer (plus the rows of one `yield_per` batch of the query) in memory, whatever its size. The records are exported in
+ascending ID order, so an interrupted export is resumed after the last exported ID (the `id` column).
+
+Example usage:
+
+    chunks = export_chunks(rows, columns=["id", "title"], export_format=ExportFormatEnum.CSV, compress=True)
+"""
+
+import io
+import csv
+import json
+import zlib
+from enum import Enum
+
+# Size of the chunks written to the response (or file).
+CHUNK_SIZE = 64 * 1024
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {ExportFormatEnum.NDJSON: "application/x-ndjson", ExportFormatEnum.CSV: "text/csv"}
+
+
+def encode_records(records, columns, export_format, header=True):
+    """
+    Encode records one line at a time.
+
+    Args:
+        records (Iterable[dict]): The records.
+        columns (list[str]): The columns of the records (the keys of the NDJSON objects, the CSV header).
+        export_format (ExportFormatEnum): The output format.
+        header (bool): Whether to write the CSV header (False when resuming an export).
+
+    Yields:
+        bytes: The encoded lines.
+    """
+    if ExportFormatEnum(export_format) == ExportFormatEnum.NDJSON:
+        for record in records:
+            yield (json.dumps({column: record[column] for column in columns}, ensure_ascii=False) + "\n").encode()
+        return
+
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def encode(values):
+        line.seek(0)
+        line.truncate()
+        writer.writerow(values)
+        return line.getvalue().encode()
+
+    if header:
+        yield encode(columns)
+    for record in records:
+        # Lists (e.g. tags) are written as one comma-separated cell.
+        yield encode(",".join(value) if isinstance(value, list) else value for value in (record[column] for column in columns))
+
+
+def gzipped(chunks):
+    """
+    Compress chunks into one gzip stream, incrementally.
+
+    Args:
+        chunks (Iterable[bytes]): The uncompressed chunks.
+
+    Yields:
+        bytes: The compressed chunks.
+    """
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def buffered(chunks, size=CHUNK_SIZE):
+    """
+    Group small chunks into buffers of about `size` bytes.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks.
+        size (int): The minimum size of a buffer (except the last one).
+
+    Yields:
+        bytes: The buffers.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def export_chunks(records, columns, export_format, compress=False, header=True):
+    """
+    Encode records for a streaming response or file.
+
+    Args:
+        records (Iterable[dict]): The records.
+        columns (list[str]): The columns of the records.
+        export_format (ExportFormatEnum): The output format.
+        compress (bool): Whether to gzip the output.
+        header (bool): Whether to write the CSV header (False when resuming an export).
+
+    Returns:
+        Iterator[bytes]: The chunks of the export.
+
+    Example usage:
+
+    ```python
+    return StreamingResponse(export_chunks(rows, columns, ExportFormatEnum.NDJSON), media_type=MEDIA_TYPES[ExportFormatEnum.NDJSON])
+    ```
+
+    """
+    chunks = buffered(encode_records(records, columns, export_format, header=header))
+    return buffered(gzipped(chunks)) if compress else chunks
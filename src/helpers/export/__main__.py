@@ -0,0 +1,80 @@
+"""
+Command line interface of the bulk exports.
+
+The records are written in batches of `settings.EXPORT["CHECKPOINT_ROWS"]`; after every batch the output is flushed and
+the last exported ID is written to the checkpoint file. When the checkpoint file exists, the export resumes after its ID
+and appends to the output (a gzip output gets one gzip member per batch, which gzip readers concatenate). The
+checkpoint file is removed when the export completes.
+
+Commands:
+    recipes: Export all the recipes (with their author and tags).
+    users: Export all the users.
+
+Example usage:
+
+    python -m src.helpers.export recipes --format csv --gzip --output recipes.csv.gz
+"""
+
+import os
+import argparse
+import itertools
+
+from src.core import settings
+from src.core.database import local_session
+from src.helpers.export import ExportFormatEnum
+from src.helpers.export import export_chunks
+from src.resources.recipes import Recipe
+from src.resources.recipes import EXPORT_COLUMNS as RECIPE_EXPORT_COLUMNS
+from src.resources.users import User
+from src.resources.users import EXPORT_COLUMNS as USER_EXPORT_COLUMNS
+
+EXPORTS = {
+    "recipes": (Recipe.export, RECIPE_EXPORT_COLUMNS),
+    "users": (User.export, USER_EXPORT_COLUMNS),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.helpers.export", description="FoodRecipeHub bulk exports.")
+    parser.add_argument("command", choices=list(EXPORTS))
+    parser.add_argument("--format", choices=[export_format.value for export_format in ExportFormatEnum], default=ExportFormatEnum.NDJSON.value)
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("--output", help="output file (default: <command>.<format>[.gz])")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint)")
+    args = parser.parse_args()
+
+    export, columns = EXPORTS[args.command]
+    export_format = ExportFormatEnum(args.format)
+    output = args.output or f"{args.command}.{export_format.value}" + (".gz" if args.gzip else "")
+    checkpoint = args.checkpoint or f"{output}.checkpoint"
+
+    after = None
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as file:
+            after = int(file.read().strip())
+        print(f"resuming after id {after}")
+
+    exported = 0
+    with local_session() as session, open(output, "ab" if after is not None else "wb") as file:
+        records = export(after=after, session=session)
+        while True:
+            batch = list(itertools.islice(records, settings.EXPORT["CHECKPOINT_ROWS"]))
+            if not batch:
+                break
+
+            for chunk in export_chunks(batch, columns, export_format, compress=args.gzip, header=after is None and exported == 0):
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+
+            with open(checkpoint, "w") as checkpoint_file:
+                checkpoint_file.write(str(batch[-1]["id"]))
+            exported += len(batch)
+
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    print(f"exported {exported} {args.command} to {output}")
+
+
+if __name__ == "__main__":
+    main()
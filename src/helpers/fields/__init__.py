@@ -0,0 +1,35 @@
+from fastapi_babel.core import make_gettext as _
+
+
+def select_fields(fields, schema):
+    """
+    Normalize a sparse fieldset: a comma-separated list of fields of a query schema.
+
+    The fields are deduplicated and put in the order of the schema, so that equal fieldsets share their cache entries.
+
+    Args:
+        fields (str | None): The comma-separated field names.
+        schema (type[BaseModel]): The query schema whose fields may be selected.
+
+    Returns:
+        str | None: The normalized comma-separated field names (None if no field is given).
+
+    Raises:
+        ValueError: If a field is not a field of the schema.
+
+    Example usage:
+
+    ```python
+    select_fields("title, uuid,title", RecipeQuerySchema)  # "uuid,title"
+    ```
+
+    """
+    if fields is None:
+        return None
+
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - set(schema.model_fields)
+    if unknown:
+        raise ValueError(_("Unknown fields: {fields}").format(fields=", ".join(sorted(unknown))))
+
+    return ",".join(name for name in schema.model_fields if name in names) or None
@@ -1,17 +1,24 @@
+import time
+import hashlib
 from datetime import datetime
 from datetime import timedelta
 from fastapi import HTTPException
 from fastapi import status
 from jose import JWTError
+from jose import ExpiredSignatureError
 from jose import jwt
 from sqlalchemy.orm import Session
 
 from src.core.settings import SECRET_KEY
 from src.core.settings import JWT as JWTSettings  # noqa N811
+from src.helpers.cache.lru import TTLCache
 from src.helpers.jwt.models import AccessTokenModel
 from src.helpers.jwt.schemas import JWTTokenSchema
 from fastapi_babel import _
 
+# Claims of the verified access tokens, keyed by the digest of the token and kept until the token expires.
+verified_claims = TTLCache(maxsize=JWTSettings["CLAIMS_CACHE_SIZE"], ttl=JWTSettings["ACCESS_TOKEN_EXPIRE_MINUTES"] * 60)
+
 
 class JWT:
     """
@@ -21,7 +28,7 @@ class JWT:
 
     Methods:
         create_access_token(user_id, session): Create an access token and return it as a JWTTokenSchema.
-        is_token_expired(token): Check if a JWT token has expired.
+        verify_claims(token): Verify a JWT token and return its claims if valid.
         verify_token(token): Verify a JWT token and return the user_id if valid.
         update_token(user_id, refresh_token, session): Update a token using a refresh token and return a new access token.
         expire_token(user_id, session): Expire (delete) tokens associated with a user.
@@ -52,7 +59,8 @@ class JWT:
             JWTTokenSchema: The JWT access and refresh tokens.
 
         """
-        to_encode = {"sub": str(user_id)}
+        # The issue time (with sub-second precision) tells the tokens issued before a revocation apart.
+        to_encode = {"sub": str(user_id), "iat": time.time()}
 
         access_token_expire = datetime.utcnow() + timedelta(minutes=JWTSettings.get("ACCESS_TOKEN_EXPIRE_MINUTES"))
         to_encode.update({"exp": access_token_expire})
@@ -76,28 +84,38 @@ class JWT:
         )
 
     @classmethod
-    def is_token_expired(cls, token: str) -> bool:
+    def verify_claims(cls, token: str) -> dict:
         """
-        Check if a JWT token has expired.
+        Verify a JWT token (signature and expiration, in one decode) and return its claims if valid.
+
+        The claims of a verified token are cached until the token expires, so a token sent again is not decoded again.
 
         Args:
-            token (str): The JWT token to check.
+            token (str): The JWT token to verify.
 
         Returns:
-            bool: True if the token has expired, False otherwise.
+            dict: The claims of the token.
 
         Raises:
-            HTTPException: If there is an issue decoding or checking the token.
+            HTTPException: If the token is invalid or expired.
 
         """
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = verified_claims.get(digest)
+        if claims is not None:
+            if time.time() < claims["exp"]:
+                return claims
+            verified_claims.delete(digest)
+
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[JWTSettings.get("ALGORITHM")])
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[JWTSettings.get("ALGORITHM")])
+        except ExpiredSignatureError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_("Token Expired."))
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_("Invalid Credentials."))
 
-        current_time = datetime.utcnow()
-        expiration_time = datetime.fromtimestamp(payload.get("exp", 0))
-        return current_time > expiration_time
+        verified_claims.set(digest, claims, ttl=claims["exp"] - time.time())
+        return claims
 
     @classmethod
     def verify_token(cls, token: str) -> int | Exception:
@@ -114,16 +132,7 @@ class JWT:
             HTTPException: If there is an issue decoding, checking, or handling the token.
 
         """
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[JWTSettings.get("ALGORITHM")])
-        except JWTError:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_("Invalid Credentials."))
-        else:
-            if cls.is_token_expired(token):
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_("Token Expired."))
-
-            user_id = int(payload["sub"])
-            return user_id
+        return int(cls.verify_claims(token)["sub"])
 
     @classmethod
     def update_token(cls, user_id: int, refresh_token: str, session: Session) -> JWTTokenSchema:
@@ -1,4 +1,5 @@
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import DateTime
@@ -34,6 +35,10 @@ class AccessTokenModel(Basemodel):
     """
 
     __tablename__ = "access_tokens"
+    __table_args__ = (
+        Index("ix_access_tokens_user_id", "user_id"),
+        Index("ix_access_tokens_refresh_token", "refresh_token"),
+    )
 
     user_id = Column(Integer, ForeignKey("users.id"))
     refresh_token = Column(String)
@@ -7,9 +7,13 @@ from fastapi.exceptions import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.security.utils import get_authorization_scheme_param
 
+from src.core import settings
+from src.core.exceptions import CredentialException
 from src.helpers.jwt import JWT
+from src.helpers.jwt.revocation import is_revoked
 from src.core.database import get_db_session
 from src.resources.users.models import UserModel
+from src.resources.users.identity import get_identity
 from fastapi_babel import _
 
 
@@ -78,10 +82,14 @@ class OAuth2PasswordJWT(OAuth2PasswordBearer):
 oauth2_scheme = OAuth2PasswordJWT(scheme_name="JWT", token_url="/user/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db_session: Session = Depends(get_db_session)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db_session: Session = Depends(get_db_session)):
     """
     Get the current user based on the provided JWT token.
 
+    The token is verified once (its claims are then cached until it expires) and checked against the revocations of
+    its user; the user is read from the identity cache (see `src.resources.users.identity`), so most requests do not
+    decode the token nor query the user.
+
     Args:
         token (str): The JWT token obtained from the request.
         db_session (Session): The SQLAlchemy database session.
@@ -89,9 +97,36 @@ def get_current_user(token: str = Depends(oauth2_scheme), db_session: Session =
     Returns:
         UserModel: The user associated with the provided token.
 
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked.
+
     ```
 
     """
-    user_id = JWT.verify_token(token)
-    user = db_session.query(UserModel).filter_by(id=user_id).first()
+    claims = JWT.verify_claims(token)
+    if await is_revoked(claims):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=_("Token Revoked."))
+    user_id = int(claims["sub"])
+
+    # Keep the user's reads on the primary for a short while after their own writes (read-your-writes).
+    db_session.info["sticky_key"] = user_id
+
+    return await get_identity(user_id, db_session)
+
+
+def get_admin_user(user: UserModel = Depends(get_current_user)):
+    """
+    Get the current user and check that it is an administrator (listed in `settings.EXPORT["ADMIN_PHONE_NUMBERS"]`).
+
+    Args:
+        user (UserModel): The current user.
+
+    Returns:
+        UserModel: The current user.
+
+    Raises:
+        CredentialException: If the current user is not an administrator.
+    """
+    if user is None or user.phone_number not in settings.EXPORT["ADMIN_PHONE_NUMBERS"]:
+        raise CredentialException(message=_("Administrator access is required"), status_code=status.HTTP_403_FORBIDDEN)
     return user
@@ -0,0 +1,81 @@
+"""
+Revocation of the access tokens of a user.
+
+Revoking the tokens of a user (at logout) records the current time; an access token issued (`iat`) before it is
+refused. The time is stored in Redis (in-process in debug mode) for the lifetime of an access token, after which the
+revoked tokens have expired anyway, and every worker keeps it for `settings.JWT["REVOCATION_LOCAL_TTL_SECONDS"]`, so
+checking a token mostly costs a dictionary lookup. The worker handling the revocation applies it at once; the other
+workers within `REVOCATION_LOCAL_TTL_SECONDS`.
+
+Example usage:
+
+    await revoke_tokens(user.id)
+    if await is_revoked(claims):
+        ...
+"""
+
+import time
+
+from src.core import settings
+from src.helpers.cache import get_redis_pool
+from src.helpers.cache.lru import TTLCache
+
+# Revocation times of the users (debug mode, where Redis is optional).
+memory_revocations = {}
+
+local_revocations = TTLCache(maxsize=settings.JWT["CLAIMS_CACHE_SIZE"], ttl=settings.JWT["REVOCATION_LOCAL_TTL_SECONDS"])
+
+
+def _key(user_id):
+    return f"{settings.CACHE['PREFIX']}jwt_revoked:{user_id}"
+
+
+async def revoke_tokens(user_id):
+    """
+    Revoke the access tokens issued to a user until now.
+
+    Args:
+        user_id (int): The ID of the user.
+    """
+    revoked_at = time.time()
+    if settings.DEBUG:
+        memory_revocations[user_id] = revoked_at
+    else:
+        redis = await get_redis_pool()
+        await redis.setex(_key(user_id), settings.JWT["ACCESS_TOKEN_EXPIRE_MINUTES"] * 60, revoked_at)
+    local_revocations.set(user_id, revoked_at)
+
+
+async def revoked_at(user_id):
+    """
+    Get the time the access tokens of a user were last revoked.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        float: The revocation time (a Unix timestamp), or 0 if the tokens of the user were not revoked.
+    """
+    revoked = local_revocations.get(user_id)
+    if revoked is None:
+        if settings.DEBUG:
+            revoked = memory_revocations.get(user_id, 0)
+        else:
+            redis = await get_redis_pool()
+            revoked = float(await redis.get(_key(user_id)) or 0)
+        local_revocations.set(user_id, revoked)
+    return revoked
+
+
+async def is_revoked(claims):
+    """
+    Check whether a verified access token was revoked.
+
+    Args:
+        claims (dict): The verified claims of the token.
+
+    Returns:
+        bool: True if the token was issued before the last revocation of its user's tokens.
+    """
+    revoked = await revoked_at(int(claims["sub"]))
+    return bool(revoked) and claims.get("iat", 0) < revoked
@@ -1,3 +1,6 @@
+import copy
+import asyncio
+
 from src.core.database import local_session
 from src.helpers.logger.models import LogEntry
 
@@ -37,6 +40,9 @@ class Logger(metaclass=LoggerSingletonMeta):
         """
         Add a log entry to the database.
 
+        On the event loop the entry is written in the default executor, so that the handlers neither wait for the
+        database nor for the SQLite single-writer slot.
+
         Args:
             level (LogLevel): The log level (e.g., LogLevel.INFO).
             message (str): The log message.
@@ -49,11 +55,20 @@ class Logger(metaclass=LoggerSingletonMeta):
         ```
 
         """
-        entry = LogEntry(level=level, message=message)
-        session = self.Session()
-        session.add(entry)
-        session.commit()
-        session.refresh(entry)
+        # The caller may change the message once this returns (e.g. the response pops its fields).
+        entry = LogEntry(level=level, message=copy.copy(message))
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save(entry)
+        else:
+            loop.run_in_executor(None, self._save, entry)
+
+    def _save(self, entry):
+        with self.Session() as session:
+            session.add(entry)
+            session.commit()
 
 
 logger = Logger()
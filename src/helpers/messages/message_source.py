@@ -46,6 +46,9 @@ messages_dict = {
     "failed_delete_recipe": {
         "sync": _("recipe '{uuid}' was not successfully deleted by {user}"),
     },
+    "import_recipes": {
+        "sync": _("{created} recipes imported by {user}, {failed} rows failed"),
+    },
     ############################## relation API ##############################
     "follow_user": {
         "sync": _("user '{user}' follows '{following}' successfully"),
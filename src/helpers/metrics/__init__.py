@@ -0,0 +1,83 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """
+    Metrics is an in-process registry of application metrics.
+
+    It aggregates per-route request statistics (request count, SQL statements, database time and N+1 detections)
+    and named counters (`cache_hits` and `cache_misses` of the Redis cache, `slow_queries` over the slow query
+    threshold). The registry is exposed by the `/metrics` endpoint.
+
+    Example usage:
+
+    ```python
+    metrics.observe_request(route="/recipe/list", stats=stats)
+    metrics.increment("cache_hits")
+    snapshot = metrics.snapshot()
+    ```
+
+    Methods:
+        observe_request(route, stats): Add the statement statistics of a served request.
+        increment(name, value): Increment a named counter.
+        snapshot(): Get a copy of all metrics.
+
+    """
+
+    # Number of repeated statements kept per route.
+    max_repeated_statements = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = defaultdict(lambda: {"requests": 0, "statements": 0, "max_statements": 0, "db_time_ms": 0.0, "n_plus_one_requests": 0, "repeated_statements": {}})
+        self._counters = defaultdict(int)
+
+    def observe_request(self, route, stats):
+        """
+        Add the statement statistics of a served request.
+
+        Args:
+            route (str): The request route.
+            stats (StatementStats): The statement statistics of the request.
+        """
+        repeated = stats.repeated
+
+        with self._lock:
+            route_metrics = self._routes[route]
+            route_metrics["requests"] += 1
+            route_metrics["statements"] += stats.count
+            route_metrics["max_statements"] = max(route_metrics["max_statements"], stats.count)
+            route_metrics["db_time_ms"] += stats.duration * 1000
+
+            if repeated:
+                route_metrics["n_plus_one_requests"] += 1
+                for statement, count in repeated.items():
+                    statement = " ".join(statement.split())
+                    if statement in route_metrics["repeated_statements"] or len(route_metrics["repeated_statements"]) < self.max_repeated_statements:
+                        route_metrics["repeated_statements"][statement] = max(count, route_metrics["repeated_statements"].get(statement, 0))
+
+    def increment(self, name, value=1):
+        """
+        Increment a named counter.
+
+        Args:
+            name (str): The counter name.
+            value (int): The increment (default 1).
+        """
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self):
+        """
+        Get a copy of all metrics.
+
+        Returns:
+            dict: The per-route metrics and the named counters.
+        """
+        with self._lock:
+            routes = {route: {**values, "repeated_statements": dict(values["repeated_statements"])} for route, values in self._routes.items()}
+            return {"routes": routes, "counters": dict(self._counters)}
+
+
+metrics = Metrics()
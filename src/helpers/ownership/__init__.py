@@ -0,0 +1,45 @@
+from sqlalchemy import and_
+from sqlalchemy import select
+
+
+def owned(model, user_id, **identity):
+    """
+    Build the condition matching a row identified by its columns and owned by a user.
+
+    Fused into the WHERE clause of an UPDATE or DELETE, the condition makes the statement check the ownership itself:
+    a row of another user (or a missing one) matches no row, so the affected row count tells whether the user owns it.
+
+    Args:
+        model (type[Base]): The model of the row; it must have a `user_id` column.
+        user_id (int): The ID of the owner.
+        **identity: The values of the identifying columns (e.g. `uuid=...`), preferably a unique index.
+
+    Returns:
+        ColumnElement: The condition.
+
+    Example usage:
+
+    ```python
+    if not session.query(RecipeModel).filter(owned(RecipeModel, user.id, uuid=recipe_uuid)).delete():
+        raise BadRequestException(message=_("The requested recipe does not belong to the authenticated user"))
+    ```
+
+    """
+    return and_(model.user_id == user_id, *(getattr(model, column) == value for column, value in identity.items()))
+
+
+def owned_id(model, user_id, **identity):
+    """
+    Build the scalar subquery of the ID of a row owned by a user (NULL if the user does not own it).
+
+    Used by the statements on the rows depending on an owned row, so they only touch the rows of the owner.
+
+    Args:
+        model (type[Base]): The model of the row; it must have `id` and `user_id` columns.
+        user_id (int): The ID of the owner.
+        **identity: The values of the identifying columns.
+
+    Returns:
+        ScalarSelect: The subquery.
+    """
+    return select(model.id).where(owned(model, user_id, **identity)).scalar_subquery()
@@ -0,0 +1,151 @@
+import json
+import base64
+import datetime
+from sqlalchemy import tuple_
+
+from src.core import settings
+from src.core.exceptions import BadRequestException
+from fastapi_babel.core import make_gettext as _
+
+
+def encode_cursor(created_at, item_id):
+    """
+    Encode the position of the last item of a page as an opaque cursor.
+
+    Args:
+        created_at (datetime | str): The creation timestamp of the last item.
+        item_id (int): The ID of the last item.
+
+    Returns:
+        str: The URL-safe cursor.
+
+    Example usage:
+
+    ```python
+    cursor = encode_cursor(recipe.created_at, recipe.id)
+    ```
+
+    """
+    if isinstance(created_at, datetime.datetime):
+        created_at = created_at.isoformat()
+
+    return base64.urlsafe_b64encode(json.dumps([created_at, item_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        tuple: The creation timestamp (datetime) and the ID of the last item of the previous page.
+
+    Raises:
+        BadRequestException: If the cursor is malformed.
+    """
+    try:
+        created_at, cursor_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.datetime.fromisoformat(created_at), int(cursor_id)
+    except (TypeError, ValueError):  # binascii.Error, UnicodeDecodeError and JSONDecodeError are ValueErrors.
+        raise BadRequestException(message=_("The requested pagination cursor is invalid"))
+
+
+def paginate(query, page, created_at, item_id):
+    """
+    Fetch one page of a query ordered by its newest items first.
+
+    The query is ordered by (created_at, id) descending, so that pages are stable. Without a cursor (`page.cursor` is
+    None) the page is selected by `page.page_number` (offset pagination), and an existing order of the query (e.g. the
+    search relevance) comes first. With a cursor (keyset pagination) the page starts right after the item encoded in
+    the cursor, so it is served by a range scan of the (created_at, id) index and a deep page costs the same as the
+    first one; an empty cursor requests the first page.
+
+    Args:
+        query (Query): The SQLAlchemy query of the items.
+        page (Page): Pagination information.
+        created_at (ColumnElement): The creation timestamp column of the items.
+        item_id (ColumnElement): The ID column of the items.
+
+    Returns:
+        tuple: The items of the page and the cursor of the next page (None on the last page or in offset mode).
+
+    Example usage:
+
+    ```python
+    recipes, next_cursor = paginate(session.query(RecipeModel), page, RecipeModel.created_at, RecipeModel.id)
+    ```
+
+    """
+    query = query.add_columns(created_at, item_id)
+
+    if page.cursor is None:
+        query = query.order_by(created_at.desc(), item_id.desc())
+        rows = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
+        return [row[0] for row in rows], None
+
+    query = query.order_by(None).order_by(created_at.desc(), item_id.desc())
+    if page.cursor:
+        query = query.filter(tuple_(created_at, item_id) < tuple_(*decode_cursor(page.cursor)))
+
+    rows = query.limit(page.page_size + 1).all()
+    next_cursor = encode_cursor(*rows[page.page_size - 1][-2:]) if len(rows) > page.page_size else None
+
+    return [row[0] for row in rows[: page.page_size]], next_cursor
+
+
+def estimate_count(query):
+    """
+    Estimate the number of rows of a query from the PostgreSQL planner statistics.
+
+    The estimate comes from `EXPLAIN (FORMAT JSON)`, so no row is read. It is as accurate as the table statistics
+    (kept up to date by autovacuum / ANALYZE).
+
+    Args:
+        query (Query): The SQLAlchemy query.
+
+    Returns:
+        int | None: The estimated number of rows, or None if the database is not PostgreSQL.
+    """
+    statement = query.order_by(None).statement
+    connection = query.session.connection(bind_arguments={"clause": statement})
+
+    if connection.dialect.name != "postgresql":
+        return None
+
+    compiled = statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_items(query):
+    """
+    Count the items of a list query.
+
+    With `settings.PAGINATION["ESTIMATED_COUNT"]` enabled on PostgreSQL, large lists (estimates of at least
+    `settings.PAGINATION["ESTIMATED_COUNT_MIN"]` rows) are counted with the planner estimate instead of `COUNT(*)`, so
+    the count does not cost a full scan of the matching rows. Small lists are always counted exactly.
+
+    Args:
+        query (Query): The SQLAlchemy query of the items.
+
+    Returns:
+        int: The (possibly estimated) number of items.
+
+    Example usage:
+
+    ```python
+    total_items = count_items(session.query(RecipeModel))
+    ```
+
+    """
+    if settings.PAGINATION["ESTIMATED_COUNT"]:
+        estimate = estimate_count(query)
+        if estimate is not None and estimate >= settings.PAGINATION["ESTIMATED_COUNT_MIN"]:
+            return estimate
+
+    return query.order_by(None).count()
@@ -0,0 +1,113 @@
+"""
+Password hashing and verification in a process pool.
+
+Hashing a password costs tens of milliseconds of CPU on purpose; run on the event loop, it blocks every other request
+of the worker meanwhile, and threads would still hold the GIL. The hashes are computed by a pool of
+`settings.PASSWORD_HASHING["WORKERS"]` processes (started on first use), so concurrent logins use several cores and the
+event loop stays free.
+
+The cost parameters come from `settings.PASSWORD_HASHING`: when they are raised (or the scheme changes), a hash made
+with the former parameters is recomputed at the next successful login.
+
+Example usage:
+
+    user.password = Password(await hash_password("Passw0rd!"))
+    valid, new_hash = await verify_password("Passw0rd!", user.password.hash)
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+from src.core import settings
+
+
+def context_options():
+    """
+    Get the passlib options of the password hashes.
+
+    Returns:
+        dict: The `CryptContext` (and `PasswordType`) keyword arguments.
+    """
+    scheme, rounds = settings.PASSWORD_HASHING["SCHEMES"][0], settings.PASSWORD_HASHING["ROUNDS"]
+    return {
+        "schemes": settings.PASSWORD_HASHING["SCHEMES"],
+        "deprecated": "auto",
+        f"{scheme}__default_rounds": rounds,
+        f"{scheme}__min_rounds": rounds,
+    }
+
+
+password_context = CryptContext(**context_options())
+
+_executor = None
+
+
+def get_executor():
+    """
+    Get the process pool of the password hashes (created on first use).
+
+    The processes are spawned rather than forked, so they do not inherit the threads and connections of the application.
+
+    Returns:
+        ProcessPoolExecutor | None: The pool, or None if `settings.PASSWORD_HASHING["WORKERS"]` is 0.
+    """
+    global _executor
+    if _executor is None and settings.PASSWORD_HASHING["WORKERS"]:
+        _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASHING["WORKERS"], mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_pool():
+    """Stop the process pool of the password hashes (it is recreated on next use)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _hash(secret):
+    return password_context.hash(secret)
+
+
+def _verify(secret, password_hash):
+    return password_context.verify_and_update(secret, password_hash)
+
+
+async def _run(function, *args):
+    executor = get_executor()
+    if executor is None:
+        return function(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+
+async def hash_password(secret):
+    """
+    Hash a password in the process pool.
+
+    Args:
+        secret (str): The password.
+
+    Returns:
+        str: The hash, to be stored as `Password(hash)`.
+    """
+    return await _run(_hash, secret)
+
+
+async def verify_password(secret, password_hash):
+    """
+    Verify a password against its stored hash in the process pool.
+
+    Args:
+        secret (str): The password.
+        password_hash (bytes | str): The stored hash.
+
+    Returns:
+        tuple: Whether the password is valid, and its new hash if the stored one was made with outdated parameters
+            (else None).
+    """
+    if password_hash is None:
+        return False, None
+    return await _run(_verify, secret, password_hash)
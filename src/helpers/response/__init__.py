@@ -4,6 +4,7 @@ from colorama import Fore, Style
 from src.helpers.response.schemas import ResponseQuery
 from src.helpers.response.schemas import ResponseSchema
 from src.helpers.response.schemas import ResponseListQuery
+from src.helpers.response.schemas import ResponseCursorQuery
 from src.helpers.response.schemas import ResponseWithTokenSchema
 from src.helpers.logger.models import LogLevel
 from src.helpers.logger import logger
@@ -66,7 +67,7 @@ class Response:
         Get the constructed response as a specific response schema.
 
         Returns:
-            ResponseQuery or ResponseSchema or ResponseListQuery or ResponseWithTokenSchema:
+            ResponseQuery or ResponseSchema or ResponseListQuery or ResponseCursorQuery or ResponseWithTokenSchema:
                 The constructed response as an instance of a specific response schema.
 
         Example usage:
@@ -95,12 +96,22 @@ class Response:
 
         if self.query_message:
             message = response.pop("message")
-            if "page_count" not in message.keys():
+            if "page_count" not in message.keys() and "next_cursor" in message.keys():
+                return ResponseCursorQuery(
+                    data=message["data"],
+                    next_cursor=message["next_cursor"],
+                )
+            elif "page_count" not in message.keys():
                 return ResponseQuery(
                     data=message["data"],
                 )
             else:
-                return ResponseListQuery(data=message["data"], page_count=message["page_count"], count=message["count"])
+                return ResponseListQuery(
+                    data=message["data"],
+                    page_count=message["page_count"],
+                    count=message["count"],
+                    next_cursor=message.get("next_cursor"),
+                )
 
         elif "access_token" in response.keys():
             return ResponseWithTokenSchema(
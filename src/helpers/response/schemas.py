@@ -18,12 +18,23 @@ class ResponseWithTokenSchema(BaseModel):
 class Page(BaseModel):
     page_size: int = Field(10, description="The number of items per page in a paged response.")
     page_number: int = Field(1, description="The current page number in a paged response.")
+    cursor: str | None = Field(
+        None,
+        description="The cursor of the requested page (keyset pagination, page_number is ignored). Send an empty cursor for the first page "
+        "and the next_cursor of the previous response for the following ones.",
+    )
 
 
 class ResponseListQuery(BaseModel):
     data: Any = Field(description="The data included in the response.")
     page_count: int = Field(description="The total number of pages in a paged response.")
     count: int = Field(description="The total count of items in a paged response.")
+    next_cursor: str | None = Field(None, description="The cursor of the next page, if a cursor was requested and there are more items.")
+
+
+class ResponseCursorQuery(BaseModel):
+    data: Any = Field(description="The data included in the response.")
+    next_cursor: str | None = Field(None, description="The cursor of the next page, if there are more items.")
 
 
 class ResponseQuery(BaseModel):
@@ -0,0 +1,147 @@
+import re
+import threading
+from collections import defaultdict
+
+
+def trigrams(text):
+    """
+    Get the trigrams of a text the way PostgreSQL's pg_trgm does.
+
+    The text is lower-cased and split into words of letters and digits; each word is padded with two spaces in front
+    and one at the end before it is cut into trigrams.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        set: The trigrams of the text.
+    """
+    grams = set()
+    for word in re.findall(r"[^\W_]+", (text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(left, right):
+    """
+    Get the trigram similarity of two texts, compatible with pg_trgm's `similarity()`.
+
+    Args:
+        left (str): The first text.
+        right (str): The second text.
+
+    Returns:
+        float: The similarity between 0 (no shared trigram) and 1 (same trigrams).
+
+    Example usage:
+
+    ```python
+    trigram_similarity("+989121234567", "1234")  # 0.125
+    ```
+
+    """
+    left_grams, right_grams = trigrams(left), trigrams(right)
+    if not left_grams or not right_grams:
+        return 0.0
+    return len(left_grams & right_grams) / len(left_grams | right_grams)
+
+
+class NGramIndex:
+    """
+    In-process n-gram index for substring lookups.
+
+    Every indexed text is cut into its (lower-cased) n-grams and each n-gram keeps the set of keys whose texts contain
+    it. A substring query is answered by intersecting the key sets of its n-grams, starting with the rarest one, so
+    the lookup cost depends on the number of candidates instead of the number of indexed texts. The candidates are a
+    superset of the matches and must be verified (e.g. with `ILIKE` in the database).
+
+    Args:
+        gram_size (int): The length of the n-grams (default is 3).
+
+    Example usage:
+
+    ```python
+    index = NGramIndex()
+    index.add(1, ["+989121234567", "john@example.com"])
+    index.candidates("1234")  # {1}
+    ```
+
+    """
+
+    def __init__(self, gram_size=3):
+        self.gram_size = gram_size
+        self._postings = defaultdict(set)
+        self._grams = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._grams)
+
+    def grams(self, text):
+        """
+        Get the n-grams of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            set: The n-grams of the lower-cased text.
+        """
+        text = (text or "").lower()
+        return {text[i : i + self.gram_size] for i in range(len(text) - self.gram_size + 1)}
+
+    def add(self, key, texts):
+        """
+        Index (or re-index) the texts of a key.
+
+        Args:
+            key (Hashable): The key, e.g. the ID of a row.
+            texts (Iterable[str]): The texts of the key.
+        """
+        grams = set().union(*(self.grams(text) for text in texts))
+        with self._lock:
+            self._remove(key)
+            self._grams[key] = grams
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def remove(self, key):
+        """
+        Remove a key from the index (no-op if it is not indexed).
+
+        Args:
+            key (Hashable): The key.
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """Remove every key from the index."""
+        with self._lock:
+            self._postings.clear()
+            self._grams.clear()
+
+    def candidates(self, query):
+        """
+        Get the keys whose texts may contain a substring.
+
+        Args:
+            query (str): The substring.
+
+        Returns:
+            set | None: The candidate keys, or None if the substring is shorter than n (every key is a candidate).
+        """
+        grams = self.grams(query)
+        if not grams:
+            return None
+
+        with self._lock:
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            return set(postings[0]).intersection(*postings[1:])
+
+    def _remove(self, key):
+        for gram in self._grams.pop(key, ()):
+            self._postings[gram].discard(key)
+            if not self._postings[gram]:
+                del self._postings[gram]
@@ -0,0 +1,35 @@
+"""
+Keys and invalidation of the per-user home feed timelines (see `src.resources.recipes.feed`).
+
+The timelines are sorted sets (Redis, in-process in debug mode). This module only depends on the sorted set store, so
+both the feed and the modules that change what a feed contains (e.g. the relations) can import it.
+
+Example usage:
+
+    await drop_timeline(user.id)
+"""
+
+from src.helpers.cache.sorted_sets import get_sorted_sets
+
+
+def timeline_key(user_id):
+    """
+    Get the key of the timeline of a user.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        str: The key of the timeline.
+    """
+    return f"feed:timeline:{user_id}"
+
+
+async def drop_timeline(user_id):
+    """
+    Drop the timeline of a user (e.g. after a follow or an unfollow); it is rebuilt on its next read.
+
+    Args:
+        user_id (int): The ID of the user.
+    """
+    await get_sorted_sets().delete(timeline_key(user_id))
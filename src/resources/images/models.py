@@ -3,9 +3,11 @@ import uuid
 import base64
 import datetime
 from io import BytesIO
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image as PilImage
 from src.helpers.s3images import S3Images
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Unicode
@@ -38,6 +40,7 @@ class ImageModel(Basemodel):
     """
 
     __tablename__ = "images"
+    __table_args__ = (Index("ix_images_object_type_object_id", "object_type", "object_id"),)
 
     object_type = Column(Unicode(255))
     object_id = Column(Integer)
@@ -122,7 +125,7 @@ class ImageModel(Basemodel):
                 await S3Images(**settings.S3_CONFIGS).delete_s3(self.filename)
 
         session.delete(self)
-        session.commit()
+        await run_in_threadpool(session.commit)
 
         return True
 
@@ -145,6 +148,6 @@ class ImageModel(Basemodel):
             await S3Images(**settings.S3_CONFIGS).to_s3(image, self.filename)
 
         session.add(self)
-        session.commit()
+        await run_in_threadpool(session.commit)
 
         return True
@@ -1,15 +1,56 @@
+import uuid
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy import exists
+from sqlalchemy import false
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core import settings
+from src.helpers.cache import get_many
 from src.helpers.cache.decorators import cache
 from src.helpers.cache.decorators import expire_cache
 
 from src.core.exceptions import BadRequestException
+from src.helpers.bulk import batched
+from src.helpers.ownership import owned
+from src.helpers.ownership import owned_id
+from src.helpers.pagination import paginate
+from src.helpers.pagination import count_items
+from src.resources.recipes import trending
+from src.resources.recipes.feed import fan_out
+from src.resources.recipes.feed import feed_recipe_ids
+from src.resources.recipes.stats import view_counter
 from src.resources.recipes.models import TagModel
 from src.resources.recipes.models import RecipeModel
+from src.resources.recipes.models import RecipeStatsModel
+from src.resources.recipes.models import RecipeContentModel
+from src.resources.recipes.models import recipe_tag_association
+from src.resources.recipes.enums import TAGEnum
+from src.resources.recipes.enums import TagMatchEnum
+from src.resources.recipes.schemas import RecipeSchema
 from src.resources.recipes.schemas import TagQuerySchema
 from src.resources.recipes.schemas import RecipeQuerySchema
 from src.resources.recipes.schemas import RecipeQuerySchemaSimple
+from src.resources.users.models import UserModel
 from src.resources.users.schemas import UserQuerySchemaSimple
 from fastapi_babel.core import make_gettext as _
 
+# Fields of the recipes of a list when no fieldset is requested (the content is left out).
+LIST_FIELDS = ",".join(RecipeQuerySchemaSimple.model_fields)
+
+# Fields of a recipe detail when no fieldset is requested.
+DETAIL_FIELDS = ",".join(RecipeQuerySchema.model_fields)
+
+# Columns of the exported recipes.
+EXPORT_COLUMNS = ["id", "uuid", "title", "content", "is_active", "created_at", "author_phone_number", "author_email", "tags"]
+
 
 class Recipe:
     """
@@ -17,10 +58,15 @@ class Recipe:
 
     Class Methods:
     - create(user, recipe_data, db_session): Create a new recipe.
+    - bulk_create(user, records, db_session): Create recipes in batches.
     - update(user, data, db_session): Update a recipe.
     - delete(user, recipe_uuid, db_session): Delete a recipe.
-    - show_all(search, filter, page, db_session): Retrieve a list of recipes based on search and filter criteria.
-    - show_detail(recipe_uuid, db_session): Retrieve details of a specific recipe.
+    - show_all(search, filter, page, fields, db_session): Retrieve a list of recipes based on search and filter criteria.
+    - show_detail(recipe_uuid, fields, db_session): Retrieve details of a specific recipe.
+    - show_details(recipe_uuids, db_session): Retrieve details of several recipes at once.
+    - feed(user, page, db_session): Retrieve the newest recipes of the users followed by a user.
+    - show_trending(count, db_session): Retrieve the trending recipes.
+    - export(after, session): Iterate over all the recipes, for a streaming export.
     """
 
     async def create(self, user, recipe_data, db_session):
@@ -38,7 +84,7 @@ class Recipe:
         return await self._create(user=user, recipe_data=recipe_data, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["recipe_list", "recipe_detail", "user_list", "user_detail"])
+    @expire_cache(cache_keys=["recipe_list", "recipe_count", "recipe_detail", "user_list", "user_detail"])
     async def _create(user, recipe_data, session):
         """
         Internal method to create a recipe.
@@ -55,15 +101,100 @@ class Recipe:
             title=recipe_data.title,
             content=recipe_data.content,
             is_active=recipe_data.is_active,
-            tags=[TagModel(title=tag) for tag in recipe_data.tags],
             user_id=user.id,
         )
 
-        session.add(recipe)
-        session.commit()
+        def write():
+            session.add(recipe)
+            session.flush()
+            Recipe._set_tags(recipe_id=recipe.id, tags=recipe_data.tags, session=session)
+            session.commit()
+
+        await run_in_threadpool(write)
+        await fan_out(session, author_id=user.id, recipe_ids=[recipe.id])
+        await trending.record(recipe.uuid, "create")
 
         return recipe
 
+    async def bulk_create(self, user, records, db_session):
+        """
+        Create recipes in batches.
+
+        The records are validated with `RecipeSchema` and saved in batches of `settings.RECIPE_IMPORT["BATCH_SIZE"]`
+        rows: every batch is one transaction of multi-row inserts (recipes, then tag links) followed by one cache
+        invalidation. Invalid rows are skipped and reported; a batch the database rejects is reported row by row.
+
+        Args:
+            user (UserModel): The user creating the recipes.
+            records (AsyncIterable): The (row number, record, error) triples of the rows, see `src.helpers.bulk.read_records`.
+            db_session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: The number of created recipes and the errors of the rejected rows.
+        """
+        created, errors = 0, []
+
+        async for batch in batched(records, settings.RECIPE_IMPORT["BATCH_SIZE"]):
+            rows, recipes = [], []
+            for row, record, error in batch:
+                if error is None and not isinstance(record, dict):
+                    error = _("Row must be a JSON object")
+
+                if error is None:
+                    try:
+                        recipes.append(RecipeSchema(**record))
+                        rows.append(row)
+                        continue
+                    except ValidationError as e:
+                        error = "; ".join(detail["msg"] for detail in e.errors())
+
+                errors.append({"row": row, "error": error})
+
+            if not recipes:
+                continue
+
+            try:
+                await self._bulk_create(user=user, recipes=recipes, session=db_session)
+                created += len(recipes)
+            except SQLAlchemyError:
+                db_session.rollback()
+                errors.extend({"row": row, "error": _("The row could not be saved")} for row in rows)
+
+        return {"created": created, "errors": sorted(errors, key=lambda error: error["row"])}
+
+    @staticmethod
+    @expire_cache(cache_keys=["recipe_list", "recipe_count", "recipe_detail", "user_list", "user_detail"])
+    async def _bulk_create(user, recipes, session):
+        """
+        Internal method to save a batch of validated recipes in one transaction.
+
+        Args:
+            user (UserModel): The user creating the recipes.
+            recipes (list[RecipeSchema]): The validated recipes.
+            session (Session): SQLAlchemy session.
+        """
+        # The UUIDs are set here to map the inserted rows back to their IDs (executemany does not return them).
+        values = [{"uuid": str(uuid.uuid4()), "user_id": user.id, "title": recipe.title, "is_active": recipe.is_active} for recipe in recipes]
+
+        def write():
+            session.execute(RecipeModel.__table__.insert(), values)
+
+            recipe_ids = dict(session.query(RecipeModel.uuid, RecipeModel.id).filter(RecipeModel.uuid.in_([value["uuid"] for value in values])))
+            content_rows = [{"recipe_id": recipe_ids[value["uuid"]], "content": recipe.content} for value, recipe in zip(values, recipes)]
+            session.execute(RecipeContentModel.__table__.insert(), content_rows)
+
+            tag_ids = Tag.ids(session=session, create=True)
+            links = [{"recipe_id": recipe_ids[value["uuid"]], "tag_id": tag_ids[tag]} for value, recipe in zip(values, recipes) for tag in dict.fromkeys(recipe.tags)]
+            if links:
+                session.execute(recipe_tag_association.insert(), links)
+
+            session.commit()
+            return recipe_ids
+
+        recipe_ids = await run_in_threadpool(write)
+        await fan_out(session, author_id=user.id, recipe_ids=list(recipe_ids.values()))
+        await trending.record(list(recipe_ids), "create")
+
     async def update(self, user, data, db_session):
         """
         Update a recipe.
@@ -79,16 +210,12 @@ class Recipe:
         Raises:
             BadRequestException: If the requested recipe does not belong to the authenticated user.
         """
-        user_recipes = user.recipes
-        if data.uuid not in [recipe.uuid for recipe in user_recipes]:
-            raise BadRequestException(message=_("The requested recipe does not belong to the authenticated user"))
-
         trim_data = {key: value for key, value in data.model_dump().items() if value is not None and value != ""}
 
         return await self._update(user=user, data=trim_data, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["recipe_list", "recipe_detail", "user_list", "user_detail"])
+    @expire_cache(cache_keys=["recipe_list", "recipe_count", "recipe_detail", "user_list", "user_detail"])
     async def _update(user, data, session) -> bool:
         """
         Internal method to update a recipe.
@@ -100,18 +227,32 @@ class Recipe:
 
         Returns:
             bool: True if the recipe was successfully updated.
+
+        Raises:
+            BadRequestException: If the requested recipe does not belong to the user.
         """
         data_tags = data.pop("tags", None)
-        instance_query = session.query(RecipeModel).filter(RecipeModel.uuid == data.get("uuid"))
-        instance_query.update(values=data)
+        data_content = data.pop("content", None)
+
+        def write():
+            # The ownership check is part of the UPDATE: a recipe of another user (or a missing one) updates no row.
+            if not session.query(RecipeModel).filter(owned(RecipeModel, user.id, uuid=data.get("uuid"))).update(values=data):
+                session.rollback()
+                raise BadRequestException(message=_("The requested recipe does not belong to the authenticated user"))
+
+            # The content and tag statements select the recipe ID themselves (no separate lookup).
+            recipe_id = owned_id(RecipeModel, user.id, uuid=data.get("uuid"))
+            if data_content is not None:
+                session.query(RecipeContentModel).filter(RecipeContentModel.recipe_id == recipe_id).update({"content": data_content}, synchronize_session=False)
 
-        if data_tags is not None:
-            recipe = instance_query.first()
-            recipe.tags = [TagModel(title=tag) for tag in data_tags]
+            if data_tags is not None:
+                Recipe._set_tags(recipe_id=recipe_id, tags=data_tags, session=session)
 
-        session.commit()
+            session.commit()
 
-        return instance_query
+        await run_in_threadpool(write)
+
+        return True
 
     async def delete(self, user, recipe_uuid, db_session):
         """
@@ -128,14 +269,10 @@ class Recipe:
         Raises:
             BadRequestException: If the requested recipe does not belong to the authenticated user.
         """
-        user_recipes = user.recipes
-        if recipe_uuid not in [recipe.uuid for recipe in user_recipes]:
-            raise BadRequestException(message=_("The requested recipe does not belong to the authenticated user"))
-
         return await self._delete(user=user, uuid=recipe_uuid, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["recipe_list", "recipe_detail", "user_list", "user_detail"])
+    @expire_cache(cache_keys=["recipe_list", "recipe_count", "recipe_detail", "user_list", "user_detail"])
     async def _delete(user, uuid, session) -> bool:
         """
         Internal method to delete a recipe.
@@ -147,13 +284,53 @@ class Recipe:
 
         Returns:
             bool: True if the recipe was successfully deleted.
+
+        Raises:
+            BadRequestException: If the requested recipe does not belong to the user.
         """
-        session.query(RecipeModel).filter(RecipeModel.uuid == uuid).delete()
-        session.commit()
+
+        def write():
+            # Every statement only matches the rows of a recipe of the user; the recipe DELETE tells whether there was one.
+            recipe_id = owned_id(RecipeModel, user.id, uuid=uuid)
+            session.execute(recipe_tag_association.delete().where(recipe_tag_association.c.recipe_id == recipe_id))
+            session.query(RecipeStatsModel).filter(RecipeStatsModel.recipe_id == recipe_id).delete(synchronize_session=False)
+            session.query(RecipeContentModel).filter(RecipeContentModel.recipe_id == recipe_id).delete(synchronize_session=False)
+            if not session.query(RecipeModel).filter(owned(RecipeModel, user.id, uuid=uuid)).delete():
+                session.rollback()
+                raise BadRequestException(message=_("The requested recipe does not belong to the authenticated user"))
+            session.commit()
+
+        await run_in_threadpool(write)
+        await trending.forget(uuid)
 
         return True
 
-    async def show_all(self, search, filter, page, db_session):
+    @staticmethod
+    def _set_tags(recipe_id, tags, session):
+        """
+        Internal method to link a recipe to the canonical rows of its tags.
+
+        Only the differences with the current links are written: the links of removed tags are deleted and the links
+        of added tags are inserted.
+
+        Args:
+            recipe_id (int | ScalarSelect): The ID of the recipe, or the subquery selecting it (e.g. `owned_id(...)`).
+            tags (list[TAGEnum]): The tags of the recipe.
+            session (Session): SQLAlchemy session.
+        """
+        tag_ids = Tag.ids(session=session, create=True)
+        association = recipe_tag_association
+
+        wanted = {tag_ids[tag] for tag in tags}
+        current = {tag_id for (tag_id,) in session.query(association.c.tag_id).filter(association.c.recipe_id == recipe_id)}
+
+        if current - wanted:
+            session.execute(association.delete().where(association.c.recipe_id == recipe_id, association.c.tag_id.in_(current - wanted)))
+        if wanted - current:
+            added = select(literal(recipe_id) if isinstance(recipe_id, int) else recipe_id, TagModel.id).where(TagModel.id.in_(wanted - current))
+            session.execute(association.insert().from_select(["recipe_id", "tag_id"], added))
+
+    async def show_all(self, search, filter, page, fields, db_session):
         """
         Retrieve a list of recipes based on search and filter criteria.
 
@@ -161,18 +338,21 @@ class Recipe:
             search (str): Search query.
             filter (RecipeFilterSchema): Filtering criteria.
             page (PaginationQuerySchema): Pagination settings.
+            fields (str | None): The normalized comma-separated fields of the recipes (None for `LIST_FIELDS`).
             db_session (Session): SQLAlchemy session.
 
         Returns:
             dict: Dictionary containing a list of recipes, page count, and total count.
         """
         trim_filter_param = {key: value for key, value in filter.model_dump().items() if value is not None and value != ""}
+        if "tags" not in trim_filter_param:
+            trim_filter_param.pop("tags_match", None)
 
-        return await self._show_all(search=search, filter=trim_filter_param, page=page, session=db_session)
+        return await self._show_all(search=search, filter=trim_filter_param, page=page, fields=fields or LIST_FIELDS, session=db_session)
 
     @staticmethod
     @cache(cache_key="recipe_list")
-    async def _show_all(search, filter, page, session):
+    async def _show_all(search, filter, page, fields, session):
         """
         Internal method to retrieve a list of recipes based on search and filter criteria.
 
@@ -180,77 +360,422 @@ class Recipe:
             search (str): Search query.
             filter (dict): Filtering criteria.
             page (PaginationQuerySchema): Pagination settings.
+            fields (str): The comma-separated fields of the recipes.
             session (Session): SQLAlchemy session.
 
         Returns:
             dict: Dictionary containing a list of recipes, page count, and total count.
         """
-        query = RecipeModel.search(session, query_string=search)
+        # One statement per page (plus one for the tags, if requested): only the requested columns, with the author joined in.
+        query = Recipe._query(search=search, filters=filter, session=session).options(*Recipe._load_options(fields))
 
-        for key, value in filter.items():
-            query = query.filter(getattr(RecipeModel, key) == value)
+        total_items = await Recipe._count(search=search, filter=filter, session=session)
+        recipes, next_cursor = paginate(query, page, RecipeModel.created_at, RecipeModel.id)
 
-        total_items = query.count()
-        recipes = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
-
-        recipe_flatten_query = [
-            RecipeQuerySchemaSimple(
-                uuid=recipe.uuid,
-                title=recipe.title,
-                user=UserQuerySchemaSimple(phone_number=recipe.user.phone_number, email=recipe.user.email),
-            ).model_dump()
-            for recipe in recipes
-        ]
+        recipe_flatten_query = [Recipe._flatten(recipe, fields) for recipe in recipes]
 
         return {
             "data": recipe_flatten_query,
             "page_count": (total_items + page.page_size - 1) // page.page_size,
             "count": total_items,
+            "next_cursor": next_cursor,
         }
 
-    async def show_detail(self, recipe_uuid, db_session):
+    @staticmethod
+    def _query(search, filters, session):
+        """
+        Internal method to build the query of the recipes matching the search and filter criteria.
+
+        Args:
+            search (str): Search query.
+            filters (dict): Filtering criteria.
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            Query: SQLAlchemy query of the recipes.
+        """
+        query = RecipeModel.search(session, query_string=search)
+
+        filters = dict(filters)
+        tags = filters.pop("tags", None)
+        tags_match = filters.pop("tags_match", TagMatchEnum.ANY)
+
+        for key, value in filters.items():
+            query = query.filter(getattr(RecipeModel, key) == value)
+
+        if tags:
+            tag_ids = Tag.ids(session=session)
+            query = query.filter(*Recipe._tagged(tag_ids=[tag_ids.get(TAGEnum(title)) for title in tags.split(",")], match=tags_match))
+
+        return query
+
+    @staticmethod
+    def _tagged(tag_ids, match):
+        """
+        Internal method to build the conditions of the recipes having some tags.
+
+        The conditions are correlated `EXISTS` probes of the (recipe_id, tag_id) index of `recipe_tag_association`,
+        so a page is read in the (created_at, id) index order and stops once it is full: the tags are few and broad,
+        so walking the newest recipes is cheaper than collecting and sorting every tagged recipe.
+
+        Args:
+            tag_ids (list[int | None]): The IDs of the tags (None for a tag without a row, which no recipe has).
+            match (TagMatchEnum): Whether any or all of the tags must match.
+
+        Returns:
+            list: The conditions a recipe must meet (one for any tag, one per tag for all tags).
+        """
+        association = recipe_tag_association
+
+        def has_tags(ids):
+            return exists().where(association.c.recipe_id == RecipeModel.id, association.c.tag_id.in_(ids))
+
+        if TagMatchEnum(match) == TagMatchEnum.ALL:
+            return [has_tags([tag_id]) if tag_id is not None else false() for tag_id in tag_ids]
+
+        known = [tag_id for tag_id in tag_ids if tag_id is not None]
+        return [has_tags(known) if known else false()]
+
+    @staticmethod
+    @cache(cache_key="recipe_count", timeout=settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+    async def _count(search, filter, session):
+        """
+        Internal method to count the recipes matching the search and filter criteria (cached apart from the pages).
+
+        Args:
+            search (str): Search query.
+            filter (dict): Filtering criteria.
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            int: The number of recipes.
+        """
+        return count_items(Recipe._query(search=search, filters=filter, session=session))
+
+    async def show_detail(self, recipe_uuid, fields, db_session):
         """
         Retrieve details of a specific recipe.
 
         Args:
             recipe_uuid (str): The UUID of the recipe to retrieve.
+            fields (str | None): The normalized comma-separated fields of the recipe (None for all of them).
             db_session (Session): SQLAlchemy session.
 
         Returns:
             dict: Dictionary containing the details of the recipe.
         """
-        return await self._show_detail(recipe_uuid=recipe_uuid, session=db_session)
+        recipe = await self._show_detail(recipe_uuid=recipe_uuid, fields=fields, session=db_session)
+        if recipe["data"]:
+            view_counter.add(recipe_uuid)
+            await trending.record(recipe_uuid, "view")
+
+        return recipe
 
     @staticmethod
     @cache(cache_key="recipe_detail")
-    async def _show_detail(recipe_uuid, session):
+    async def _show_detail(recipe_uuid, fields, session):
         """
         Internal method to retrieve details of a specific recipe.
 
         Args:
             recipe_uuid (str): The UUID of the recipe to retrieve.
+            fields (str | None): The comma-separated fields of the recipe (None for all of them).
             session (Session): SQLAlchemy session.
 
         Returns:
             dict: Dictionary containing the details of the recipe.
         """
-        recipe = session.query(RecipeModel).filter(RecipeModel.uuid == recipe_uuid).first()
-        recipe_flatten = {}
-
-        if recipe:
-            recipe_flatten = RecipeQuerySchema(
-                uuid=recipe.uuid,
-                title=recipe.title,
-                content=recipe.content,
-                is_active=recipe.is_active,
-                tags=[TagQuerySchema(title=tag.title.name, display_title=_(tag.title.value)) for tag in recipe.tags],
-                user=UserQuerySchemaSimple(phone_number=recipe.user.phone_number, email=recipe.user.email),
-                created_at=recipe.created_at,
+        # At most two statements: the recipe with its author joined in, then its tags.
+        recipe = Recipe._detail_query(session=session, fields=fields).filter(RecipeModel.uuid == recipe_uuid).first()
+
+        return {
+            "data": Recipe._flatten(recipe, fields),
+        }
+
+    async def show_details(self, recipe_uuids, db_session):
+        """
+        Retrieve details of several recipes at once.
+
+        Args:
+            recipe_uuids (list[str]): The UUIDs of the recipes to retrieve.
+            db_session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing the details of the existing recipes, in the requested order.
+
+        Raises:
+            BadRequestException: If more than `settings.RECIPE_DETAILS["MAX_UUIDS"]` recipes are requested.
+        """
+        recipe_uuids = list(dict.fromkeys(recipe_uuids))
+        if len(recipe_uuids) > settings.RECIPE_DETAILS["MAX_UUIDS"]:
+            raise BadRequestException(message=_("Too many recipes are requested at once"))
+
+        return await self._show_details(recipe_uuids=recipe_uuids, session=db_session)
+
+    @staticmethod
+    async def _show_details(recipe_uuids, session):
+        """
+        Internal method to retrieve details of several recipes at once.
+
+        The details share the cache entries of `_show_detail`: the cached ones are read with one `MGET`, the others are
+        loaded together (the recipes with their authors, then their tags) and cached in one pipeline.
+
+        Args:
+            recipe_uuids (list[str]): The UUIDs of the recipes to retrieve.
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing the details of the existing recipes, in the requested order.
+        """
+
+        async def fetch(calls):
+            uuids = [call["recipe_uuid"] for call in calls]
+            recipes = {recipe.uuid: recipe for recipe in Recipe._detail_query(session=session).filter(RecipeModel.uuid.in_(uuids))}
+            return [{"data": Recipe._flatten(recipes.get(uuid))} for uuid in uuids]
+
+        details = await get_many("recipe_detail", [{"recipe_uuid": recipe_uuid, "fields": None} for recipe_uuid in recipe_uuids], fetch)
+
+        return {
+            "data": [detail["data"] for detail in details if detail["data"]],
+        }
+
+    async def feed(self, user, page, db_session):
+        """
+        Retrieve the newest recipes of the users followed by a user (cursor pagination only).
+
+        Args:
+            user (UserModel): The authenticated user.
+            page (PaginationQuerySchema): Pagination settings (the cursor is the `next_cursor` of the previous page).
+            db_session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing a list of recipes and the cursor of the next page.
+
+        Raises:
+            BadRequestException: If the cursor is malformed.
+        """
+        before = None
+        if page.cursor:
+            if not page.cursor.isdigit():
+                raise BadRequestException(message=_("The requested pagination cursor is invalid"))
+            before = int(page.cursor)
+
+        return await self._feed(user=user, before=before, page_size=page.page_size, session=db_session)
+
+    @staticmethod
+    async def _feed(user, before, page_size, session):
+        """
+        Internal method to retrieve a page of the feed of a user.
+
+        The recipe IDs come from the user's timeline (see `src.resources.recipes.feed`), then the recipes are loaded
+        with their authors in one statement, so a page costs O(page size).
+
+        Args:
+            user (UserModel): The authenticated user.
+            before (int | None): The ID of the last recipe of the previous page, None for the first page.
+            page_size (int): The number of recipes of the page.
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing a list of recipes and the cursor of the next page.
+        """
+        recipe_ids = await feed_recipe_ids(session, user_id=user.id, before=before, count=page_size + 1)
+        page_ids = recipe_ids[:page_size]
+
+        recipes = {
+            recipe.id: recipe
+            for recipe in session.query(RecipeModel)
+            .options(
+                load_only(RecipeModel.uuid, RecipeModel.title),
+                joinedload(RecipeModel.user).load_only(UserModel.phone_number, UserModel.email),
+            )
+            .filter(RecipeModel.id.in_(page_ids), RecipeModel.is_active.is_(True))
+        }
+
+        # Recipes deleted or deactivated since they were pushed into the timeline are skipped.
+        recipe_flatten_query = [
+            RecipeQuerySchemaSimple(
+                uuid=recipes[recipe_id].uuid,
+                title=recipes[recipe_id].title,
+                user=UserQuerySchemaSimple(phone_number=recipes[recipe_id].user.phone_number, email=recipes[recipe_id].user.email),
             ).model_dump()
+            for recipe_id in page_ids
+            if recipe_id in recipes
+        ]
 
         return {
-            "data": recipe_flatten,
+            "data": recipe_flatten_query,
+            "next_cursor": str(page_ids[-1]) if len(recipe_ids) > page_size else None,
+        }
+
+    async def show_trending(self, count, db_session):
+        """
+        Retrieve the trending recipes.
+
+        Args:
+            count (int): The number of recipes.
+            db_session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing the details of the trending recipes with their scores, highest score first.
+
+        Raises:
+            BadRequestException: If more than `settings.TRENDING["MAX_COUNT"]` recipes are requested.
+        """
+        if not 0 < count <= settings.TRENDING["MAX_COUNT"]:
+            raise BadRequestException(message=_("The requested number of trending recipes is out of range"))
+
+        return await self._show_trending(count=count, session=db_session)
+
+    @staticmethod
+    async def _show_trending(count, session):
+        """
+        Internal method to retrieve the trending recipes.
+
+        The ranking is read from the trending sorted set (see `src.resources.recipes.trending`) and the details are
+        served like `_show_details` (cache first), so no recipe table scan is involved.
+
+        Args:
+            count (int): The number of recipes.
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            dict: Dictionary containing the details of the trending recipes with their scores, highest score first.
+        """
+        ranking = await trending.top(count)
+        details = await Recipe._show_details(recipe_uuids=[recipe_uuid for recipe_uuid, _score in ranking], session=session)
+        scores = dict(ranking)
+
+        return {
+            "data": [{**detail, "trending_score": round(scores[detail["uuid"]], 3)} for detail in details["data"]],
+        }
+
+    @staticmethod
+    def export(after, session):
+        """
+        Iterate over all the recipes (with their author and tags) in ID order, for a streaming export.
+
+        The recipes are read by one query through a server-side cursor, `settings.EXPORT["YIELD_PER"]` rows at a time
+        (plus one query of the tags per batch), so the memory stays constant and the export sees one snapshot.
+
+        Args:
+            after (int | None): Only the recipes with a higher ID (the last exported ID, to resume an export).
+            session (Session): SQLAlchemy session.
+
+        Yields:
+            dict: The `EXPORT_COLUMNS` of a recipe.
+        """
+        query = session.query(RecipeModel).options(
+            joinedload(RecipeModel.user).load_only(UserModel.phone_number, UserModel.email),
+            joinedload(RecipeModel.body),
+            selectinload(RecipeModel.tags),
+        )
+        if after is not None:
+            query = query.filter(RecipeModel.id > after)
+
+        for recipe in query.order_by(RecipeModel.id).execution_options(stream_results=True).yield_per(settings.EXPORT["YIELD_PER"]):
+            yield {
+                "id": recipe.id,
+                "uuid": recipe.uuid,
+                "title": recipe.title,
+                "content": recipe.content,
+                "is_active": recipe.is_active,
+                "created_at": recipe.created_at,
+                "author_phone_number": recipe.user.phone_number if recipe.user else None,
+                "author_email": recipe.user.email if recipe.user else None,
+                "tags": [tag.title.value for tag in recipe.tags],
+            }
+
+    @staticmethod
+    def _detail_query(session, fields=None):
+        """
+        Internal method to build the query of recipe details, loading only the requested fields.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            fields (str | None): The comma-separated fields of the recipes (None for all of them).
+
+        Returns:
+            Query: SQLAlchemy query of the recipes.
+        """
+        return session.query(RecipeModel).options(*Recipe._load_options(fields))
+
+    @staticmethod
+    def _load_options(fields):
+        """
+        Internal method to build the loader options of the requested fields of recipes.
+
+        Only the requested columns are selected, the author, content and counters are joined in, and the tags are
+        loaded at once, each only if requested (so a list of titles does not read the `recipe_contents` table).
+
+        Args:
+            fields (str | None): The comma-separated fields of the recipes (None for all of them).
+
+        Returns:
+            list: The SQLAlchemy loader options.
+        """
+        names = (fields or DETAIL_FIELDS).split(",")
+        columns = {
+            "title": RecipeModel.title,
+            "is_active": RecipeModel.is_active,
+            "created_at": RecipeModel.created_at,
+        }
+
+        options = [load_only(RecipeModel.uuid, *[columns[name] for name in names if name in columns])]
+        if "user" in names:
+            options.append(joinedload(RecipeModel.user).load_only(UserModel.phone_number, UserModel.email))
+        if "content" in names:
+            options.append(joinedload(RecipeModel.body))
+        if "view_count" in names:
+            options.append(joinedload(RecipeModel.stats))
+        if "tags" in names:
+            options.append(selectinload(RecipeModel.tags))
+
+        return options
+
+    @staticmethod
+    def _flatten(recipe, fields=None):
+        """
+        Internal method to serialize the requested fields of a recipe.
+
+        Args:
+            recipe (RecipeModel | None): The recipe, loaded with `_load_options(fields)`.
+            fields (str | None): The comma-separated fields of the recipe (None for all of them).
+
+        Returns:
+            dict: The fields of the recipe, in schema order (empty if there is no recipe).
+        """
+        if recipe is None:
+            return {}
+
+        values = {
+            "uuid": lambda: recipe.uuid,
+            "title": lambda: recipe.title,
+            "content": lambda: recipe.content,
+            "is_active": lambda: recipe.is_active,
+            "user": lambda: UserQuerySchemaSimple(phone_number=recipe.user.phone_number, email=recipe.user.email),
+            "created_at": lambda: recipe.created_at,
+            "tags": lambda: [TagQuerySchema(title=tag.title.name, display_title=_(tag.title.value)) for tag in recipe.tags],
+            "view_count": lambda: recipe.view_count,
         }
+        names = (fields or DETAIL_FIELDS).split(",")
+
+        # Only the requested (loaded) attributes are read; the omitted fields are left out of the output.
+        return RecipeQuerySchema.model_construct(**{name: values[name]() for name in names}).model_dump(include=set(names))
+
+
+@event.listens_for(Session, "after_commit")
+def publish_tag_ids(session):
+    """Share the tag IDs created by the session with the process once they are committed."""
+    if "tag_ids" in session.info:
+        Tag._ids = session.info.pop("tag_ids")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_tag_ids(session, transaction):
+    """Forget the tag IDs created by a transaction that did not commit (no-op after `publish_tag_ids`)."""
+    if transaction.parent is None:
+        session.info.pop("tag_ids", None)
 
 
 class Tag:
@@ -259,8 +784,48 @@ class Tag:
 
     Class Methods:
     - show_all(page, db_session): Retrieve a list of tags.
+    - ids(session): Get the IDs of the canonical tag rows.
     """
 
+    # TAGEnum members mapped to the IDs of their canonical rows, loaded once per process (committed rows only).
+    _ids = {}
+
+    @staticmethod
+    def ids(session, create=False):
+        """
+        Get the IDs of the canonical tag rows (one row per TAGEnum member, seeded by the tag fixtures).
+
+        The map is loaded once per process. A missing row (e.g. of a new TAGEnum member) is left out of the map, or
+        created on the way by the write paths (`create=True`). Such a map is only kept for the session's transaction
+        and shared with the process once the transaction commits, so a rollback never leaves the IDs of rows that do
+        not exist in the cache.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            create (bool): Whether to create the missing rows, in the session's transaction (default is False).
+
+        Returns:
+            dict: The TAGEnum members mapped to their tag IDs.
+        """
+        if len(Tag._ids) == len(TAGEnum):
+            return Tag._ids
+        if "tag_ids" in session.info:
+            return session.info["tag_ids"]
+
+        # The lowest ID of a title is its canonical row (the rows are unique once the tags are compacted).
+        tag_ids = {title: tag_id for tag_id, title in session.query(TagModel.id, TagModel.title).order_by(TagModel.id.desc())}
+
+        missing = [TagModel(title=tag) for tag in TAGEnum if tag not in tag_ids]
+        if not missing:
+            Tag._ids = tag_ids
+        elif create:
+            session.add_all(missing)
+            session.flush()
+            tag_ids.update({tag.title: tag.id for tag in missing})
+            session.info["tag_ids"] = tag_ids
+
+        return tag_ids
+
     async def show_all(self, page, db_session):
         """
         Retrieve a list of tags.
@@ -289,7 +854,7 @@ class Tag:
         """
         query = session.query(TagModel.title)
 
-        total_items = query.count()
+        total_items = await Tag._count(session=session)
         tags = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
 
         tag_flatten_query = [
@@ -305,3 +870,17 @@ class Tag:
             "page_count": (total_items + page.page_size - 1) // page.page_size,
             "count": total_items,
         }
+
+    @staticmethod
+    @cache(cache_key="tag_count", timeout=settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+    async def _count(session):
+        """
+        Internal method to count the tags (cached apart from the pages).
+
+        Args:
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            int: The number of tags.
+        """
+        return count_items(session.query(TagModel.title))
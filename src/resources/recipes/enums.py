@@ -5,3 +5,8 @@ class TAGEnum(Enum):
     NEW = "new"
     TREND = "trend"
     PRO = "professional"
+
+
+class TagMatchEnum(Enum):
+    ANY = "any"
+    ALL = "all"
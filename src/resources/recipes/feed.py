@@ -0,0 +1,112 @@
+"""
+Home feed of the recipes of the followed users, served by per-user timelines (fan-out on write).
+
+Every user has a timeline: a sorted set of recipe IDs (scored by ID, so newest first) capped at
+`settings.FEED["TIMELINE_SIZE"]` recipes, stored in Redis (in-process in debug mode):
+
+    - Write: a new recipe is pushed into the existing timelines of its author's followers (one pipeline).
+    - Read: a feed page is one range of the timeline, so it costs O(page size) whatever the number of followings.
+    - A missing timeline (never read, evicted, or dropped after a follow / unfollow) is rebuilt from the database on
+      its next read. A sentinel member marks the timeline as built, so an empty feed is not rebuilt on every read; it
+      is the lowest member and is kept when the timeline is trimmed to its cap.
+    - Inactive recipes are left out of the rebuilt timelines and of the pages (a recipe deactivated after its fan-out
+      is skipped when the page is loaded).
+
+Authors with more than `settings.FEED["FAN_OUT_MAX_FOLLOWERS"]` followers are not fanned out (fan-out on read): they
+are kept in a registry and their recipes are merged into the pages of their followers at read time.
+
+Example usage:
+
+    await fan_out(session, author_id=user.id, recipe_ids=[recipe.id])
+    recipe_ids = await feed_recipe_ids(session, user_id=user.id, before=None, count=11)
+"""
+
+from sqlalchemy import select
+
+from src.core import settings
+from src.helpers.cache.sorted_sets import get_sorted_sets
+from src.helpers.timelines import timeline_key
+from src.resources.recipes.models import RecipeModel
+from src.resources.relations.models import RelationModel
+
+# Registry of the authors served by fan-out on read.
+CELEBRITIES_KEY = "feed:celebrities"
+
+# Member (scored 0, below every recipe) marking a built timeline; not counted in `settings.FEED["TIMELINE_SIZE"]`.
+SENTINEL = "0"
+
+
+async def fan_out(session, author_id, recipe_ids):
+    """
+    Push new recipes into the timelines of their author's followers.
+
+    Only the existing timelines are updated (the others are complete once rebuilt). An author with too many followers
+    is registered for fan-out on read instead.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        author_id (int): The ID of the author of the recipes.
+        recipe_ids (list[int]): The IDs of the new recipes.
+    """
+    store = get_sorted_sets()
+    limit = settings.FEED["FAN_OUT_MAX_FOLLOWERS"]
+
+    # Bounded read of the (following_id) index: at most limit + 1 followers.
+    follower_ids = [follower_id for (follower_id,) in session.query(RelationModel.follower_id).filter(RelationModel.following_id == author_id).limit(limit + 1)]
+
+    if len(follower_ids) > limit:
+        await store.add_many([CELEBRITIES_KEY], {str(author_id): author_id})
+        return
+
+    await store.remove(CELEBRITIES_KEY, author_id)
+
+    timelines = await store.existing([timeline_key(follower_id) for follower_id in follower_ids])
+    await store.add_many(timelines, {str(recipe_id): recipe_id for recipe_id in recipe_ids}, cap=settings.FEED["TIMELINE_SIZE"], keep_lowest=1)
+
+
+async def rebuild_timeline(session, user_id):
+    """
+    Rebuild the timeline of a user from the latest recipes of the followed users.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        user_id (int): The ID of the user.
+    """
+    followings = select(RelationModel.following_id).where(RelationModel.follower_id == user_id)
+    query = session.query(RecipeModel.id).filter(RecipeModel.user_id.in_(followings), RecipeModel.is_active.is_(True))
+    recipe_ids = query.order_by(RecipeModel.id.desc()).limit(settings.FEED["TIMELINE_SIZE"])
+
+    members = {SENTINEL: 0, **{str(recipe_id): recipe_id for (recipe_id,) in recipe_ids}}
+    await get_sorted_sets().add_many([timeline_key(user_id)], members, cap=settings.FEED["TIMELINE_SIZE"], keep_lowest=1)
+
+
+async def feed_recipe_ids(session, user_id, before, count):
+    """
+    Get the IDs of the newest recipes of the users followed by a user.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        user_id (int): The ID of the user.
+        before (int | None): Only recipes with a lower ID (the last recipe of the previous page), None for the first page.
+        count (int): The maximum number of recipe IDs.
+
+    Returns:
+        list[int]: The recipe IDs, newest first.
+    """
+    store = get_sorted_sets()
+    key = timeline_key(user_id)
+
+    if not await store.existing([key]):
+        await rebuild_timeline(session, user_id)
+
+    recipe_ids = {int(member) for member in await store.range_before(key, before, count) if member != SENTINEL}
+
+    celebrities = [int(member) for member in await store.members(CELEBRITIES_KEY)]
+    if celebrities:
+        followed = select(RelationModel.following_id).where(RelationModel.follower_id == user_id, RelationModel.following_id.in_(celebrities))
+        query = session.query(RecipeModel.id).filter(RecipeModel.user_id.in_(followed), RecipeModel.is_active.is_(True))
+        if before is not None:
+            query = query.filter(RecipeModel.id < before)
+        recipe_ids.update(recipe_id for (recipe_id,) in query.order_by(RecipeModel.id.desc()).limit(count))
+
+    return sorted(recipe_ids, reverse=True)[:count]
@@ -1,6 +1,7 @@
 import uuid
 import datetime
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import TEXT
@@ -11,15 +12,21 @@ from sqlalchemy import Boolean
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import or_
 
 from src.core.database import Basemodel
 from src.resources.recipes.enums import TAGEnum
 from src.resources.recipes.fixtures import tag_fixtures
+from src.resources.recipes.search import full_text_search
 
 recipe_tag_association = Table(
-    "recipe_tag_association", Basemodel.metadata, Column("recipe_id", Integer, ForeignKey("recipes.id")), Column("tag_id", Integer, ForeignKey("tags.id"))
+    "recipe_tag_association",
+    Basemodel.metadata,
+    Column("recipe_id", Integer, ForeignKey("recipes.id")),
+    Column("tag_id", Integer, ForeignKey("tags.id")),
+    Index("ix_recipe_tag_association_recipe_id_tag_id", "recipe_id", "tag_id", unique=True),
+    Index("ix_recipe_tag_association_tag_id_recipe_id", "tag_id", "recipe_id"),
 )
 
 
@@ -32,10 +39,44 @@ class TagModel(Basemodel):
     """
 
     __tablename__ = "tags"
+    __table_args__ = (Index("ix_tags_title", "title", unique=True),)
 
     title = Column(Enum(TAGEnum), nullable=False)
 
 
+class RecipeStatsModel(Basemodel):
+    """
+    SQLAlchemy model representing the counters of a recipe (written in bulk by `src.resources.recipes.stats`).
+
+    Attributes:
+        recipe_id (int): The ID of the recipe.
+        view_count (int): The number of detail views of the recipe.
+    """
+
+    __tablename__ = "recipe_stats"
+    __table_args__ = (Index("ix_recipe_stats_recipe_id", "recipe_id", unique=True),)
+
+    recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=False)
+    view_count = Column(Integer, default=0, nullable=False)
+
+
+class RecipeContentModel(Basemodel):
+    """
+    SQLAlchemy model representing the content of a recipe, stored apart from the recipe row so that the list scans and
+    filters of the recipes do not read the (large) contents.
+
+    Attributes:
+        recipe_id (int): The ID of the recipe.
+        content (str): The content or description of the recipe.
+    """
+
+    __tablename__ = "recipe_contents"
+    __table_args__ = (Index("ix_recipe_contents_recipe_id", "recipe_id", unique=True),)
+
+    recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=False)
+    content = Column(TEXT, nullable=False)
+
+
 class RecipeModel(Basemodel):
     """
     SQLAlchemy model representing recipes.
@@ -44,11 +85,14 @@ class RecipeModel(Basemodel):
         uuid (str): A unique identifier for the recipe.
         user_id (int): The ID of the user who created the recipe.
         title (str): The title of the recipe.
-        content (str): The content or description of the recipe.
+        content (str): The content or description of the recipe (a proxy of `body.content`).
         is_active (bool): Whether the recipe is active or not.
         created_at (str): The ISO-formatted creation date and time of the recipe.
         user (UserModel): The user who created the recipe.
         tags (List[TagModel]): Tags associated with the recipe.
+        body (RecipeContentModel): The content row of the recipe (only loaded by the detail views).
+        stats (RecipeStatsModel): The counters of the recipe (None until the recipe is viewed).
+        view_count (int): The number of detail views of the recipe.
 
     Class Methods:
         search(cls, session, query_string=None): Perform a search query for recipes based on a query string.
@@ -58,17 +102,24 @@ class RecipeModel(Basemodel):
     """
 
     __tablename__ = "recipes"
+    __table_args__ = (
+        Index("ix_recipes_user_id", "user_id"),
+        Index("ix_recipes_created_at_id", "_RecipeModel__created_at", "id"),
+    )
 
     uuid = Column(String(36), unique=True, nullable=False, default=lambda x: str(uuid.uuid4()))
     user_id = Column(Integer, ForeignKey("users.id"))
     title = Column(String, nullable=False)
-    content = Column(TEXT, nullable=False)
     is_active = Column(Boolean, default=True)
 
     __created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     user = relationship("UserModel", back_populates="recipes")
     tags = relationship("TagModel", secondary=recipe_tag_association)
+    body = relationship("RecipeContentModel", uselist=False, cascade="all, delete-orphan")
+    stats = relationship("RecipeStatsModel", uselist=False)
+
+    content = association_proxy("body", "content", creator=lambda content: RecipeContentModel(content=content))
 
     def __repr__(self):
         return self.uuid
@@ -83,11 +134,34 @@ class RecipeModel(Basemodel):
         """
         return self.__created_at.isoformat()
 
+    @created_at.expression
+    def created_at(cls):
+        """
+        Get the creation date and time column of the recipe (e.g. for ordering and keyset pagination).
+
+        Returns:
+            Column: The creation date and time column.
+        """
+        return cls.__created_at
+
+    @property
+    def view_count(self):
+        """
+        Get the number of detail views of the recipe (as of the last flush of the view counters).
+
+        Returns:
+            int: The number of views.
+        """
+        return self.stats.view_count if self.stats else 0
+
     @classmethod
     def search(cls, session, query_string=None):
         """
         Perform a search query for recipes based on a query string.
 
+        The search runs on the full-text index (see `src.resources.recipes.search`): every word must match, words
+        also match as prefixes and the results are ordered by relevance.
+
         Args:
             session (Session): SQLAlchemy database session.
             query_string (str, optional): The query string to search for in recipe titles and content. Defaults to None.
@@ -96,12 +170,7 @@ class RecipeModel(Basemodel):
             Query: SQLAlchemy query object representing the search results.
         """
         if query_string:
-            filters = [
-                cls.title.ilike(f"%{query_string}%"),
-                cls.content.ilike(f"%{query_string}%"),
-            ]
-
-            return session.query(cls).filter(or_(*filters))
+            return full_text_search(session.query(cls), cls, query_string)
         else:
             return session.query(cls)
 
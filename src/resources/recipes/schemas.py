@@ -2,7 +2,9 @@ import re
 from typing import Optional, Any
 from pydantic import Field, BaseModel, field_validator
 
+from src.helpers.fields import select_fields
 from src.resources.recipes.enums import TAGEnum
+from src.resources.recipes.enums import TagMatchEnum
 from fastapi_babel.core import make_gettext as _
 
 
@@ -95,6 +97,7 @@ class RecipeQuerySchema(BaseModel):
     user: Any = Field(description="Information about the user associated with the recipe.")
     created_at: str = Field(description="The timestamp indicating when the recipe was created.")
     tags: list[TagQuerySchema] = Field([], description="A list of tags associated with the recipe.")
+    view_count: int = Field(0, description="The number of views of the recipe (updated every few seconds).")
 
     class Config:
         from_attributes = True
@@ -102,6 +105,52 @@ class RecipeQuerySchema(BaseModel):
 
 class RecipeFilterSchema(BaseModel):
     is_active: Optional[bool] = Field(None, description="Filter by recipe's active status.")
+    tags: Optional[str] = Field(None, description="Filter by tags: a comma-separated list of tag titles, e.g. trend,professional.")
+    tags_match: TagMatchEnum = Field(TagMatchEnum.ANY, description="Match recipes having any (default) or all of the filtered tags.")
+
+    @field_validator("tags")
+    def validate_tags(cls, tags):
+        """
+        Validate the filtered tags and normalize them (unique, sorted), so that equal filters share their cache entries.
+
+        Args:
+            tags (str): The comma-separated tag titles.
+
+        Returns:
+            str: The normalized comma-separated tag titles (None if no tag is given).
+
+        Raises:
+            ValueError: If a tag title is unknown.
+        """
+        if tags is None:
+            return None
+
+        titles = {title.strip().lower() for title in tags.split(",") if title.strip()}
+        if not titles <= {tag.value for tag in TAGEnum}:
+            raise ValueError(_("Recipe tags filter contains an unknown tag"))
+        return ",".join(sorted(titles)) or None
+
+
+class RecipeFieldsSchema(BaseModel):
+    fields: Optional[str] = Field(
+        None, description="The fields of the recipes to return: a comma-separated list of RecipeQuerySchema fields, e.g. uuid,title (default depends on the endpoint)."
+    )
+
+    @field_validator("fields")
+    def validate_fields(cls, fields):
+        """
+        Validate the requested fields and normalize them (unique, in schema order), so that equal fieldsets share their cache entries.
+
+        Args:
+            fields (str): The comma-separated field names.
+
+        Returns:
+            str: The normalized comma-separated field names (None if no field is given).
+
+        Raises:
+            ValueError: If a field is not a field of `RecipeQuerySchema`.
+        """
+        return select_fields(fields, RecipeQuerySchema)
 
 
 class RecipeEditSchema(BaseModel):
@@ -0,0 +1,78 @@
+"""
+Full-text search of the recipes.
+
+The search index is created by the `0006` schema migration (`0003` on databases created before the contents were
+moved to `recipe_contents`):
+
+    - SQLite: the `recipes_fts` FTS5 table (external content of the `recipe_documents` view joining `recipes` and
+      `recipe_contents`, kept in sync by triggers), ranked by bm25.
+    - PostgreSQL: the `recipes.search_vector` tsvector column (kept up to date by triggers) with a GIN index, ranked by
+      ts_rank.
+
+Every word of the query string must match (AND) and every word also matches as a prefix, e.g. "choc cake" finds
+"Chocolate cake". Titles weigh more than contents in the ranking. Other databases fall back to `ILIKE`.
+
+Example usage:
+
+    query = full_text_search(session.query(RecipeModel), RecipeModel, "choc cake")
+"""
+
+import re
+from sqlalchemy import or_
+from sqlalchemy import func
+from sqlalchemy import Table
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import MetaData
+from sqlalchemy import literal_column
+
+from src.core.database import engine
+
+# Not part of the models metadata: the virtual table is created by the schema migration.
+recipes_fts = Table("recipes_fts", MetaData(), Column("rowid", Integer))
+
+# bm25 weights of the (title, content) columns.
+BM25_WEIGHTS = (10.0, 1.0)
+
+
+def search_terms(query_string):
+    """
+    Split a query string into search words, dropping the operators and punctuation of the search syntaxes.
+
+    Args:
+        query_string (str): The query string.
+
+    Returns:
+        list: The search words.
+    """
+    return re.findall(r"\w+", query_string)
+
+
+def full_text_search(query, model, query_string):
+    """
+    Restrict a recipe query to the recipes matching a query string, ordered by relevance.
+
+    Args:
+        query (Query): The SQLAlchemy query of the recipes.
+        model (RecipeModel): The recipe model.
+        query_string (str): The query string.
+
+    Returns:
+        Query: The filtered and ranked query.
+    """
+    terms = search_terms(query_string)
+
+    if not terms or engine.dialect.name not in ("sqlite", "postgresql"):
+        return query.filter(or_(model.title.ilike(f"%{query_string}%"), model.content.ilike(f"%{query_string}%")))
+
+    if engine.dialect.name == "postgresql":
+        ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        search_vector = literal_column("recipes.search_vector")
+        return query.filter(search_vector.op("@@")(ts_query)).order_by(func.ts_rank(search_vector, ts_query).desc())
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    return (
+        query.join(recipes_fts, recipes_fts.c.rowid == model.id)
+        .filter(literal_column("recipes_fts").op("MATCH")(match))
+        .order_by(func.bm25(literal_column("recipes_fts"), *BM25_WEIGHTS))
+    )
@@ -0,0 +1,102 @@
+"""
+Recipe view counters with batched write-behind.
+
+A detail view only increments an in-process counter (`view_counter.add`); a background task (`run_flush_job`) writes
+the counters accumulated during the last `settings.RECIPE_STATS["FLUSH_SECONDS"]` seconds to the `recipe_stats` table
+in one executemany upsert, and the application shutdown flushes the remaining ones. Every worker flushes its own
+increments, so the counts add up across workers. The counts are served with the recipe details (joined into their
+query), as of the last flush and the detail cache.
+
+Example usage:
+
+    view_counter.add(recipe_uuid)
+    view_counter.flush(session)
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core import settings
+from src.core.database import local_session
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+
+# Upsert of the views of a recipe (identified by UUID); recipes deleted in the meantime are skipped.
+UPSERT_VIEWS = text(
+    "INSERT INTO recipe_stats (recipe_id, view_count) SELECT id, :count FROM recipes WHERE uuid = :uuid "
+    "ON CONFLICT (recipe_id) DO UPDATE SET view_count = recipe_stats.view_count + excluded.view_count"
+).execution_options(write=True)
+
+
+class ViewCounter:
+    """
+    In-process counters of the recipe views not written to the database yet.
+
+    Attributes:
+        pending (Counter): The number of new views of every recipe UUID.
+    """
+
+    def __init__(self):
+        self.pending = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, recipe_uuid, count=1):
+        """
+        Count views of a recipe.
+
+        Args:
+            recipe_uuid (str): The UUID of the recipe.
+            count (int): The number of views (default is 1).
+        """
+        with self._lock:
+            self.pending[recipe_uuid] += count
+
+    def flush(self, session):
+        """
+        Write the pending views to the `recipe_stats` table in one statement; they are kept for the next flush if the write fails.
+
+        Args:
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            int: The number of flushed recipes.
+        """
+        with self._lock:
+            pending, self.pending = self.pending, Counter()
+
+        if not pending:
+            return 0
+
+        try:
+            session.execute(UPSERT_VIEWS, [{"uuid": recipe_uuid, "count": count} for recipe_uuid, count in pending.items()])
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            with self._lock:
+                self.pending.update(pending)
+            raise
+
+        return len(pending)
+
+
+view_counter = ViewCounter()
+
+
+def flush_views():
+    """Flush the pending recipe views in a new database session, logging (not raising) the failures."""
+    with local_session() as session:
+        try:
+            view_counter.flush(session)
+        except SQLAlchemyError as e:
+            logger.log(level=LogLevel.ERROR, message=f"VIEW COUNTERS FLUSH FAILED-> {e!r}")
+
+
+async def run_flush_job():
+    """Flush the recipe views every `settings.RECIPE_STATS["FLUSH_SECONDS"]` seconds (run as a background task)."""
+    while True:
+        await asyncio.sleep(settings.RECIPE_STATS["FLUSH_SECONDS"])
+        # The write runs in a thread, so that it does not block the event loop.
+        await asyncio.to_thread(flush_views)
@@ -0,0 +1,114 @@
+"""
+Trending recipes, ranked by time-decayed engagement scores.
+
+Every engagement event adds its weight (`settings.TRENDING["WEIGHTS"]`) to the score of a recipe in a sorted set
+(Redis, in-process in debug mode). The scores decay exponentially with a half-life of
+`settings.TRENDING["HALF_LIFE_HOURS"]`; instead of decaying every score over time, an event is weighted by
+`2 ** ((now - epoch) / half-life)` (forward decay), so the order of the set always is the decayed order and the top
+recipes are read in O(log n + k):
+
+    - View: a detail view of the recipe.
+    - Create: the recipe is created.
+    - Follow: the author of the recipe gains a follower (the newest recipe of the author is credited).
+
+The periodic refresh (`run_refresh_job`, every `settings.TRENDING["REFRESH_SECONDS"]`) moves the epoch to now by
+rescaling the scores (keeping them small), drops the faded recipes and truncates the set to
+`settings.TRENDING["SIZE"]` recipes. The rescale and the epoch move are one atomic script, and so are the epoch read
+and the increment of an event (one round trip). With several workers, the refresh of a period is claimed by the first
+one (`SET NX PX` lock held for `settings.TRENDING["REFRESH_LOCK_SECONDS"]`).
+
+Example usage:
+
+    await record(recipe_uuid, "view")
+    recipes = await top(10)  # [(recipe_uuid, score), ...]
+"""
+
+import time
+import asyncio
+from aioredis import RedisError
+
+from src.core import settings
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+from src.helpers.cache.sorted_sets import get_sorted_sets
+
+TRENDING_KEY = "trending:recipes"
+
+# Sorted set holding the epoch of the scores (the score of its "epoch" member).
+EPOCH_KEY = "trending:epoch"
+
+# Lock claimed by the worker that refreshes the scores.
+REFRESH_LOCK_KEY = "trending:refresh-lock"
+
+# Scores fading below this value (after the decay) are dropped by the refresh.
+MIN_SCORE = 0.01
+
+
+def _half_life():
+    return settings.TRENDING["HALF_LIFE_HOURS"] * 3600
+
+
+async def record(recipe_uuids, event):
+    """
+    Credit recipes with an engagement event.
+
+    Args:
+        recipe_uuids (str | list[str]): The UUID(s) of the recipe(s).
+        event (str): The event, a key of `settings.TRENDING["WEIGHTS"]` ("view", "create" or "follow").
+    """
+    if isinstance(recipe_uuids, str):
+        recipe_uuids = [recipe_uuids]
+
+    weight = settings.TRENDING["WEIGHTS"][event]
+    await get_sorted_sets().increment_decayed(TRENDING_KEY, EPOCH_KEY, {recipe_uuid: weight for recipe_uuid in recipe_uuids}, time.time(), _half_life())
+
+
+async def forget(recipe_uuid):
+    """
+    Remove a (deleted) recipe from the trending recipes.
+
+    Args:
+        recipe_uuid (str): The UUID of the recipe.
+    """
+    await get_sorted_sets().remove(TRENDING_KEY, recipe_uuid)
+
+
+async def top(count):
+    """
+    Get the trending recipes.
+
+    Args:
+        count (int): The maximum number of recipes.
+
+    Returns:
+        list[tuple]: The (recipe UUID, decayed score) pairs, highest score first.
+    """
+    store = get_sorted_sets()
+    epoch = await store.score(EPOCH_KEY, "epoch")
+    decay = 2 ** (-(time.time() - epoch) / _half_life()) if epoch is not None else 1
+    return [(recipe_uuid, score * decay) for recipe_uuid, score in await store.top(TRENDING_KEY, count)]
+
+
+async def refresh():
+    """
+    Move the epoch of the scores to now, drop the faded recipes and truncate the trending recipes.
+
+    Returns:
+        bool: True if this call refreshed the recipes, False if another refresh claimed the period.
+    """
+    store = get_sorted_sets()
+    if not await store.claim(REFRESH_LOCK_KEY, settings.TRENDING["REFRESH_LOCK_SECONDS"] * 1000):
+        return False
+
+    await store.rescale_decayed(TRENDING_KEY, EPOCH_KEY, time.time(), _half_life(), cap=settings.TRENDING["SIZE"], min_score=MIN_SCORE)
+    return True
+
+
+async def run_refresh_job():
+    """Refresh the trending recipes every `settings.TRENDING["REFRESH_SECONDS"]` seconds (run as a background task)."""
+    while True:
+        await asyncio.sleep(settings.TRENDING["REFRESH_SECONDS"])
+        try:
+            await refresh()
+        except RedisError as e:
+            logger.log(level=LogLevel.ERROR, message=f"TRENDING REFRESH FAILED-> {e!r}")
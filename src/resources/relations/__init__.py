@@ -1,9 +1,15 @@
-from sqlalchemy.orm import load_only
+from fastapi.concurrency import run_in_threadpool
 
+from src.core import settings
 from src.helpers.cache.decorators import cache
 from src.helpers.cache.decorators import expire_cache
 
 from src.core.exceptions import BadRequestException
+from src.helpers.pagination import paginate
+from src.helpers.pagination import count_items
+from src.helpers.timelines import drop_timeline
+from src.resources.recipes import trending
+from src.resources.recipes.models import RecipeModel
 from src.resources.users.models import UserModel
 from src.resources.relations.models import RelationModel
 from src.resources.users.schemas import UserQuerySchemaSimple
@@ -19,6 +25,7 @@ class Relation:
     Methods:
         follow: Follow a user.
         _follow: Internal method to perform the follow operation.
+        is_following: Check whether a user follows another user.
         unfollow: Unfollow a user.
         _unfollow: Internal method to perform the unfollow operation.
         follower_list: Get the list of followers.
@@ -40,18 +47,18 @@ class Relation:
         Returns:
             RelationModel: The relationship object representing the follow action.
         """
-        users_phone_numbers_query = (
-            db_session.query(UserModel).filter(UserModel.id.in_(following.following_id for following in user.following)).options(load_only("phone_number"))
-        )
+        following_user = db_session.query(UserModel).filter(UserModel.phone_number == following_phone_number).first()
 
-        if following_phone_number not in users_phone_numbers_query.all():
+        if following_user is None or following_user.id == user.id:
             raise BadRequestException(message=_("The requested following not found"))
 
-        following_user = db_session.query(UserModel).filter(UserModel.phone_number == following_phone_number).first()
+        if self.is_following(user_id=user.id, following_id=following_user.id, session=db_session):
+            raise BadRequestException(message=_("The requested following is already followed by the authenticated user"))
+
         return await self._follow(user=user, following_user=following_user, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["user_follower_list", "user_following_list"])
+    @expire_cache(cache_keys=["user_follower_list", "user_follower_count", "user_following_list", "user_following_count"])
     async def _follow(user, following_user, session):
         """
         Internal method to perform the follow operation.
@@ -67,10 +74,33 @@ class Relation:
         relation = RelationModel(follower_id=user.id, following_id=following_user.id)
 
         session.add(relation)
-        session.commit()
+        await run_in_threadpool(session.commit)
+
+        await drop_timeline(user.id)
+
+        # A new follower draws attention to the newest recipe of the followed user.
+        newest_recipe = session.query(RecipeModel.uuid).filter(RecipeModel.user_id == following_user.id).order_by(RecipeModel.id.desc()).first()
+        if newest_recipe:
+            await trending.record(newest_recipe.uuid, "follow")
 
         return relation
 
+    @staticmethod
+    def is_following(user_id, following_id, session):
+        """
+        Check whether a user follows another user (served by the unique (follower_id, following_id) index).
+
+        Args:
+            user_id (int): The ID of the follower.
+            following_id (int): The ID of the followed user.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            bool: True if the relationship exists.
+        """
+        query = session.query(RelationModel).filter(RelationModel.follower_id == user_id, RelationModel.following_id == following_id)
+        return session.query(query.exists()).scalar()
+
     async def unfollow(self, user, following_phone_number, db_session):
         """
         Unfollow a user.
@@ -83,18 +113,15 @@ class Relation:
         Returns:
             int: The number of relationships deleted (0 or 1).
         """
-        following_phone_numbers_query = (
-            db_session.query(UserModel).filter(UserModel.id.in_(following.following_id for following in user.following)).options(load_only("phone_number"))
-        )
+        following_user = db_session.query(UserModel).filter(UserModel.phone_number == following_phone_number).first()
 
-        if following_phone_number not in following_phone_numbers_query.all():
+        if following_user is None or not self.is_following(user_id=user.id, following_id=following_user.id, session=db_session):
             raise BadRequestException(message=_("The requested following does not follow the authenticated user"))
 
-        following_user = db_session.query(UserModel).filter(UserModel.phone_number == following_phone_number).first()
         return await self._unfollow(user=user, following_user=following_user, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["user_follower_list", "user_following_list"])
+    @expire_cache(cache_keys=["user_follower_list", "user_follower_count", "user_following_list", "user_following_count"])
     async def _unfollow(user, following_user, session):
         """
         Internal method to perform the unfollow operation.
@@ -107,9 +134,14 @@ class Relation:
         Returns:
             int: The number of relationships deleted (0 or 1).
         """
-        result = session.query(RelationModel).filter(RelationModel.follower_id == user.id, RelationModel.following_id == following_user.id).delete()
 
-        session.commit()
+        def write():
+            result = session.query(RelationModel).filter(RelationModel.follower_id == user.id, RelationModel.following_id == following_user.id).delete()
+            session.commit()
+            return result
+
+        result = await run_in_threadpool(write)
+        await drop_timeline(user.id)
 
         return result
 
@@ -141,10 +173,10 @@ class Relation:
         Returns:
             dict: A dictionary containing the list of followers, page count, and total count.
         """
-        query = session.query(UserModel).filter(UserModel.id.in_(follower.follower_id for follower in user.followers))
+        query = Relation._follower_query(user=user, session=session)
 
-        total_items = query.count()
-        followers = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
+        total_items = await Relation._follower_count(user=user, session=session)
+        followers, next_cursor = paginate(query, page, RelationModel.created_at, RelationModel.id)
 
         followers_flatten_query = [
             UserQuerySchemaSimple(
@@ -158,6 +190,7 @@ class Relation:
             "data": followers_flatten_query,
             "page_count": (total_items + page.page_size - 1) // page.page_size,
             "count": total_items,
+            "next_cursor": next_cursor,
         }
 
     async def following_list(self, user, page, db_session):
@@ -188,10 +221,10 @@ class Relation:
         Returns:
             dict: A dictionary containing the list of users being followed, page count, and total count.
         """
-        query = session.query(UserModel).filter(UserModel.id.in_(following.following_id for following in user.following))
+        query = Relation._following_query(user=user, session=session)
 
-        total_items = query.count()
-        following = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
+        total_items = await Relation._following_count(user=user, session=session)
+        following, next_cursor = paginate(query, page, RelationModel.created_at, RelationModel.id)
 
         following_flatten_query = [
             UserQuerySchemaSimple(
@@ -205,4 +238,63 @@ class Relation:
             "data": following_flatten_query,
             "page_count": (total_items + page.page_size - 1) // page.page_size,
             "count": total_items,
+            "next_cursor": next_cursor,
         }
+
+    @staticmethod
+    def _follower_query(user, session):
+        """
+        Internal method to build the query of the followers of a user.
+
+        Args:
+            user (UserModel): The user for whom to retrieve followers.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            Query: SQLAlchemy query of the followers.
+        """
+        return session.query(UserModel).join(RelationModel, RelationModel.follower_id == UserModel.id).filter(RelationModel.following_id == user.id)
+
+    @staticmethod
+    @cache(cache_key="user_follower_count", timeout=settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+    async def _follower_count(user, session):
+        """
+        Internal method to count the followers of a user (cached apart from the pages).
+
+        Args:
+            user (UserModel): The user for whom to count followers.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            int: The number of followers.
+        """
+        return count_items(Relation._follower_query(user=user, session=session))
+
+    @staticmethod
+    def _following_query(user, session):
+        """
+        Internal method to build the query of the users being followed by a user.
+
+        Args:
+            user (UserModel): The user for whom to retrieve the users being followed.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            Query: SQLAlchemy query of the users being followed.
+        """
+        return session.query(UserModel).join(RelationModel, RelationModel.following_id == UserModel.id).filter(RelationModel.follower_id == user.id)
+
+    @staticmethod
+    @cache(cache_key="user_following_count", timeout=settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+    async def _following_count(user, session):
+        """
+        Internal method to count the users being followed by a user (cached apart from the pages).
+
+        Args:
+            user (UserModel): The user for whom to count the users being followed.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            int: The number of users being followed.
+        """
+        return count_items(Relation._following_query(user=user, session=session))
@@ -1,5 +1,6 @@
 import datetime
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
@@ -25,6 +26,12 @@ class RelationModel(Basemodel):
     """
 
     __tablename__ = "relations"
+    __table_args__ = (
+        Index("ix_relations_follower_id_following_id", "follower_id", "following_id", unique=True),
+        Index("ix_relations_following_id", "following_id"),
+        Index("ix_relations_follower_id_followed_on_id", "follower_id", "_RelationModel__followed_on", "id"),
+        Index("ix_relations_following_id_followed_on_id", "following_id", "_RelationModel__followed_on", "id"),
+    )
 
     follower_id = Column(Integer, ForeignKey("users.id"))
     following_id = Column(Integer, ForeignKey("users.id"))
@@ -39,3 +46,8 @@ class RelationModel(Basemodel):
     def created_at(self):
         """Hybrid Property: Get the creation timestamp in ISO format."""
         return self.__followed_on.isoformat()
+
+    @created_at.expression
+    def created_at(cls):
+        """Hybrid Expression: Get the creation timestamp column (e.g. for ordering and keyset pagination)."""
+        return cls.__followed_on
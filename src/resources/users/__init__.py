@@ -1,15 +1,30 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy_utils.types.password import Password
+
+from src.core import settings
 from src.helpers.cache.decorators import cache
 from src.helpers.cache.decorators import expire_cache
 
 from src.helpers.jwt import JWT
+from src.helpers.jwt.revocation import revoke_tokens
+from src.helpers.passwords import hash_password
+from src.helpers.passwords import verify_password
+from src.helpers.pagination import paginate
+from src.helpers.pagination import count_items
 from src.helpers.jwt.schemas import JWTTokenSchema
 from src.resources.users.models import UserModel
+from src.resources.users.identity import forget_identity
+from src.resources.users.search import user_index
+from src.resources.recipes.models import RecipeModel
 from src.resources.users.schemas import UserSchema
 from src.resources.users.schemas import UserQuerySchema
 from src.resources.users.schemas import UserQuerySchemaSimple
 
 from src.core.exceptions import CredentialException
 
+# Columns of the exported users.
+EXPORT_COLUMNS = ["id", "phone_number", "email", "gender", "is_online", "created_at"]
+
 
 class User:
     """
@@ -31,6 +46,7 @@ class User:
         _logout: Internal method to log out a user.
         refresh: Refresh user tokens.
         _refresh: Internal method to refresh user tokens.
+        export: Iterate over all the users, for a streaming export.
 
     """
 
@@ -67,18 +83,24 @@ class User:
             JWTTokenSchema: JWT tokens if login is successful, else raises CredentialException.
         """
         tokens = []
-        if find_user.password == user_data.password:
+        valid, new_hash = await verify_password(user_data.password, find_user.password.hash if find_user.password else None)
+        if valid:
+            # The stored hash was made with outdated cost parameters: store the new one.
+            if new_hash:
+                find_user.password = Password(new_hash)
             find_user.is_online = True
-            tokens = JWT.create_access_token(user_id=find_user.id, session=session)
+            tokens = await run_in_threadpool(JWT.create_access_token, user_id=find_user.id, session=session)
         else:
             raise CredentialException()
 
-        session.commit()
+        user_id = find_user.id
+        await run_in_threadpool(session.commit)
+        await forget_identity(user_id)
 
         return tokens
 
     @staticmethod
-    @expire_cache(cache_keys=["user_list"])
+    @expire_cache(cache_keys=["user_list", "user_count"])
     async def _create(user_data, session) -> JWTTokenSchema:
         """
         Internal method to create a user.
@@ -90,12 +112,13 @@ class User:
         Returns:
             JWTTokenSchema: JWT tokens upon successful user creation.
         """
-        user = UserModel(phone_number=user_data.phone_number, email=user_data.email, password=user_data.password)
+        password = Password(await hash_password(user_data.password))
+        user = UserModel(phone_number=user_data.phone_number, email=user_data.email, password=password)
         user.is_online = True
-        tokens = JWT.create_access_token(user_id=user.id, session=session)
+        tokens = await run_in_threadpool(JWT.create_access_token, user_id=user.id, session=session)
 
         session.add(user)
-        session.commit()
+        await run_in_threadpool(session.commit)
 
         return tokens
 
@@ -126,7 +149,7 @@ class User:
         return await self._update(user=user, data=validate_schema, session=db_session)
 
     @staticmethod
-    @expire_cache(cache_keys=["user_list", "user_detail"])
+    @expire_cache(cache_keys=["user_list", "user_count", "user_detail"])
     async def _update(user, data, session) -> bool:
         """
         Internal method to update user data.
@@ -144,13 +167,21 @@ class User:
         avatar = data.pop("avatar")
 
         if password:
-            user.password = password
+            user.password = Password(await hash_password(password))
 
         if avatar is not None:
             await user.set_avatar(name=avatar["name"], base64_image=avatar["base64_image"], session=session)
 
-        result = session.query(UserModel).filter(UserModel.id == user.id).update(values=data)
-        session.commit()
+        user_id = user.id
+
+        def write():
+            result = session.query(UserModel).filter(UserModel.id == user_id).update(values=data)
+            user_index.reindex(user)
+            session.commit()
+            return result
+
+        result = await run_in_threadpool(write)
+        await forget_identity(user_id)
 
         return result
 
@@ -186,13 +217,10 @@ class User:
         Returns:
             dict: A dictionary containing the list of users, page count, and total count.
         """
-        query = UserModel.search(session, query_string=search)
+        query = User._query(search=search, filters=filter, session=session)
 
-        for key, value in filter.items():
-            query = query.filter(getattr(UserModel, key) == value)
-
-        total_items = query.count()
-        users = query.offset((page.page_number - 1) * page.page_size).limit(page.page_size).all()
+        total_items = await User._count(search=search, filter=filter, session=session)
+        users, next_cursor = paginate(query, page, UserModel.created_at, UserModel.id)
 
         user_flatten_query = [UserQuerySchemaSimple(phone_number=user.phone_number, email=user.email).model_dump() for user in users]
 
@@ -200,42 +228,86 @@ class User:
             "data": user_flatten_query,
             "page_count": (total_items + page.page_size - 1) // page.page_size,
             "count": total_items,
+            "next_cursor": next_cursor,
         }
 
-    async def show_detail(self, user, db_session):
+    @staticmethod
+    def _query(search, filters, session):
+        """
+        Internal method to build the query of the users matching the search and filters.
+
+        Args:
+            search (str): The search query.
+            filters (dict): Filter parameters.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            Query: SQLAlchemy query of the users.
+        """
+        query = UserModel.search(session, query_string=search)
+
+        for key, value in filters.items():
+            query = query.filter(getattr(UserModel, key) == value)
+
+        return query
+
+    @staticmethod
+    @cache(cache_key="user_count", timeout=settings.PAGINATION["COUNT_CACHE_TIMEOUT"])
+    async def _count(search, filter, session):
+        """
+        Internal method to count the users matching the search and filters (cached apart from the pages).
+
+        Args:
+            search (str): The search query.
+            filter (dict): Filter parameters.
+            session (Session): SQLAlchemy session for database operations.
+
+        Returns:
+            int: The number of users.
+        """
+        return count_items(User._query(search=search, filters=filter, session=session))
+
+    async def show_detail(self, user, fields, db_session):
         """
         Retrieve user details.
 
         Args:
             user (UserModel): The user for whom to retrieve details.
+            fields (str | None): The normalized comma-separated fields of the user (None for all of them).
             db_session (Session): SQLAlchemy session for database operations.
 
         Returns:
             dict: A dictionary containing user details.
         """
-        return await self._show_detail(user=user, session=db_session)
+        return await self._show_detail(user=user, fields=fields, session=db_session)
 
     @staticmethod
     @cache(cache_key="user_detail")
-    async def _show_detail(user, session):
+    async def _show_detail(user, fields, session):
         """
         Internal method to retrieve user details.
 
+        The recipes and avatars are only queried if requested, and the recipes are read as UUIDs (not whole rows).
+
         Args:
             user (UserModel): The user for whom to retrieve details.
+            fields (str | None): The comma-separated fields of the user (None for all of them).
             session (Session): SQLAlchemy session for database operations.
 
         Returns:
             dict: A dictionary containing user details.
         """
-        user_flatten = UserQuerySchema(
-            phone_number=user.phone_number,
-            email=user.email,
-            gender=user.gender.value if user.gender else "",
-            is_online=user.is_online,
-            recipes=[recipe.uuid for recipe in user.recipes],
-            avatars=user.get_avatars(session=session),
-        ).model_dump()
+        values = {
+            "phone_number": lambda: user.phone_number,
+            "email": lambda: user.email,
+            "gender": lambda: user.gender.value if user.gender else "",
+            "is_online": lambda: user.is_online,
+            "recipes": lambda: [recipe_uuid for (recipe_uuid,) in session.query(RecipeModel.uuid).filter(RecipeModel.user_id == user.id)],
+            "avatars": lambda: user.get_avatars(session=session),
+        }
+        names = fields.split(",") if fields else list(UserQuerySchema.model_fields)
+
+        user_flatten = UserQuerySchema.model_construct(**{name: values[name]() for name in names}).model_dump(include=set(names))
 
         return {
             "data": user_flatten,
@@ -271,10 +343,13 @@ class User:
         Returns:
             bool: True if logout is successful, False otherwise.
         """
+        user_id = user.id
         user.is_online = False
-        status = JWT.expire_token(user_id=user.id, session=session)
+        status = await run_in_threadpool(JWT.expire_token, user_id=user_id, session=session)
 
-        session.commit()
+        await run_in_threadpool(session.commit)
+        await revoke_tokens(user_id)
+        await forget_identity(user_id)
 
         return status
 
@@ -309,6 +384,35 @@ class User:
         Returns:
             JWTTokenSchema: JWT tokens after refresh.
         """
-        tokens = JWT.update_token(user_id=user.id, refresh_token=refresh_token, session=session)
+        tokens = await run_in_threadpool(JWT.update_token, user_id=user.id, refresh_token=refresh_token, session=session)
 
         return tokens
+
+    @staticmethod
+    def export(after, session):
+        """
+        Iterate over all the users in ID order, for a streaming export.
+
+        The users are read by one query through a server-side cursor, `settings.EXPORT["YIELD_PER"]` rows at a time,
+        so the memory stays constant and the export sees one snapshot.
+
+        Args:
+            after (int | None): Only the users with a higher ID (the last exported ID, to resume an export).
+            session (Session): SQLAlchemy session for database operations.
+
+        Yields:
+            dict: The `EXPORT_COLUMNS` of a user.
+        """
+        query = session.query(UserModel.id, UserModel.phone_number, UserModel.email, UserModel.gender, UserModel.is_online, UserModel.created_at)
+        if after is not None:
+            query = query.filter(UserModel.id > after)
+
+        for user in query.order_by(UserModel.id).execution_options(stream_results=True).yield_per(settings.EXPORT["YIELD_PER"]):
+            yield {
+                "id": user.id,
+                "phone_number": user.phone_number,
+                "email": user.email,
+                "gender": user.gender.value if user.gender else None,
+                "is_online": user.is_online,
+                "created_at": user.created_at.isoformat() if user.created_at else None,
+            }
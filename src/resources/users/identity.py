@@ -0,0 +1,96 @@
+"""
+Cache of the identities of the authenticated users.
+
+Every authenticated request needs its user. Instead of querying the `users` table every time, the fields the routes
+read (`IDENTITY_FIELDS`) are cached in the worker (a TTL+LRU cache, `settings.IDENTITY_CACHE["LOCAL_TTL_SECONDS"]`) and
+in Redis (shared by the workers, `settings.IDENTITY_CACHE["TTL_SECONDS"]`; skipped in debug mode). A cached identity
+is attached to the session of the request as a persistent `UserModel` without a query, so the other columns and the
+relationships of the user still load on access.
+
+An identity is forgotten when the user is updated, logs in or logs out; the other workers may serve their own copy
+for up to `LOCAL_TTL_SECONDS`.
+
+Example usage:
+
+    user = await get_identity(user_id, session)
+    await forget_identity(user_id)
+"""
+
+import json
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.core import settings
+from src.helpers.cache import get_redis_pool
+from src.helpers.cache.lru import TTLCache
+from src.resources.users.enums import GenderEnum
+from src.resources.users.models import UserModel
+
+IDENTITY_FIELDS = ("id", "phone_number", "email", "gender", "is_online")
+
+local_identities = TTLCache(maxsize=settings.IDENTITY_CACHE["SIZE"], ttl=settings.IDENTITY_CACHE["LOCAL_TTL_SECONDS"])
+
+
+def _key(user_id):
+    return f"{settings.CACHE['PREFIX']}user_identity:{user_id}"
+
+
+def _identity(user):
+    identity = {field: getattr(user, field) for field in IDENTITY_FIELDS}
+    identity["gender"] = user.gender.value if user.gender else None
+    return identity
+
+
+def _attach(identity, session):
+    user = UserModel(**{**identity, "gender": GenderEnum(identity["gender"]) if identity["gender"] else None})
+    make_transient_to_detached(user)
+    return session.merge(user, load=False)
+
+
+async def get_identity(user_id, session):
+    """
+    Get an authenticated user from the identity caches, or from the database (and cache it).
+
+    Args:
+        user_id (int): The ID of the user.
+        session (Session): SQLAlchemy session of the request; the user is attached to it.
+
+    Returns:
+        UserModel | None: The user, or None if it does not exist.
+    """
+    identity = local_identities.get(user_id)
+
+    if identity is None and not settings.DEBUG:
+        redis = await get_redis_pool()
+        cached = await redis.get(_key(user_id))
+        if cached is not None:
+            identity = json.loads(cached)
+            local_identities.set(user_id, identity)
+
+    if identity is not None:
+        return _attach(identity, session)
+
+    user = session.query(UserModel).filter_by(id=user_id).first()
+    if user is None:
+        return None
+
+    identity = _identity(user)
+    local_identities.set(user_id, identity)
+    if not settings.DEBUG:
+        redis = await get_redis_pool()
+        await redis.setex(_key(user_id), settings.IDENTITY_CACHE["TTL_SECONDS"], json.dumps(identity))
+
+    return user
+
+
+async def forget_identity(user_id):
+    """
+    Remove the identity of a user from the caches (after it changed).
+
+    Args:
+        user_id (int): The ID of the user.
+    """
+    local_identities.delete(user_id)
+    if not settings.DEBUG:
+        redis = await get_redis_pool()
+        await redis.delete(_key(user_id))
@@ -1,5 +1,6 @@
 import datetime
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import String
 from sqlalchemy import Boolean
 from sqlalchemy import Enum
@@ -7,12 +8,14 @@ from sqlalchemy import DateTime
 from sqlalchemy_utils.types.password import PasswordType
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import or_
 
 from src.core.database import Basemodel
+from src.helpers.passwords import context_options
 from src.resources.images.models import ImageModel
 
 from src.resources.users.enums import GenderEnum
+from src.resources.users.search import user_index
+from src.resources.users.search import trigram_search
 
 
 class UserModel(Basemodel):
@@ -45,12 +48,16 @@ class UserModel(Basemodel):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_phone_number", "phone_number", unique=True),
+        Index("ix_users_created_at_id", "_UserModel__created_at", "id"),
+    )
 
     phone_number = Column(String, nullable=False)
     email = Column(String, nullable=True)
     gender = Column(Enum(GenderEnum), nullable=True)
     is_online = Column(Boolean, default=False)
-    password = Column(PasswordType(schemes=["pbkdf2_sha512"]), nullable=False)
+    password = Column(PasswordType(**context_options()), nullable=False)
 
     __created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
@@ -67,11 +74,19 @@ class UserModel(Basemodel):
         """Get the creation timestamp in ISO format."""
         return self.__created_at.isoformat()
 
+    @created_at.expression
+    def created_at(cls):
+        """Get the creation timestamp column (e.g. for ordering and keyset pagination)."""
+        return cls.__created_at
+
     @classmethod
     def search(cls, session, query_string=None):
         """
         Search for users based on query string.
 
+        Users whose phone number or email contains the query string are returned, most similar first, through the
+        trigram indexes (see `src.resources.users.search`).
+
         Args:
             session (Session): SQLAlchemy session.
             query_string (str, optional): The query string for searching users.
@@ -80,12 +95,7 @@ class UserModel(Basemodel):
             Query: SQLAlchemy query for searching users.
         """
         if query_string:
-            filters = [
-                cls.phone_number.ilike(f"%{query_string}%"),
-                cls.email.ilike(f"%{query_string}%"),
-            ]
-
-            return session.query(cls).filter(or_(*filters))
+            return trigram_search(session.query(cls), cls, query_string)
         else:
             return session.query(cls)
 
@@ -124,3 +134,7 @@ class UserModel(Basemodel):
             await image.save(session=session)
 
         return True
+
+
+# Keep the in-process trigram index (SQLite user search) in sync with the users written by this process.
+user_index.listen(UserModel)
@@ -4,6 +4,7 @@ from typing_extensions import Annotated
 from pydantic import Field, BaseModel, field_validator
 from fastapi.param_functions import Form
 
+from src.helpers.fields import select_fields
 from src.resources.images.schemas import ImageSchema
 from src.resources.users.enums import GenderEnum
 from fastapi_babel.core import make_gettext as _
@@ -151,6 +152,28 @@ class UserFilterSchema(BaseModel):
     is_online: Optional[bool] = Field(None, description="Filter by user's online status.")
 
 
+class UserFieldsSchema(BaseModel):
+    fields: Optional[str] = Field(
+        None, description="The fields of the user to return: a comma-separated list of UserQuerySchema fields, e.g. phone_number,email (default is all)."
+    )
+
+    @field_validator("fields")
+    def validate_fields(cls, fields):
+        """
+        Validate the requested fields and normalize them (unique, in schema order), so that equal fieldsets share their cache entries.
+
+        Args:
+            fields (str): The comma-separated field names.
+
+        Returns:
+            str: The normalized comma-separated field names (None if no field is given).
+
+        Raises:
+            ValueError: If a field is not a field of `UserQuerySchema`.
+        """
+        return select_fields(fields, UserQuerySchema)
+
+
 class UserEditSchema(BaseModel):
     username: Optional[str] = Field(None, description="The updated phone number or username of the user.")
     password: Optional[str] = Field(None, description="The updated password of the user.")
@@ -0,0 +1,215 @@
+"""
+Substring search of the users (partial phone number / email lookups).
+
+The matches are ordered by their trigram `similarity()` with the query string:
+
+    - PostgreSQL: `ILIKE '%q%'` is served by the pg_trgm GIN indexes created by the `0004` schema migration.
+    - SQLite: an in-process trigram index (`user_index`) narrows the search down to the candidate users, which are then
+      verified with `ILIKE` through the primary key. `similarity()` is registered on the SQLite connections. Broad
+      queries (shorter than 3 characters or with more than `settings.USER_SEARCH["MAX_CANDIDATES"]` candidates) are
+      plain scans, listed newest first.
+
+The in-process index is built by a background job (`run_rebuild_job`, started with the application) and rebuilt every
+`settings.USER_SEARCH["REFRESH_SECONDS"]` seconds to catch the updates made by other processes. Rebuilds run in a
+thread and replace the index in one assignment, so searches never wait for them; until the first build, searches are
+plain scans. Between rebuilds the index picks up new users on every search and follows the changes made by this
+process through ORM events (and `reindex` for bulk updates).
+
+Example usage:
+
+    query = trigram_search(session.query(UserModel), UserModel, "1234")
+"""
+
+import time
+import asyncio
+from sqlalchemy import or_
+from sqlalchemy import func
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core import settings
+from src.core.database import engine
+from src.core.database import local_session
+from src.helpers.logger import logger
+from src.helpers.logger.models import LogLevel
+from src.helpers.search import NGramIndex
+
+
+class UserIndex:
+    """
+    In-process trigram index of the users' phone numbers and emails.
+
+    Attributes:
+        model (UserModel): The user model, set by `listen`.
+        index (NGramIndex): The trigram index, keyed by user ID.
+        last_id (int): The highest user ID loaded from the database.
+        built_at (float | None): When the index was last rebuilt (monotonic time), None before the first build.
+        changes (list | None): The changes made by this process while a rebuild runs (user ID and texts, None texts
+            for a removal), replayed on the new index before it replaces the current one.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.index = NGramIndex(gram_size=3)
+        self.last_id = 0
+        self.built_at = None
+        self.changes = None
+
+    def listen(self, model):
+        """
+        Keep the index in sync with the users written by this process.
+
+        Args:
+            model (UserModel): The user model.
+        """
+        self.model = model
+        event.listen(model, "after_insert", self.index_user)
+        event.listen(model, "after_update", self.index_user)
+        event.listen(model, "after_delete", self.remove_user)
+
+    def build(self, session):
+        """
+        Build a new index of all the users.
+
+        Args:
+            session (Session): SQLAlchemy session.
+
+        Returns:
+            tuple: The new index and the highest user ID it holds.
+        """
+        model = self.model
+        index, last_id = NGramIndex(gram_size=3), 0
+
+        for user_id, phone_number, email in session.query(model.id, model.phone_number, model.email):
+            index.add(user_id, (phone_number, email))
+            last_id = max(last_id, user_id)
+
+        return index, last_id
+
+    def swap(self, index, last_id):
+        """
+        Replace the index with a new one (built by `build`), replaying the changes made in the meantime.
+
+        Args:
+            index (NGramIndex): The new index.
+            last_id (int): The highest user ID of the new index.
+        """
+        for user_id, texts in self.changes or ():
+            if texts is None:
+                index.remove(user_id)
+            else:
+                index.add(user_id, texts)
+
+        self.index, self.last_id, self.built_at = index, last_id, time.monotonic()
+
+    async def rebuild(self):
+        """Build a new index in a thread (so that the event loop keeps serving requests) and swap it in."""
+        self.changes = []
+        try:
+            index, last_id = await asyncio.to_thread(self._build)
+            self.swap(index, last_id)
+        finally:
+            self.changes = None
+
+    def _build(self):
+        """Build a new index in a new database session."""
+        with local_session() as session:
+            return self.build(session)
+
+    def refresh(self, session):
+        """
+        Load the users added since the last refresh (no-op before the first build).
+
+        Args:
+            session (Session): SQLAlchemy session.
+        """
+        if self.built_at is None:
+            return
+
+        model = self.model
+        index = self.index
+        for user_id, phone_number, email in session.query(model.id, model.phone_number, model.email).filter(model.id > self.last_id):
+            index.add(user_id, (phone_number, email))
+            self.last_id = max(self.last_id, user_id)
+
+    def candidates(self, session, query_string):
+        """
+        Get the IDs of the users whose phone number or email may contain a substring.
+
+        Args:
+            session (Session): SQLAlchemy session.
+            query_string (str): The substring.
+
+        Returns:
+            set | None: The candidate user IDs, or None if the index cannot narrow the search down (or is not built yet).
+        """
+        if self.built_at is None:
+            return None
+
+        self.refresh(session)
+        return self.index.candidates(query_string)
+
+    def reindex(self, user):
+        """
+        Re-index a user of this process updated by a `Query.update()` (bulk updates bypass the mapper events).
+
+        Args:
+            user (UserModel): The updated user, with its new values.
+        """
+        self.index_user(None, None, user)
+
+    def index_user(self, mapper, connection, target):
+        """Mapper event handler: (re-)index an inserted or updated user of this process."""
+        if self.built_at is not None:
+            self.index.add(target.id, (target.phone_number, target.email))
+        if self.changes is not None:
+            self.changes.append((target.id, (target.phone_number, target.email)))
+
+    def remove_user(self, mapper, connection, target):
+        """Mapper event handler: remove a deleted user of this process."""
+        self.index.remove(target.id)
+        if self.changes is not None:
+            self.changes.append((target.id, None))
+
+
+user_index = UserIndex()
+
+
+async def run_rebuild_job():
+    """Rebuild the user index now and every `settings.USER_SEARCH["REFRESH_SECONDS"]` seconds (run as a background task)."""
+    while True:
+        try:
+            await user_index.rebuild()
+        except SQLAlchemyError as e:
+            logger.log(level=LogLevel.ERROR, message=f"USER INDEX REBUILD FAILED-> {e!r}")
+        await asyncio.sleep(settings.USER_SEARCH["REFRESH_SECONDS"])
+
+
+def trigram_search(query, model, query_string):
+    """
+    Restrict a user query to the users whose phone number or email contains a substring, most similar first.
+
+    Args:
+        query (Query): The SQLAlchemy query of the users.
+        model (UserModel): The user model.
+        query_string (str): The substring.
+
+    Returns:
+        Query: The filtered and ordered query.
+    """
+    query = query.filter(or_(model.phone_number.ilike(f"%{query_string}%"), model.email.ilike(f"%{query_string}%")))
+
+    if engine.dialect.name == "postgresql":
+        greatest = func.greatest
+    elif engine.dialect.name == "sqlite":
+        # Broad queries (too short or too many candidates) are plain scans; similarity is a Python call per match here.
+        candidates = user_index.candidates(query.session, query_string)
+        if candidates is None or len(candidates) > settings.USER_SEARCH["MAX_CANDIDATES"]:
+            return query
+        greatest = func.max
+        query = query.filter(model.id.in_(candidates))
+    else:
+        return query
+
+    similarity = greatest(func.similarity(model.phone_number, query_string), func.similarity(func.coalesce(model.email, ""), query_string))
+    return query.order_by(similarity.desc())
@@ -0,0 +1,583 @@
+"""
+Performance checks and micro benchmarks for FoodRecipeHub.
+
+Every command runs against a throw-away SQLite database created in a temporary directory (schema from the models plus
+the versioned migrations), so it never touches the application database. Checks exit with a non-zero status when they
+fail, so they can run in CI.
+
+Usage:
+
+    python tests/load/benchmarks.py startup --import-budget 3 --request-budget 0.5
+    python tests/load/benchmarks.py search --rows 100000 1000000
+    python tests/load/benchmarks.py users --rows 10000 100000
+    python tests/load/benchmarks.py import --rows 10000
+    python tests/load/benchmarks.py feed --rows 100000 1000000 --followings 50
+    python tests/load/benchmarks.py split --rows 10000 100000 --content-words 200
+    python tests/load/benchmarks.py login --logins 32 --workers 4
+    python tests/load/benchmarks.py auth --requests 10000
+
+Commands:
+    startup: Check the application import time and the first-request latency against a budget.
+    search: Compare the full-text recipe search with the former ILIKE scan on synthetic recipes.
+    users: Compare the trigram-indexed user substring search with the former ILIKE scan on synthetic users.
+    import: Compare the batched recipe import with creating the same recipes one by one.
+    feed: Compare a home feed page read from the user's timeline with the query over the followed users' recipes.
+    split: Compare the list scans of the recipes with a table storing the (large) contents inline, as before the split.
+    login: Compare concurrent password verifications on the event loop with the process pool (throughput and loop stalls).
+    auth: Compare the authentication overhead of a request (token, revocation, current user) with the former double decode.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, BASE_DIR)
+
+from jose import jwt  # noqa E402
+from sqlalchemy import create_engine  # noqa E402
+from sqlalchemy import select  # noqa E402
+from sqlalchemy import or_  # noqa E402
+from sqlalchemy.orm import Session  # noqa E402
+from sqlalchemy.orm import load_only  # noqa E402
+from sqlalchemy.orm import joinedload  # noqa E402
+
+from src.core.babel import babel  # noqa E402 F401 (translations used by the serializers)
+from src.core.database import load_models  # noqa E402
+from src.core.database import SQLITE_FUNCTIONS  # noqa E402
+from src.core.sqlite import register_functions  # noqa E402
+from src.helpers.jwt import JWT  # noqa E402
+from src.helpers.jwt import verified_claims  # noqa E402
+from src.helpers.jwt.oauth2 import get_current_user  # noqa E402
+from src.helpers.jwt.revocation import local_revocations  # noqa E402
+from src.helpers.passwords import shutdown_pool  # noqa E402
+from src.helpers.passwords import verify_password  # noqa E402
+from src.helpers.passwords import password_context  # noqa E402
+from src.core import settings  # noqa E402
+from src.resources.recipes import Recipe  # noqa E402
+from src.resources.recipes.schemas import RecipeSchema  # noqa E402
+from src.core.migrations import upgrade  # noqa E402
+from src.resources.recipes.models import RecipeModel  # noqa E402
+from src.resources.recipes.models import RecipeContentModel  # noqa E402
+from src.helpers.timelines import drop_timeline  # noqa E402
+from src.resources.recipes.search import full_text_search  # noqa E402
+from src.resources.users.search import user_index  # noqa E402
+from src.resources.users.identity import local_identities  # noqa E402
+from src.resources.users.search import trigram_search  # noqa E402
+from src.resources.relations.models import RelationModel  # noqa E402
+from src.resources.users.models import UserModel  # noqa E402
+
+
+def make_engine(directory):
+    """
+    Create a SQLite database with the latest schema in the given directory.
+
+    Args:
+        directory (str): The directory of the database file.
+
+    Returns:
+        Engine: The database engine.
+    """
+    url = f"sqlite:///{os.path.join(directory, 'benchmark.sqlite3')}"
+    # Like the application's, the connections are shared with the threadpool (where the write transactions run).
+    engine = register_functions(create_engine(url, connect_args={"check_same_thread": False}), SQLITE_FUNCTIONS)
+    load_models().metadata.create_all(engine)
+    upgrade(engine)
+    return engine
+
+
+# Measured in a fresh interpreter, so that the import time is not hidden by modules already imported here.
+STARTUP_SCRIPT = """
+import sys
+import json
+import time
+
+started = time.perf_counter()
+from src.core import settings
+settings.DATABASE["URL"] = sys.argv[1]
+settings.DATABASE["REPLICAS"] = []
+from main import app
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    response = client.get("/recipe/list")
+    served = time.perf_counter()
+
+print(json.dumps({
+    "import_seconds": imported - started,
+    "startup_seconds": ready - imported,
+    "first_request_seconds": served - ready,
+    "status_code": response.status_code,
+}))
+"""
+
+
+def check_startup(args):
+    """Check the application import time and the first-request latency against the given budgets."""
+    with tempfile.TemporaryDirectory() as directory:
+        make_engine(directory).dispose()
+        url = f"sqlite:///{os.path.join(directory, 'benchmark.sqlite3')}"
+        completed = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, url], cwd=BASE_DIR, capture_output=True, text=True, check=False)
+
+    if completed.returncode:
+        print(completed.stderr)
+        return 1
+
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    checks = [
+        ("import", result["import_seconds"], args.import_budget),
+        ("startup", result["startup_seconds"], None),
+        ("first request", result["first_request_seconds"], args.request_budget),
+    ]
+
+    failures = result["status_code"] != 200
+    for name, seconds, budget in checks:
+        within = budget is None or seconds <= budget
+        failures += not within
+        print(f"{'OK  ' if within else 'FAIL'} {name}: {seconds * 1000:.1f} ms" + (f" (budget {budget * 1000:.0f} ms)" if budget else ""))
+    print(f"{'OK  ' if result['status_code'] == 200 else 'FAIL'} first request status: {result['status_code']}")
+
+    return 1 if failures else 0
+
+
+FOOD_WORDS = [
+    "chocolate",
+    "cake",
+    "tomato",
+    "soup",
+    "chicken",
+    "curry",
+    "rice",
+    "saffron",
+    "lamb",
+    "kebab",
+    "garlic",
+    "onion",
+    "pasta",
+    "basil",
+    "lemon",
+    "yogurt",
+    "mint",
+    "walnut",
+    "pomegranate",
+    "eggplant",
+    "bread",
+    "butter",
+    "honey",
+    "salad",
+]
+
+
+def insert_recipes(engine, first, last, vocabulary, content_words=40):
+    """
+    Insert synthetic recipes (ids first + 1 to last) and their contents in chunks.
+
+    Args:
+        engine (Engine): The database engine.
+        first (int): The number of recipes already inserted.
+        last (int): The number of recipes after the insert.
+        vocabulary (list): The words of the synthetic titles and contents.
+        content_words (int): The number of words of every content.
+    """
+    created_at = datetime.datetime(2023, 1, 1)
+    statement = "INSERT INTO recipes (id, uuid, user_id, title, is_active, _RecipeModel__created_at) VALUES (?, ?, ?, ?, 1, ?)"
+    content_statement = "INSERT INTO recipe_contents (recipe_id, content) VALUES (?, ?)"
+    with engine.begin() as connection:
+        for start in range(first, last, 10000):
+            numbers = range(start, min(start + 10000, last))
+            connection.exec_driver_sql(
+                statement,
+                [
+                    (
+                        number + 1,
+                        f"{number:036d}",
+                        number % 1000 + 1,
+                        " ".join(random.choices(vocabulary, k=4)),
+                        str(created_at + datetime.timedelta(seconds=number)),
+                    )
+                    for number in numbers
+                ],
+            )
+            connection.exec_driver_sql(content_statement, [(number + 1, " ".join(random.choices(vocabulary, k=content_words))) for number in numbers])
+
+
+def timed(function, repeat):
+    """
+    Run a function several times and measure its best wall time.
+
+    Args:
+        function (callable): The function to measure.
+        repeat (int): The number of runs.
+
+    Returns:
+        tuple: The best time in milliseconds and the result of the last run.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def benchmark_search(args):
+    """Compare the full-text search (first page and count) with the ILIKE scan it replaces."""
+    random.seed(args.seed)
+    vocabulary = FOOD_WORDS + ["".join(random.choices("abcdefghijklmnopqrstuvwxyz", k=random.randint(4, 9))) for _ in range(5000)]
+    queries = ["chocolate cake", "pomegranate", "saff", "lamb kebab garlic"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(directory)
+        inserted = 0
+
+        print(f"{'rows':>9}  {'query':<20} {'matches':>8} {'ilike ms':>10} {'fts ms':>10}")
+        for rows in sorted(args.rows):
+            insert_recipes(engine, inserted, rows, vocabulary)
+            inserted = rows
+
+            with Session(bind=engine) as session:
+                for query_string in queries:
+                    ilike = session.query(RecipeModel).filter(or_(RecipeModel.title.ilike(f"%{query_string}%"), RecipeModel.content.ilike(f"%{query_string}%")))
+                    fts = full_text_search(session.query(RecipeModel), RecipeModel, query_string)
+
+                    ilike_ms, _ = timed(lambda ilike=ilike: (ilike.order_by(None).count(), ilike.limit(10).all()), args.repeat)
+                    fts_ms, (matches, _) = timed(lambda fts=fts: (fts.order_by(None).count(), fts.limit(10).all()), args.repeat)
+                    print(f"{rows:>9}  {query_string:<20} {matches:>8} {ilike_ms:>10.1f} {fts_ms:>10.1f}")
+
+        engine.dispose()
+
+    return 0
+
+
+def benchmark_users(args):
+    """Compare the trigram-indexed user search (first page and count) with the ILIKE scan it replaces."""
+    random.seed(args.seed)
+    # Partial phone numbers and emails of existing users, then broad queries.
+    queries = [f"{4242 * 7919 % 10**7:07d}"[1:], f"{777 * 7919 % 10**7:07d}"[2:6], "sara4242", "sara", "gmail"]
+    names = ["ali", "sara", "reza", "maryam", "john", "mina", "omid", "neda", "amir", "leila"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(directory)
+        inserted = 0
+
+        print(f"{'rows':>9}  {'query':<10} {'matches':>8} {'ilike ms':>10} {'trigram ms':>11} {'index build ms':>15}")
+        for rows in sorted(args.rows):
+            with engine.begin() as connection:
+                for start in range(inserted, rows, 10000):
+                    connection.exec_driver_sql(
+                        "INSERT INTO users (phone_number, email, is_online, password, _UserModel__created_at) VALUES (?, ?, 0, X'', ?)",
+                        [
+                            (
+                                f"+98912{number * 7919 % 10**7:07d}",
+                                f"{random.choice(names)}{number}@{random.choice(['gmail.com', 'yahoo.com', 'mail.ir'])}",
+                                "2023-01-01 00:00:00.000000",
+                            )
+                            for number in range(start, min(start + 10000, rows))
+                        ],
+                    )
+            inserted = rows
+
+            with Session(bind=engine) as session:
+                build_ms, _ = timed(lambda: user_index.swap(*user_index.build(session)), 1)
+
+                for query_string in queries:
+                    ilike = session.query(UserModel).filter(or_(UserModel.phone_number.ilike(f"%{query_string}%"), UserModel.email.ilike(f"%{query_string}%")))
+                    trigram = trigram_search(session.query(UserModel), UserModel, query_string)
+
+                    ilike_ms, _ = timed(lambda ilike=ilike: (ilike.order_by(None).count(), ilike.limit(10).all()), args.repeat)
+                    trigram_ms, (matches, _) = timed(lambda trigram=trigram: (trigram.order_by(None).count(), trigram.limit(10).all()), args.repeat)
+                    print(f"{rows:>9}  {query_string:<10} {matches:>8} {ilike_ms:>10.1f} {trigram_ms:>11.1f} {build_ms:>15.1f}")
+
+        engine.dispose()
+
+    return 0
+
+
+def benchmark_import(args):
+    """Compare the batched recipe import with one create (and commit) per recipe; cache invalidation is left out."""
+    recipes = [RecipeSchema(title=f"imported recipe {number}", content="content " * 10 + "end", tags=["new", "trend"][: number % 3]) for number in range(args.rows)]
+    batch_size = settings.RECIPE_IMPORT["BATCH_SIZE"]
+
+    async def create_one_by_one(user, session):
+        for recipe in recipes:
+            await Recipe._create.__wrapped__(user=user, recipe_data=recipe, session=session)
+
+    async def create_in_batches(user, session):
+        for start in range(0, len(recipes), batch_size):
+            await Recipe._bulk_create.__wrapped__(user=user, recipes=recipes[start : start + batch_size], session=session)
+
+    print(f"{'rows':>9}  {'method':<12} {'ms':>10} {'rows/s':>10}")
+    for name, create in (("one by one", create_one_by_one), ("batched", create_in_batches)):
+        with tempfile.TemporaryDirectory() as directory:
+            engine = make_engine(directory)
+            with Session(bind=engine) as session:
+                user = UserModel(phone_number="+989120000000", email="", password="Passw0rd!")
+                session.add(user)
+                session.commit()
+
+                elapsed_ms, _ = timed(lambda create=create, user=user: asyncio.run(create(user, session)), 1)
+                assert session.query(RecipeModel).count() == args.rows
+            engine.dispose()
+
+        print(f"{args.rows:>9}  {name:<12} {elapsed_ms:>10.1f} {args.rows / elapsed_ms * 1000:>10.0f}")
+
+    return 0
+
+
+def benchmark_feed(args):
+    """Compare a feed page read from the timeline (in-process store) with the query of the followed users' newest recipes."""
+    random.seed(args.seed)
+    reader_id, authors = 1001, 1000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(directory)
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO users (id, phone_number, email, is_online, password, _UserModel__created_at) VALUES (?, ?, '', 0, X'', ?)",
+                [(number, f"+98912{number:07d}", "2023-01-01 00:00:00.000000") for number in range(1, reader_id + 1)],
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO relations (follower_id, following_id, _RelationModel__followed_on) VALUES (?, ?, ?)",
+                [(reader_id, author_id, "2023-01-01 00:00:00.000000") for author_id in random.sample(range(1, authors + 1), args.followings)],
+            )
+        inserted = 0
+
+        print(f"{'rows':>9}  {'query ms':>9} {'timeline ms':>12} {'rebuild ms':>11}")
+        for rows in sorted(args.rows):
+            insert_recipes(engine, inserted, rows, FOOD_WORDS)
+            inserted = rows
+
+            with Session(bind=engine) as session:
+                reader = session.get(UserModel, reader_id)
+                followings = select(RelationModel.following_id).where(RelationModel.follower_id == reader_id)
+                query = (
+                    session.query(RecipeModel)
+                    .options(load_only(RecipeModel.uuid, RecipeModel.title), joinedload(RecipeModel.user).load_only(UserModel.phone_number))
+                    .filter(RecipeModel.user_id.in_(followings))
+                    .order_by(RecipeModel.id.desc())
+                    .limit(args.page_size)
+                )
+
+                def feed_page(reader=reader):
+                    return asyncio.run(Recipe._feed(user=reader, before=None, page_size=args.page_size, session=session))
+
+                asyncio.run(drop_timeline(reader_id))
+                rebuild_ms, _ = timed(feed_page, 1)
+                query_ms, _ = timed(query.all, args.repeat)
+                timeline_ms, _ = timed(feed_page, args.repeat)
+                print(f"{rows:>9}  {query_ms:>9.1f} {timeline_ms:>12.1f} {rebuild_ms:>11.1f}")
+
+        engine.dispose()
+
+    return 0
+
+
+def benchmark_split(args):
+    """Compare the list scans of the recipes (contents in `recipe_contents`) with a copy of the table storing them inline."""
+    random.seed(args.seed)
+    scans = {
+        "active count": "SELECT count(*) FROM {table} WHERE is_active = 1",
+        "title filter": "SELECT count(*) FROM {table} WHERE title LIKE '%cake%'",
+        "author scan": "SELECT id, uuid, title FROM {table} WHERE user_id + 0 = 7 ORDER BY id DESC LIMIT 10",
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(directory)
+        inserted = 0
+
+        print(f"{'rows':>9}  {'scan':<14} {'inline ms':>10} {'split ms':>10}")
+        for rows in sorted(args.rows):
+            insert_recipes(engine, inserted, rows, FOOD_WORDS, content_words=args.content_words)
+            inserted = rows
+
+            with engine.begin() as connection:
+                # The former layout: the content stored between the title and the flags of every row.
+                connection.exec_driver_sql("DROP TABLE IF EXISTS recipes_inline")
+                connection.exec_driver_sql(
+                    "CREATE TABLE recipes_inline (id INTEGER PRIMARY KEY, uuid VARCHAR(36), user_id INTEGER, title VARCHAR, content TEXT, "
+                    "is_active BOOLEAN, _RecipeModel__created_at DATETIME)"
+                )
+                connection.exec_driver_sql(
+                    "INSERT INTO recipes_inline SELECT recipes.id, uuid, user_id, title, content, is_active, _RecipeModel__created_at "
+                    "FROM recipes JOIN recipe_contents ON recipe_contents.recipe_id = recipes.id"
+                )
+
+            with engine.connect() as connection:
+                for name, scan in scans.items():
+                    inline_ms, _ = timed(lambda scan=scan: connection.exec_driver_sql(scan.format(table="recipes_inline")).all(), args.repeat)
+                    split_ms, _ = timed(lambda scan=scan: connection.exec_driver_sql(scan.format(table="recipes")).all(), args.repeat)
+                    print(f"{rows:>9}  {name:<14} {inline_ms:>10.1f} {split_ms:>10.1f}")
+
+        engine.dispose()
+
+    return 0
+
+
+async def concurrent_logins(verify, logins):
+    """
+    Run concurrent password verifications while measuring the event loop stalls.
+
+    Args:
+        verify (Callable): The coroutine function verifying one password.
+        logins (int): The number of concurrent verifications.
+
+    Returns:
+        tuple: The elapsed and longest event loop stall times in milliseconds.
+    """
+    stalls = [0.0]
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - started - 0.001)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    assert all(valid for valid, _ in await asyncio.gather(*(verify() for _ in range(logins))))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await ticking
+    return elapsed * 1000, max(stalls) * 1000
+
+
+def benchmark_login(args):
+    """Compare concurrent password verifications (the cost of a login) on the event loop with the process pool."""
+    password = "Passw0rd!"
+    password_hash = password_context.hash(password)
+
+    async def on_event_loop():
+        return password_context.verify_and_update(password, password_hash)
+
+    async def in_process_pool():
+        return await verify_password(password, password_hash)
+
+    async def warm_up():
+        # Spawn the processes of the pool before timing.
+        await asyncio.gather(*(in_process_pool() for _ in range(args.workers)))
+
+    settings.PASSWORD_HASHING["WORKERS"] = args.workers
+    asyncio.run(warm_up())
+
+    print(f"{'logins':>7}  {'method':<24} {'ms':>9} {'logins/s':>9} {'max stall ms':>13}")
+    for name, verify in (("event loop", on_event_loop), (f"process pool ({args.workers} workers)", in_process_pool)):
+        elapsed_ms, stall_ms = asyncio.run(concurrent_logins(verify, args.logins))
+        print(f"{args.logins:>7}  {name:<24} {elapsed_ms:>9.1f} {args.logins / elapsed_ms * 1000:>9.1f} {stall_ms:>13.1f}")
+
+    shutdown_pool()
+    return 0
+
+
+def benchmark_auth(args):
+    """Measure the authentication overhead of a request: token verification, revocation check and loading of the user."""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(directory)
+        with Session(bind=engine) as session:
+            user = UserModel(phone_number="+989120000000", email="", password="Passw0rd!")
+            session.add(user)
+            session.commit()
+            user_id = user.id
+            token = JWT.create_access_token(user_id=user_id, session=session).access_token
+
+            async def former():
+                # Before: the token was decoded (and verified) twice, then the user was queried.
+                for _ in range(2):
+                    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT["ALGORITHM"]])
+                return session.query(UserModel).filter_by(id=int(claims["sub"])).first()
+
+            async def cold_caches():
+                verified_claims.clear()
+                local_revocations.clear()
+                local_identities.clear()
+                return await get_current_user(token=token, db_session=session)
+
+            async def warm_caches():
+                return await get_current_user(token=token, db_session=session)
+
+            def per_request(authenticate):
+                async def requests():
+                    for _ in range(args.requests):
+                        await authenticate()
+
+                return timed(lambda: asyncio.run(requests()), args.repeat)[0] * 1000 / args.requests
+
+            print(f"{'requests':>9}  {'method':<34} {'us/request':>11}")
+            for name, authenticate in (
+                ("two decodes + user query (before)", former),
+                ("current user (cold caches)", cold_caches),
+                ("current user (warm caches)", warm_caches),
+            ):
+                print(f"{args.requests:>9}  {name:<34} {per_request(authenticate):>11.1f}")
+        engine.dispose()
+
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FoodRecipeHub performance checks and benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    startup = subparsers.add_parser("startup", help="Check the import time and first-request latency.")
+    startup.add_argument("--import-budget", type=float, default=3.0, help="Budget of the application import in seconds.")
+    startup.add_argument("--request-budget", type=float, default=0.5, help="Budget of the first request in seconds.")
+    startup.set_defaults(func=check_startup)
+
+    search = subparsers.add_parser("search", help="Benchmark the full-text recipe search against ILIKE.")
+    search.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000], help="Numbers of synthetic recipes.")
+    search.add_argument("--repeat", type=int, default=3, help="Runs of every query (the best time is reported).")
+    search.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic recipes.")
+    search.set_defaults(func=benchmark_search)
+
+    users = subparsers.add_parser("users", help="Benchmark the trigram-indexed user search against ILIKE.")
+    users.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="Numbers of synthetic users.")
+    users.add_argument("--repeat", type=int, default=3, help="Runs of every query (the best time is reported).")
+    users.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic users.")
+    users.set_defaults(func=benchmark_users)
+
+    bulk_import = subparsers.add_parser("import", help="Benchmark the batched recipe import against one create per recipe.")
+    bulk_import.add_argument("--rows", type=int, default=10000, help="Number of imported recipes.")
+    bulk_import.set_defaults(func=benchmark_import)
+
+    feed = subparsers.add_parser("feed", help="Benchmark the timeline-backed home feed against the query of the followed users' recipes.")
+    feed.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000], help="Numbers of synthetic recipes (of 1000 authors).")
+    feed.add_argument("--followings", type=int, default=50, help="Number of authors followed by the reader.")
+    feed.add_argument("--page-size", type=int, default=10, help="Number of recipes of a feed page.")
+    feed.add_argument("--repeat", type=int, default=3, help="Runs of every read (the best time is reported).")
+    feed.add_argument("--seed", type=int, default=0, help="Random seed of the followed authors and synthetic recipes.")
+    feed.set_defaults(func=benchmark_feed)
+
+    split = subparsers.add_parser("split", help="Benchmark the list scans of the recipes against a table storing the contents inline.")
+    split.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="Numbers of synthetic recipes.")
+    split.add_argument("--content-words", type=int, default=200, help="Number of words of every synthetic content.")
+    split.add_argument("--repeat", type=int, default=3, help="Runs of every scan (the best time is reported).")
+    split.add_argument("--seed", type=int, default=0, help="Random seed of the synthetic recipes.")
+    split.set_defaults(func=benchmark_split)
+
+    login = subparsers.add_parser("login", help="Benchmark concurrent password verifications on the event loop against the process pool.")
+    login.add_argument("--logins", type=int, default=32, help="Number of concurrent logins.")
+    login.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes of the password hashing pool.")
+    login.set_defaults(func=benchmark_login)
+
+    auth = subparsers.add_parser("auth", help="Benchmark the authentication overhead of a request.")
+    auth.add_argument("--requests", type=int, default=10000, help="Number of authenticated requests.")
+    auth.add_argument("--repeat", type=int, default=3, help="Runs of every method (the best time is reported).")
+    auth.set_defaults(func=benchmark_auth)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.core import settings
+from src.core.babel import babel  # noqa F401 (translations used by the serializers)
+from src.core.database import load_models
+from src.core.database import SQLITE_FUNCTIONS
+from src.core.sqlite import register_functions
+from src.core.migrations import upgrade
+from src.helpers.cache import sorted_sets
+from src.helpers.cache.sorted_sets import MemorySortedSets
+
+
+def make_engine(path):
+    """
+    Create a SQLite database with the latest schema (models plus the versioned migrations).
+
+    Args:
+        path (str): The path of the database file.
+
+    Returns:
+        Engine: The database engine.
+    """
+    # Like the application's, the connections are shared with the threadpool (where the write transactions run).
+    engine = register_functions(create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}), SQLITE_FUNCTIONS)
+    load_models().metadata.create_all(engine)
+    upgrade(engine)
+    return engine
+
+
+@pytest.fixture
+def make_database(tmp_path):
+    """A factory of throw-away SQLite databases with the latest schema (disposed after the test)."""
+    engines = []
+
+    def make_database(name):
+        engines.append(make_engine(os.path.join(tmp_path, f"{name}.sqlite3")))
+        return engines[-1]
+
+    yield make_database
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(make_database):
+    """A throw-away SQLite database with the latest schema."""
+    return make_database("test")
+
+
+@pytest.fixture
+def session(engine):
+    """A session of the throw-away database."""
+    with Session(bind=engine) as session:
+        yield session
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """A fresh in-process sorted set store."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(sorted_sets, "memory_sorted_sets", MemorySortedSets())
+    return sorted_sets.memory_sorted_sets
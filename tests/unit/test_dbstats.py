@@ -0,0 +1,77 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.helpers.dbstats import middleware
+from src.helpers.dbstats import slowlog
+from src.helpers.dbstats.middleware import DBStatsMiddleware
+from src.helpers.dbstats.middleware import UNMATCHED_ROUTE
+from src.helpers.dbstats.slowlog import SlowQueryLog
+from src.helpers.metrics import Metrics
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """A fresh metrics registry for the middleware."""
+    metrics = Metrics()
+    monkeypatch.setattr(middleware, "metrics", metrics)
+    monkeypatch.setattr(slowlog, "metrics", metrics)
+    return metrics
+
+
+def test_metrics_are_keyed_by_route_template(metrics):
+    app = FastAPI()
+    app.add_middleware(DBStatsMiddleware)
+
+    @app.get("/recipe/detail/{uuid}")
+    async def detail(uuid: str):
+        return {"uuid": uuid}
+
+    client = TestClient(app)
+    for path in ("/recipe/detail/1", "/recipe/detail/2", "/missing/1", "/missing/2"):
+        client.get(path)
+
+    routes = metrics.snapshot()["routes"]
+    assert set(routes) == {"/recipe/detail/{uuid}", UNMATCHED_ROUTE}
+    assert routes["/recipe/detail/{uuid}"]["requests"] == 2
+    assert routes[UNMATCHED_ROUTE]["requests"] == 2
+
+
+def test_slow_queries_are_counted(metrics, tmp_path):
+    slow_query_log = SlowQueryLog(threshold_ms=10, explain=False, file=tmp_path / "slow_queries.log")
+    for duration in (0.001, 0.02, 0.03):
+        slow_query_log.observe(None, "SELECT 1", (), duration, route="/recipe/list", executemany=False)
+
+    assert metrics.snapshot()["counters"] == {"slow_queries": 2}
+
+
+class PlanCursor:
+    """A DBAPI cursor of a PostgreSQL-like driver whose EXPLAIN fails, recording the executed statements."""
+
+    def __init__(self, statements):
+        self.statements = statements
+        self.connection = self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(statement)
+        if statement.startswith("EXPLAIN"):
+            raise ValueError("syntax error")
+
+    def close(self):
+        pass
+
+
+def test_failed_query_plan_is_rolled_back_to_its_savepoint():
+    statements = []
+    plan = SlowQueryLog.query_plan(PlanCursor(statements), "SELECT * FROM recipes WHERE id = %(id)s", {"id": 1})
+
+    assert plan == "EXPLAIN failed: syntax error"
+    assert statements == [
+        "SAVEPOINT query_plan",
+        "EXPLAIN SELECT * FROM recipes WHERE id = %(id)s",
+        "ROLLBACK TO SAVEPOINT query_plan",
+        "RELEASE SAVEPOINT query_plan",
+    ]
@@ -0,0 +1,46 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import settings
+from src.helpers.timelines import timeline_key
+from src.resources.recipes import Recipe
+from src.resources.recipes.feed import SENTINEL
+from src.resources.recipes.feed import fan_out
+
+
+@pytest.fixture
+def recipes(engine):
+    """A reader following an author of 7 recipes (IDs 1 to 7), the 4th of which is inactive."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users (phone_number, email, is_online, password) VALUES (?, '', 0, X'')", [("+989121111111",), ("+989122222222",)])
+        connection.exec_driver_sql("INSERT INTO relations (follower_id, following_id) VALUES (1, 2)")
+        connection.exec_driver_sql(
+            "INSERT INTO recipes (uuid, user_id, title, is_active) VALUES (?, 2, ?, ?)",
+            [(f"recipe-{number}", f"recipe {number}", number != 4) for number in range(1, 8)],
+        )
+
+
+def read_feed(session, page_size):
+    """Read every page of the feed of the reader, following the cursors."""
+    pages, before = [], None
+    while len(pages) < 10:
+        page = asyncio.run(Recipe._feed(user=SimpleNamespace(id=1), before=before, page_size=page_size, session=session))
+        pages.append([recipe["uuid"] for recipe in page["data"]])
+        if page["next_cursor"] is None:
+            return pages
+        before = int(page["next_cursor"])
+    return pages
+
+
+def test_feed_pages_skip_inactive_recipes(session, store, recipes):
+    assert read_feed(session, page_size=3) == [["recipe-7", "recipe-6", "recipe-5"], ["recipe-3", "recipe-2", "recipe-1"]]
+
+
+def test_trimmed_timeline_keeps_its_sentinel(session, store, recipes, monkeypatch):
+    monkeypatch.setitem(settings.FEED, "TIMELINE_SIZE", 3)
+    read_feed(session, page_size=2)
+    asyncio.run(fan_out(session, author_id=2, recipe_ids=[8, 9]))
+
+    assert asyncio.run(store.members(timeline_key(1))) == [SENTINEL, "7", "8", "9"]
@@ -0,0 +1,38 @@
+import datetime
+
+import pytest
+
+from src.core.exceptions import BadRequestException
+from src.helpers.pagination import decode_cursor
+from src.helpers.pagination import encode_cursor
+from src.helpers.pagination import paginate
+from src.helpers.response.schemas import Page
+from src.resources.users.models import UserModel
+
+
+def test_cursor_round_trip():
+    created_at = datetime.datetime(2023, 9, 1, 12, 30, 15, 250000)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_cursor(encode_cursor(created_at.isoformat(), 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "W10", encode_cursor("yesterday", 1)])
+def test_invalid_cursor(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor)
+
+
+def test_keyset_pages_cover_every_item_once(engine, session):
+    # Users created in the same instant are ordered by id, so ties never repeat or skip an item across pages.
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (phone_number, email, is_online, password, _UserModel__created_at) VALUES (?, '', 0, X'', ?)",
+            [(f"+98912000{number:04d}", f"2023-09-0{1 + number // 3} 00:00:00.000000") for number in range(7)],
+        )
+
+    pages, cursor = [], ""
+    while cursor is not None and len(pages) < 10:
+        users, cursor = paginate(session.query(UserModel), Page(page_size=2, cursor=cursor), UserModel.created_at, UserModel.id)
+        pages.append([user.id for user in users])
+
+    assert pages == [[7, 6], [5, 4], [3, 2], [1]]
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy import tuple_
+
+from src.helpers.jwt.models import AccessTokenModel
+from src.helpers.ownership import owned
+from src.resources.images.models import ImageModel
+from src.resources.recipes import Recipe
+from src.resources.recipes.models import RecipeModel
+from src.resources.recipes.models import RecipeContentModel
+from src.resources.recipes.models import recipe_tag_association
+from src.resources.relations.models import RelationModel
+from src.resources.users.models import UserModel
+
+
+def keyset_page(statement, created_at, item_id):
+    """Restrict a statement to a keyset (cursor) page after an arbitrary cursor, as `src.helpers.pagination.paginate` does."""
+    return statement.where(tuple_(created_at, item_id) < tuple_("2023-10-01 00:00:00.000000", 1000)).order_by(created_at.desc(), item_id.desc()).limit(11)
+
+
+HOT_QUERIES = {
+    "login / follow by phone number": select(UserModel.id).where(UserModel.phone_number == "+989121234567"),
+    "recipes of a user": select(RecipeModel.id).where(RecipeModel.user_id == 1),
+    "recipe ownership": select(RecipeModel.id).where(owned(RecipeModel, 1, uuid="uuid")),
+    "followings of a user": select(RelationModel.following_id).where(RelationModel.follower_id == 1),
+    "followers of a user": select(RelationModel.follower_id).where(RelationModel.following_id == 1),
+    "relation existence": select(RelationModel.id).where(RelationModel.follower_id == 1, RelationModel.following_id == 2),
+    "tokens of a user": select(AccessTokenModel.id).where(AccessTokenModel.user_id == 1),
+    "token by refresh token": select(AccessTokenModel.id).where(AccessTokenModel.refresh_token == "token"),
+    "avatars of an object": select(ImageModel.id).where(ImageModel.object_type == "usermodel", ImageModel.object_id == 1),
+    "content of a recipe": select(RecipeContentModel.content).where(RecipeContentModel.recipe_id == 1),
+    "tags of a recipe": select(recipe_tag_association.c.tag_id).where(recipe_tag_association.c.recipe_id == 1),
+    "recipes of a tag": select(recipe_tag_association.c.recipe_id).where(recipe_tag_association.c.tag_id == 1),
+    "recipe list page": keyset_page(select(RecipeModel.id), RecipeModel.created_at, RecipeModel.id),
+    "recipe list page (any tag)": keyset_page(select(RecipeModel.id).where(*Recipe._tagged([1, 2], "any")), RecipeModel.created_at, RecipeModel.id),
+    "recipe list page (all tags)": keyset_page(select(RecipeModel.id).where(*Recipe._tagged([1, 2], "all")), RecipeModel.created_at, RecipeModel.id),
+    "user list page": keyset_page(select(UserModel.id), UserModel.created_at, UserModel.id),
+    "follower list page": keyset_page(select(RelationModel.follower_id).where(RelationModel.following_id == 1), RelationModel.created_at, RelationModel.id),
+    "following list page": keyset_page(select(RelationModel.following_id).where(RelationModel.follower_id == 1), RelationModel.created_at, RelationModel.id),
+}
+
+
+def query_plan(connection, statement):
+    """Get the SQLite query plan of a statement, one step per line."""
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    return "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_searches_an_index(engine, name):
+    with engine.connect() as connection:
+        plan = query_plan(connection, HOT_QUERIES[name])
+
+    assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import func
+
+from src.core import database
+from src.core.database import ReplicaSelector
+from src.core.database import RoutingSession
+from src.resources.users.models import UserModel
+
+
+@pytest.fixture
+def replicas(make_database, engine, monkeypatch):
+    """Two replicas that diverge: the second one has caught up with one more user than the first."""
+    replicas = [make_database(f"replica{number}") for number in (1, 2)]
+    for users, replica in enumerate(replicas, start=1):
+        with replica.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO users (phone_number, email, is_online, password) VALUES (?, '', 0, X'')",
+                [(f"+98912000{number:04d}",) for number in range(users)],
+            )
+
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "replica_selector", ReplicaSelector(replicas, policy="round_robin"))
+    return replicas
+
+
+def test_reads_of_a_transaction_use_one_replica(engine, replicas):
+    with RoutingSession(bind=engine) as session:
+        for _ in range(4):
+            count = session.query(func.count(UserModel.id)).scalar()
+            assert len(session.query(UserModel.id).all()) == count
+
+
+def test_next_transaction_chooses_a_replica_again(engine, replicas):
+    with RoutingSession(bind=engine) as session:
+        counts = []
+        for _ in range(2):
+            counts.append(session.query(func.count(UserModel.id)).scalar())
+            session.commit()
+
+    assert sorted(counts) == [1, 2]
+
+
+def test_rollback_releases_the_replica(engine, replicas):
+    with RoutingSession(bind=engine) as session:
+        session.query(UserModel.id).all()
+        assert session.info["replica"] in replicas
+        session.rollback()
+        assert "replica" not in session.info
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.helpers.dbstats import current_stats
+from src.helpers.dbstats import StatementStats
+from src.helpers.response.schemas import Page
+from src.resources.recipes import Tag
+from src.resources.recipes import Recipe
+from src.resources.recipes import LIST_FIELDS
+from src.resources.recipes import DETAIL_FIELDS
+from src.resources.recipes.models import TagModel
+from src.resources.recipes.models import RecipeModel
+from src.resources.recipes.models import recipe_tag_association
+from src.resources.recipes.enums import TAGEnum
+from src.resources.users.identity import get_identity
+from src.resources.users.identity import local_identities
+from src.resources.users.models import UserModel
+
+# Number of recipes (of as many authors), and of recipes of the prolific author.
+ROWS = 20
+
+
+def count_statements(coroutine):
+    """Run a coroutine and count the SQL statements it executes."""
+    stats = StatementStats()
+    token = current_stats.set(stats)
+    try:
+        asyncio.run(coroutine)
+    finally:
+        current_stats.reset(token)
+    return stats.count
+
+
+@pytest.fixture
+def recipes(engine):
+    """`ROWS` recipes of as many authors, with every tag, and a prolific author of `ROWS` recipes."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (phone_number, email, is_online, password) VALUES (?, '', 0, X'')", [(f"+98912000{number:04d}",) for number in range(ROWS + 1)]
+        )
+
+    with Session(bind=engine) as session:
+        tags = session.query(TagModel).all()
+        session.add_all(RecipeModel(title=f"recipe number {number}", content="content " * 10, user_id=number + 1, tags=tags) for number in range(ROWS))
+        session.add_all(RecipeModel(title=f"own recipe {number}", content="content " * 10, user_id=ROWS + 1) for number in range(ROWS))
+        session.commit()
+
+        uuids = [recipe_uuid for (recipe_uuid,) in session.query(RecipeModel.uuid).filter(RecipeModel.user_id != ROWS + 1)]
+        own_uuids = [recipe_uuid for (recipe_uuid,) in session.query(RecipeModel.uuid).filter(RecipeModel.user_id == ROWS + 1)]
+        return SimpleNamespace(author_id=ROWS + 1, uuids=uuids, own_uuids=own_uuids)
+
+
+@pytest.mark.parametrize("page_size", [1, ROWS])
+def test_recipe_list_statements(session, recipes, page_size):
+    # The count and the page (recipes with their authors joined in), plus their tags when every field is requested.
+    assert count_statements(Recipe._show_all(search=None, filter={}, page=Page(page_size=page_size), fields=LIST_FIELDS, session=session)) <= 2
+    assert count_statements(Recipe._show_all(search=None, filter={}, page=Page(page_size=page_size), fields=DETAIL_FIELDS, session=session)) <= 3
+
+
+def test_recipe_detail_statements(session, recipes):
+    # The recipe(s) with their authors, then their tags.
+    assert count_statements(Recipe._show_detail(recipe_uuid=recipes.uuids[0], fields=None, session=session)) <= 2
+    assert count_statements(Recipe._show_details(recipe_uuids=recipes.uuids, session=session)) <= 2
+
+
+def test_recipe_write_statements(session, recipes):
+    # The ownership check is part of the statements, whatever the number of recipes of the author.
+    author = UserModel(id=recipes.author_id)
+    update = Recipe._update.__wrapped__(user=author, data={"uuid": recipes.own_uuids[0], "title": "updated recipe", "content": "updated " * 10}, session=session)
+    assert count_statements(update) <= 2
+    # The tags, counters, content and recipe.
+    assert count_statements(Recipe._delete.__wrapped__(user=author, uuid=recipes.own_uuids[1], session=session)) <= 4
+
+
+def test_recipe_update_with_tags_statements(session, recipes):
+    Tag.ids(session=session)
+    tags = list(TAGEnum)[:2]
+    data = {"uuid": recipes.own_uuids[0], "content": "updated " * 10, "tags": tags}
+    # The recipe, its content, its current tags and the added links: the statements select the recipe ID themselves.
+    assert count_statements(Recipe._update.__wrapped__(user=UserModel(id=recipes.author_id), data=data, session=session)) <= 4
+
+    recipe_id = session.query(RecipeModel.id).filter(RecipeModel.uuid == recipes.own_uuids[0]).scalar()
+    tag_ids = {tag_id for (tag_id,) in session.query(recipe_tag_association.c.tag_id).filter(recipe_tag_association.c.recipe_id == recipe_id)}
+    assert tag_ids == {Tag.ids(session=session)[tag] for tag in tags}
+
+
+def test_current_user_statements(session, recipes):
+    local_identities.clear()
+    assert count_statements(get_identity(recipes.author_id, session)) == 1
+    assert count_statements(get_identity(recipes.author_id, session)) == 0
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.resources.recipes.stats import ViewCounter
+
+
+@pytest.fixture
+def recipes(engine):
+    """Two recipes (UUIDs recipe-1 and recipe-2) of one author."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users (phone_number, email, is_online, password) VALUES ('+989121111111', '', 0, X'')")
+        connection.exec_driver_sql("INSERT INTO recipes (uuid, user_id, title, is_active) VALUES (?, 1, ?, 1)", [("recipe-1", "recipe 1"), ("recipe-2", "recipe 2")])
+
+
+def view_counts(engine):
+    with engine.connect() as connection:
+        return dict(connection.exec_driver_sql("SELECT recipes.uuid, view_count FROM recipe_stats JOIN recipes ON recipes.id = recipe_id").fetchall())
+
+
+def test_flush_adds_the_pending_views(engine, session, recipes):
+    counter = ViewCounter()
+    counter.add("recipe-1", 2)
+    counter.add("recipe-2")
+    counter.add("deleted")
+    assert counter.flush(session) == 3
+
+    counter.add("recipe-1")
+    assert counter.flush(session) == 1
+    assert counter.flush(session) == 0
+    assert view_counts(engine) == {"recipe-1": 3, "recipe-2": 1}
+
+
+def test_failed_flush_keeps_the_views(engine, session, recipes):
+    counter = ViewCounter()
+    counter.add("recipe-1", 2)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE recipe_stats RENAME TO recipe_stats_old")
+
+    with pytest.raises(SQLAlchemyError):
+        counter.flush(session)
+    counter.add("recipe-1")
+
+    assert counter.pending == {"recipe-1": 3}
@@ -0,0 +1,56 @@
+import pytest
+
+from src.resources.recipes import Tag
+from src.resources.recipes import Recipe
+from src.resources.recipes.enums import TAGEnum
+from src.resources.recipes.models import TagModel
+
+
+@pytest.fixture(autouse=True)
+def tag_ids(monkeypatch):
+    """An empty process-wide tag ID map."""
+    monkeypatch.setattr(Tag, "_ids", {})
+
+
+def test_every_tag_has_one_canonical_row(session):
+    tag_ids = Tag.ids(session=session)
+    session.commit()
+
+    assert set(tag_ids) == set(TAGEnum)
+    assert dict(session.query(TagModel.title, TagModel.id)) == tag_ids
+    assert Tag.ids(session=session) == tag_ids
+
+
+@pytest.fixture
+def no_tags(engine):
+    """A database whose tag rows are missing (e.g. new TAGEnum members)."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM tags")
+
+
+def test_read_path_creates_no_tags(session, no_tags):
+    tag = list(TAGEnum)[0]
+    assert Tag.ids(session=session) == {}
+    assert Recipe._query(search=None, filters={"tags": tag.value, "tags_match": "any"}, session=session).count() == 0
+    assert Recipe._query(search=None, filters={"tags": tag.value, "tags_match": "all"}, session=session).count() == 0
+
+    assert not session.new
+    assert "tag_ids" not in session.info
+    assert session.query(TagModel).count() == 0
+
+
+def test_created_tags_are_shared_after_commit_only(session, no_tags):
+    tag_ids = Tag.ids(session=session, create=True)
+    assert Tag._ids == {}
+
+    session.commit()
+    assert Tag._ids == tag_ids
+
+
+def test_rollback_discards_the_created_tags(session, no_tags):
+    Tag.ids(session=session, create=True)
+    session.rollback()
+
+    assert Tag._ids == {}
+    assert "tag_ids" not in session.info
+    assert session.query(TagModel).count() == 0
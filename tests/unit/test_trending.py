@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from src.core import settings
+from src.resources.recipes import Recipe
+from src.resources.recipes import trending
+from src.resources.recipes.models import RecipeModel
+from src.resources.recipes.schemas import RecipeSchema
+from src.resources.users.models import UserModel
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable clock of the trending module, starting at 1000 seconds."""
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(trending.time, "time", lambda: clock["now"])
+    return clock
+
+
+def test_recent_engagement_outranks_older_engagement(store, clock):
+    half_life = trending._half_life()
+
+    asyncio.run(trending.record("old", "view"))
+    asyncio.run(trending.record("older", "create"))
+    clock["now"] += half_life
+    for _ in range(3):
+        asyncio.run(trending.record("new", "view"))
+
+    ranking = asyncio.run(trending.top(10))
+    assert [recipe_uuid for recipe_uuid, _ in ranking] == ["new", "older", "old"]
+    assert [round(score, 6) for _, score in ranking] == [3.0, 2.5, 0.5]
+
+
+def test_refresh_keeps_the_order_and_is_claimed_once_per_period(store, clock, monkeypatch):
+    monkeypatch.setitem(settings.TRENDING, "SIZE", 2)
+    for recipe_uuid, views in (("a", 3), ("b", 2), ("c", 1)):
+        for _ in range(views):
+            asyncio.run(trending.record(recipe_uuid, "view"))
+    clock["now"] += trending._half_life()
+
+    assert asyncio.run(trending.refresh())
+    assert not asyncio.run(trending.refresh())
+
+    assert asyncio.run(store.score(trending.EPOCH_KEY, "epoch")) == clock["now"]
+    assert [(recipe_uuid, round(score, 6)) for recipe_uuid, score in asyncio.run(trending.top(10))] == [("a", 1.5), ("b", 1.0)]
+
+
+def test_bulk_created_recipes_are_credited(engine, session, store, clock):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users (phone_number, email, is_online, password) VALUES ('+989121111111', '', 0, X'')")
+    recipes = [RecipeSchema(title=f"imported recipe {number}", content="x" * 60, tags=["new"]) for number in range(2)]
+    asyncio.run(Recipe._bulk_create.__wrapped__(user=UserModel(id=1), recipes=recipes, session=session))
+
+    uuids = [recipe_uuid for (recipe_uuid,) in session.query(RecipeModel.uuid)]
+    assert dict(asyncio.run(trending.top(10))) == dict.fromkeys(uuids, settings.TRENDING["WEIGHTS"]["create"])
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.resources.users.models import UserModel
+from src.resources.users.search import UserIndex
+
+
+@pytest.fixture
+def users(engine):
+    """Three users of the throw-away database."""
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (phone_number, email, is_online, password) VALUES (?, ?, 0, X'')",
+            [("+989121111111", "sara@gmail.com"), ("+989122222222", "reza@yahoo.com"), ("+989123333333", "")],
+        )
+
+
+@pytest.fixture
+def user_index():
+    """An index of the users that does not listen to the mapper events."""
+    user_index = UserIndex()
+    user_index.model = UserModel
+    return user_index
+
+
+def test_searches_do_not_build_the_index(session, users, user_index):
+    assert user_index.candidates(session, "sara") is None
+    assert user_index.built_at is None
+
+    user_index.swap(*user_index.build(session))
+    assert user_index.candidates(session, "sara") == {1}
+    assert user_index.candidates(session, "2222") == {2}
+
+
+def test_swap_replays_the_changes_made_during_the_rebuild(session, users, user_index):
+    user_index.changes = []
+    index, last_id = user_index.build(session)
+    user_index.index_user(None, None, SimpleNamespace(id=3, phone_number="+989123333333", email="maryam@mail.ir"))
+    user_index.remove_user(None, None, SimpleNamespace(id=1))
+    user_index.swap(index, last_id)
+
+    assert user_index.candidates(session, "maryam") == {3}
+    assert not user_index.candidates(session, "sara")
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy import update
+
+from src.core import database
+from src.core.database import RoutingSession
+from src.core.sqlite import WriteSerializer
+from src.resources.users.models import UserModel
+
+
+@pytest.fixture
+def write_serializer(engine, monkeypatch):
+    """A single-writer queue in front of the throw-away database."""
+    write_serializer = WriteSerializer(timeout=0.2)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "replica_selector", None)
+    monkeypatch.setattr(database, "write_serializer", write_serializer)
+    return write_serializer
+
+
+def test_only_writes_take_the_slot(engine, write_serializer):
+    with RoutingSession(bind=engine) as session:
+        session.execute(text("PRAGMA user_version"))
+        assert not session.info.get("write_slot")
+
+        session.execute(update(UserModel).values(is_online=False))
+        assert session.info["write_slot"]
+
+        session.commit()
+        assert not session.info.get("write_slot")
+
+
+def test_event_loop_does_not_wait_for_the_slot(engine, write_serializer, caplog):
+    async def write():
+        with RoutingSession(bind=engine) as holder, RoutingSession(bind=engine) as session:
+            holder.execute(update(UserModel).values(is_online=False))
+            session.execute(text("SELECT 1").execution_options(write=True))
+            return holder.info.get("write_slot"), session.info.get("write_slot")
+
+    assert asyncio.run(write()) == (True, None)
+    assert "unserialized" in caplog.text
+
+
+def test_threadpool_writes_wait_for_the_slot(engine, write_serializer):
+    async def write():
+        with RoutingSession(bind=engine) as holder, RoutingSession(bind=engine) as session:
+            holder.execute(update(UserModel).values(is_online=False))
+            waiting = asyncio.ensure_future(run_in_threadpool(session.execute, update(UserModel).values(is_online=True)))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+
+            holder.commit()
+            await waiting
+            return session.info.get("write_slot")
+
+    assert asyncio.run(write())
+
+
+def test_slot_timeout_is_logged(engine, write_serializer, caplog):
+    with RoutingSession(bind=engine) as holder, RoutingSession(bind=engine) as session:
+        holder.execute(update(UserModel).values(is_online=False))
+        session.execute(text("SELECT 1").execution_options(write=True))
+
+        assert not session.info.get("write_slot")
+        assert "not acquired within 0.2 seconds" in caplog.text